@@ -1,12 +1,30 @@
-from flask import Flask, request, jsonify, render_template, g, send_from_directory
-from datetime import datetime, timedelta
-import re
+from flask import Flask, request, jsonify, render_template, g, send_from_directory, stream_with_context
+from datetime import datetime
 import pytz
-import sqlite3
 import os
-from apscheduler.schedulers.background import BackgroundScheduler
-from apscheduler.triggers.interval import IntervalTrigger
+import time
+import atexit
+import functools
+import itertools
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import json
+from calendar_expansion import MonthExpansionCache, expand_month
+from compaction import COMPACTION_INTERVAL_SECONDS, compact, format_report
+from database import check_schema, datetime_to_epoch, init_db
+from due_queue import DueQueue
+from events import EventBroker, EVENTS_HEARTBEAT_SECONDS, EVENTS_RETRY_MS, format_sse
+from formatting import DATETIME_FORMATTER
+from leader import LeaderLease, LEASE_RENEW_SECONDS
+from metrics import (HTTP_REQUEST_SECONDS, METRICS_ENABLED, REGISTRY, SCHEDULER_DUE_ROWS, SCHEDULER_LAG_SECONDS,
+                     SCHEDULER_TICK_SECONDS)
+from notifications import NotificationDispatcher, senders_from_env
+from profiler import PROFILER_ENABLED, PROFILER_HEADER, SamplingProfiler
+from recurrence import next_occurrence
+from reminder_metadata import METADATA_COLUMNS, row_metadata, split_metadata
+from reminder_store import FILTER_COLUMNS, REMINDER_LIST_COLUMNS, REMINDER_RECORD_COLUMNS, REMINDER_STATUSES, store_from_env
+from response_cache import ResponseCache, cache_key
+from schedule_parser import SCHEDULE_PARSER, parse_lines
 
 # --- Konfigurasi Flask dan Database ---
 current_dir = os.getcwd()
@@ -16,373 +34,49 @@ app = Flask(__name__,
 
 DATABASE = 'reminders.db'
 
-# --- Fungsi Pembantu untuk Interaksi Database ---
-def get_db():
-    db = getattr(g, '_database', None)
-    if db is None:
-        db = g._database = sqlite3.connect(DATABASE)
-        db.row_factory = sqlite3.Row
-    return db
-
-@app.teardown_appcontext
-def close_connection(exception):
-    db = getattr(g, '_database', None)
-    if db is not None:
-        db.close()
-
-def query_db(query, args=(), one=False):
-    cur = get_db().execute(query, args)
-    rv = cur.fetchall()
-    cur.close()
-    return (rv[0] if rv else None) if one else rv
-
-def insert_db(query, args=()):
-    db = get_db()
-    cur = db.execute(query, args)
-    db.commit()
-    lastrowid = cur.lastrowid
-    cur.close()
-    return lastrowid
-
-def update_db(query, args=()):
-    db = get_db()
-    cur = db.execute(query, args)
-    db.commit()
-    cur.close()
+# --- Penyimpanan Pengingat ---
+# Semua baca/tulis data pengingat lewat ReminderStore (reminder_store.py): SQLite per file/shard
+# dengan pool koneksi, atau engine in-memory (REMINDER_STORE=memory).
+store = store_from_env(DATABASE)
+
+# Posisi due_at di baris REMINDER_RECORD_COLUMNS
+INSERT_ROW_DUE_AT = REMINDER_RECORD_COLUMNS.index('due_at')
+
+def reminder_insert_row(user_id, reminder_info):
+    scheduled_time = reminder_info['datetime']
+    return (user_id, reminder_info['event'], scheduled_time.isoformat(), reminder_info['repeat_type'],
+            reminder_info['repeat_interval'], 0, datetime_to_epoch(scheduled_time)) + split_metadata(reminder_info.get('metadata'))
+
+def insert_reminders(user_id, reminders):
+    """
+    Simpan banyak hasil parse lewat store.add_many dalam SATU transaksi (satu commit/fsync),
+    lalu daftarkan ke due_queue dan bangunkan scheduler bila ada yang lebih awal.
+    """
+    rows = [reminder_insert_row(user_id, reminder_info) for reminder_info in reminders]
+    if not rows:
+        return 0
+    ids = store.add_many(user_id, rows)
+    due_queue.push_many([(row[INSERT_ROW_DUE_AT], reminder_id) for row, reminder_id in zip(rows, ids)])
+    wake_scheduler_if_earlier(min(row[INSERT_ROW_DUE_AT] for row in rows))
+    invalidate_user_caches([user_id])
+    event_broker.notify_changed()
+    return len(rows)
 
 # --- Logika AI Pengingat Anda (Kembali ke Regex-Only, tapi dengan Metadata & Multi-Reminder) ---
-TIMEZONE_MAP = {
-    "wib": "Asia/Jakarta", "wita": "Asia/Makassar", "wit": "Asia/Jayapura",
-    "est": "America/New_York", "pst": "America/Los_Angeles", "gmt": "Etc/GMT",
-    "utc": "Etc/UTC", "gmt+7": "Etc/GMT-7", "gmt-7": "Etc/GMT+7"
-}
 LOCAL_TIMEZONE = pytz.timezone(os.environ.get('TZ', 'Asia/Jakarta'))
 
-def add_months(sourcedate, months):
-    month = sourcedate.month + months
-    year = sourcedate.year + (month - 1) // 12
-    month = (month - 1) % 12 + 1
-    day = min(sourcedate.day, (datetime(year, month + 1, 1).date() - timedelta(days=1)).day if month < 12 else 31)
-    return sourcedate.replace(year=year, month=month, day=day, tzinfo=sourcedate.tzinfo)
-
-def format_timezone_display(dt_object):
-    tz_name_full = dt_object.tzname()
-    if tz_name_full:
-        if "Western Indonesia Standard Time" in tz_name_full:
-            return "WIB"
-        elif "Central Indonesia Standard Time" in tz_name_full:
-            return "WITA"
-        elif "Eastern Indonesia Standard Time" in tz_name_full:
-            return "WIT"
-        return ""
-    return ""
-
 def parse_single_schedule_fragment(text_fragment, now_local_context):
     """
     Mencoba menguraikan satu pengingat dari fragmen teks menggunakan HANYA regex.
-    `now_local_context` digunakan untuk tanggal/waktu relatif.
+    Memakai SCHEDULE_PARSER yang tabel dan regex-nya sudah dikompilasi saat import.
     """
-    original_text_lower = text_fragment.lower()
-    processed_text = text_fragment # Pertahankan casing asli untuk ekstraksi metadata jika perlu
-    
-    scheduled_datetime_aware = now_local_context
-    target_tz = LOCAL_TIMEZONE
-    tz_matched = False
-    time_extracted = False # Flag baru untuk melacak apakah waktu sudah diekstrak
-    date_extracted = False # Flag baru untuk melacak apakah tanggal sudah diekstrak
-    
-    # --- 1. Ekstraksi Zona Waktu ---
-    tz_pattern_parts = [re.escape(k) for k in TIMEZONE_MAP.keys()]
-    tz_pattern = r'\b(' + '|'.join(tz_pattern_parts) + r')\b'
-    tz_match = re.search(tz_pattern, original_text_lower, re.IGNORECASE)
-    if tz_match:
-        tz_abbr = tz_match.group(1).lower()
-        try:
-            target_tz = pytz.timezone(TIMEZONE_MAP[tz_abbr])
-            processed_text = re.sub(tz_pattern, '', processed_text, flags=re.IGNORECASE).strip()
-            tz_matched = True
-        except pytz.UnknownTimeZoneError:
-            pass
-
-    # --- 2. Ekstraksi Tanggal dan Waktu (HANYA Regex) ---
-    
-    # Ekstraksi relatif waktu (dalam jam/menit lagi)
-    relative_time_pattern = r'\b(dalam\s+)?(\d+)\s*(jam|menit)\s*(lagi|ke\s+depan)?\b'
-    relative_time_match = re.search(relative_time_pattern, original_text_lower, re.IGNORECASE)
-    if relative_time_match:
-        value = int(relative_time_match.group(2))
-        unit = relative_time_match.group(3)
-        if unit == "jam":
-            scheduled_datetime_aware = now_local_context + timedelta(hours=value)
-        elif unit == "menit":
-            scheduled_datetime_aware = now_local_context + timedelta(minutes=value)
-        processed_text = re.sub(relative_time_pattern, '', processed_text, flags=re.IGNORECASE).strip()
-        time_extracted = True
-        
-    # Ekstraksi waktu sholat
-    waktu_sholat_map = {
-        "subuh": "05:00", "dzuhur": "12:00", "ashar": "15:00", "maghrib": "18:00", "isya": "19:30"
-    }
-    for sholat_name, sholat_time_str in waktu_sholat_map.items():
-        if sholat_name in original_text_lower:
-            try:
-                hour, minute = map(int, sholat_time_str.split(':'))
-                temp_time = scheduled_datetime_aware.replace(hour=hour, minute=minute, second=0, microsecond=0, tzinfo=scheduled_datetime_aware.tzinfo)
-                if temp_time < now_local_context and temp_time.date() == scheduled_datetime_aware.date():
-                    temp_time += timedelta(days=1)
-                scheduled_datetime_aware = temp_time
-                processed_text = re.sub(re.escape(sholat_name), '', processed_text, flags=re.IGNORECASE).strip()
-                if f"setelah {sholat_name}" in original_text_lower:
-                    scheduled_datetime_aware += timedelta(minutes=30)
-                    processed_text = processed_text.replace(f"setelah {sholat_name}", "").strip()
-                time_extracted = True
-                break
-            except ValueError:
-                pass
-            
-    # Ekstraksi waktu spesifik (jam:menit)
-    time_pattern_regex = r'\b(jam |pukul )?(\d{1,2}([\.:]\d{2})?)\s*(pagi|siang|sore|malam|am|pm)?\b'
-    time_match_regex = re.search(time_pattern_regex, original_text_lower, re.IGNORECASE)
-    if time_match_regex:
-        try:
-            time_str_raw = time_match_regex.group(2)
-            ampm_str = (time_match_regex.group(4) or '').lower()
-            hour_extracted, minute_extracted = (map(int, time_str_raw.split(':')) if ':' in time_str_raw else
-                                                map(int, time_str_raw.split('.')) if '.' in time_str_raw else
-                                                (int(time_str_raw), 0))
-            if 'pagi' in ampm_str:
-                if hour_extracted == 12: hour_extracted = 0
-            elif 'siang' in ampm_str:
-                if hour_extracted < 12: hour_extracted += 12
-            elif 'sore' in ampm_str or 'pm' in ampm_str:
-                if hour_extracted < 12: hour_extracted += 12
-            elif 'malam' in ampm_str:
-                if hour_extracted < 12: hour_extracted += 12
-                if hour_extracted == 24: hour_extracted = 0
-                    
-            if not (0 <= hour_extracted <= 23 and 0 <= minute_extracted <= 59):
-                raise ValueError("Invalid time")
-            
-            temp_datetime = scheduled_datetime_aware.replace(hour=hour_extracted, minute=minute_extracted, second=0, microsecond=0, tzinfo=scheduled_datetime_aware.tzinfo)
-            # Jika waktu yang diekstrak sudah lewat hari ini, majukan ke besok
-            if temp_datetime < now_local_context and temp_datetime.date() == scheduled_datetime_aware.date():
-                temp_datetime += timedelta(days=1)
-            scheduled_datetime_aware = temp_datetime
-            processed_text = re.sub(time_pattern_regex, '', processed_text, flags=re.IGNORECASE).strip()
-            time_extracted = True
-        except (ValueError, TypeError):
-            pass
-    
-    # Ekstraksi keyword tanggal (hari ini, besok, dll.)
-    date_keywords_map = {
-        "hari ini": now_local_context.date(), "besok": (now_local_context + timedelta(days=1)).date(),
-        "lusa": (now_local_context + timedelta(days=2)).date(), "minggu depan": (now_local_context + timedelta(weeks=1)).date(),
-        "bulan depan": (now_local_context.replace(day=1) + timedelta(days=32)).replace(day=now_local_context.day).date()
-    }
-    for keyword, date_obj in date_keywords_map.items():
-        if keyword in original_text_lower:
-            scheduled_datetime_aware = scheduled_datetime_aware.replace(year=date_obj.year, month=date_obj.month, day=date_obj.day, tzinfo=scheduled_datetime_aware.tzinfo)
-            processed_text = re.sub(re.escape(keyword), '', processed_text, flags=re.IGNORECASE).strip()
-            date_extracted = True
-            break
-        
-    # Ekstraksi hari dalam seminggu
-    day_of_week_map = {
-        "senin": 0, "selasa": 1, "rabu": 2, "kamis": 3, "jumat": 4, "sabtu": 5, "minggu": 6
-    }
-    for day_name, day_num in day_of_week_map.items():
-        if day_name in original_text_lower:
-            days_ahead = (day_num - now_local_context.weekday() + 7) % 7
-            
-            # Jika hari yang disebutkan adalah hari ini, dan waktu sudah lewat, majukan ke minggu depan
-            if days_ahead == 0 and scheduled_datetime_aware.time() < now_local_context.time() and not time_extracted:
-                days_ahead = 7
-            
-            target_date = scheduled_datetime_aware.date() + timedelta(days=days_ahead)
-            scheduled_datetime_aware = scheduled_datetime_aware.replace(year=target_date.year, month=target_date.month, day=target_date.day, tzinfo=scheduled_datetime_aware.tzinfo)
-            processed_text = re.sub(re.escape(day_name), '', processed_text, flags=re.IGNORECASE).strip()
-            date_extracted = True
-            break
-
-    # Ekstraksi tanggal spesifik (DD Month YYYY atau DD/MM/YYYY)
-    date_pattern_regex = r'\b(\d{1,2}) (januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember) (\d{4})\b|\b(\d{1,2})/(\d{1,2})/(\d{4})\b'
-    date_match_regex = re.search(date_pattern_regex, original_text_lower, re.IGNORECASE)
-    if date_match_regex:
-        try:
-            parsed_date = None
-            if date_match_regex.group(2):
-                day_str, month_name, year_str = date_match_regex.group(1, 2, 3)
-                bulan_map = {
-                    "januari": 1, "februari": 2, "maret": 3, "april": 4, "mei": 5, "juni": 6,
-                    "juli": 7, "agustus": 8, "september": 9, "oktober": 10, "november": 11, "desember": 12
-                }
-                month_num = bulan_map.get(month_name.lower())
-                if month_num:
-                    parsed_date = datetime(int(year_str), month_num, int(day_str)).date()
-            elif date_match_regex.group(4):
-                day_str, month_str, year_str = date_match_regex.group(4, 5, 6)
-                parsed_date = datetime(int(year_str), int(month_str), int(day_str)).date()
-
-            if parsed_date:
-                scheduled_datetime_aware = scheduled_datetime_aware.replace(year=parsed_date.year, month=parsed_date.month, day=parsed_date.day, tzinfo=scheduled_datetime_aware.tzinfo)
-                processed_text = re.sub(date_pattern_regex, '', processed_text, flags=re.IGNORECASE).strip()
-                date_extracted = True
-        except (ValueError, TypeError):
-            pass
-
-    # Default ke 9 pagi jika TIDAK ADA waktu yang terdeteksi sama sekali
-    if not time_extracted:
-        default_hour, default_minute = 9, 0
-        temp_time = scheduled_datetime_aware.replace(hour=default_hour, minute=default_minute, second=0, microsecond=0, tzinfo=scheduled_datetime_aware.tzinfo)
-        # Jika default 9 AM adalah di masa lalu untuk hari ini, majukan ke besok
-        if temp_time < now_local_context and not date_extracted: # Hanya majukan jika tanggal tidak spesifik
-            temp_time += timedelta(days=1)
-        scheduled_datetime_aware = temp_time
-        time_extracted = True # Set true karena default sudah diterapkan
-
-    # --- 3. Ekstraksi Pengulangan & Metadata Terstruktur (HANYA Regex) ---
-    repeat_type = "none"
-    repeat_interval = 0
-    metadata = {} # Inisialisasi metadata di awal
-
-    # Pola pengulangan yang sudah ada
-    monthly_repeat_pattern = r'(?:setiap|tiap)\s*(\d+)\s*bulan|(?:(\d+)\s*bulan\s*kedepan)'
-    monthly_repeat_match = re.search(monthly_repeat_pattern, original_text_lower)
-    if monthly_repeat_match:
-        repeat_type = "monthly_interval"
-        repeat_interval = int(monthly_repeat_match.group(1) or monthly_repeat_match.group(2))
-        processed_text = re.sub(monthly_repeat_pattern, '', processed_text, flags=re.IGNORECASE).strip()
-
-    yearly_repeat_pattern_explicit = r'(?:setiap|tiap)\s*(\d+)\s*tahun|(?:(\d+)\s*tahun\s*kedepan)'
-    yearly_repeat_match_explicit = re.search(yearly_repeat_pattern_explicit, original_text_lower)
-    if yearly_repeat_match_explicit:
-        repeat_type = "yearly"
-        repeat_interval = int(yearly_repeat_match_explicit.group(1) or yearly_repeat_match_explicit.group(2))
-        processed_text = re.sub(yearly_repeat_pattern_explicit, '', processed_text, flags=re.IGNORECASE).strip()
-    elif "setiap tahun" in original_text_lower or "tiap tahun" in original_text_lower:
-        repeat_type = "yearly"
-        repeat_interval = 1 
-        processed_text = re.sub(r'setiap tahun|tiap tahun', '', processed_text, flags=re.IGNORECASE).strip()
-    
-    # NEW: Pola pengulangan Harian/Mingguan
-    if "daily" in original_text_lower or "setiap hari" in original_text_lower or "tiap hari" in original_text_lower:
-        repeat_type = "daily"
-        repeat_interval = 1
-        processed_text = re.sub(r'daily|setiap hari|tiap hari', '', processed_text, flags=re.IGNORECASE).strip()
-    
-    mon_wed_fri_match = re.search(r'mon/wed/fri', original_text_lower, re.IGNORECASE)
-    if mon_wed_fri_match:
-        repeat_type = "weekly_custom" # Ini perlu logika lebih kompleks di scheduler
-        metadata["repeat_days"] = "Mon,Wed,Fri"
-        processed_text = processed_text.replace(mon_wed_fri_match.group(0), "").strip()
-    
-    for day_name_key, day_num_val in day_of_week_map.items():
-        if f"{day_name_key}s" in original_text_lower: # For "Sundays", "Tuesdays"
-            repeat_type = "weekly"
-            repeat_interval = day_num_val # Store the weekday number (0=Mon, 6=Sun)
-            processed_text = processed_text.replace(f"{day_name_key}s", "").strip()
-            break
-        
-    # Pola untuk metadata spesifik
-    metadata_patterns = {
-        "notes": r'(?:notes|catatan):\s*["“](.*?)[”"]|(?:notes|catatan):\s*(.+?)(?=\s*(?:mood:|suasana hati:|suggestion:|saran:|$))',
-        "mood": r'(?:mood|suasana hati):\s*([^\s]+)(?=\s*(?:notes:|catatan:|suggestion:|saran:|$))',
-        "suggestion": r'(?:suggestion|saran):\s*(.+)',
-        # Pola untuk aktivitas/item yang Anda sebutkan
-        "activity_type": r'(gym|online course|reading|groceries|in-office day|standup|rapat|class|meeting)', # Kata kunci untuk jenis aktivitas utama
-        "favorite_meals": r'(?:favorite meals|makanan favorit):\s*(.+)',
-        "coffee_preference": r'(?:coffee|kopi):\s*(.+)'
-    }
-
-    temp_processed_text_for_metadata = processed_text # Salinan untuk ekstraksi metadata
-    for key, pattern in metadata_patterns.items():
-        match = re.search(pattern, temp_processed_text_for_metadata, re.IGNORECASE)
-        if match:
-            # Handle groups for different patterns
-            if key in ["notes", "favorite_meals", "coffee_preference", "suggestion"]:
-                content = (match.group(1) or match.group(2) or match.group(0).split(':', 1)[1]).strip('"“’”').strip()
-            elif key == "mood":
-                content = match.group(1).strip()
-            elif key == "activity_type": # For "gym", "in-office day", etc.
-                content = match.group(1).strip()
-            else:
-                content = match.group(0).strip()
-            
-            metadata[key] = content
-            temp_processed_text_for_metadata = re.sub(pattern, '', temp_processed_text_for_metadata, flags=re.IGNORECASE).strip()
-            
-    # Bersihkan sisa temp_processed_text_for_metadata setelah semua metadata diekstrak
-    clean_remaining_text = re.sub(r'\s+', ' ', temp_processed_text_for_metadata).strip()
+    return SCHEDULE_PARSER.parse(text_fragment, now_local_context)
 
 
-    # Tentukan event_title (prioritas dari activity_type atau kata pertama yang tersisa)
-    event_title = "Pengingat"
-    
-    if 'activity_type' in metadata: # Prioritaskan dari metadata activity_type
-        event_title = metadata['activity_type'].capitalize()
-    elif clean_remaining_text: # Fallback ke sisa teks setelah ekstraksi
-        # Hindari mengambil kata-kata yang mungkin sisa dari waktu/tanggal yang tidak terdeteksi sempurna
-        # Filter kata-kata umum yang sering tersisa dan bukan event
-        common_filler_words = ["untuk", "saya", "di", "pada", "jam", "pukul", "lagi", "kedepan"]
-        potential_event_words = [word for word in clean_remaining_text.split() if word.lower() not in common_filler_words]
-        if potential_event_words:
-            event_title = potential_event_words[0].capitalize()
-        else:
-            event_title = "Pengingat" # Jika tidak ada kata yang cocok
-    
-    # Pastikan event_title tidak kosong atau hanya angka
-    if not event_title or re.match(r'^\d+$', event_title):
-        event_title = "Pengingat"
-        if clean_remaining_text and clean_remaining_text.lower() != "pengingat":
-            metadata["description_fallback"] = clean_remaining_text # Simpan sebagai deskripsi umum di metadata
-
-
-    # --- 4. Validasi Akhir dan Konversi Zona Waktu ---
-    tolerance = timedelta(seconds=5) # Beri sedikit toleransi untuk waktu sekarang
-    
-    if tz_matched: 
-        scheduled_datetime_naive_temp = scheduled_datetime_aware.replace(tzinfo=None)
-        scheduled_datetime_localized_target = target_tz.localize(scheduled_datetime_naive_temp)
-        scheduled_datetime_final = scheduled_datetime_localized_target.astimezone(LOCAL_TIMEZONE)
-    else:
-        scheduled_datetime_final = scheduled_datetime_aware 
-
-    # Jika waktu yang dihasilkan sudah lewat dari sekarang (dengan toleransi), batalkan atau majukan
-    # Kecuali jika tanggalnya sudah spesifik dan di masa depan
-    if scheduled_datetime_final < now_local_context - tolerance:
-        # Jika ada tanggal spesifik yang diekstrak dan itu di masa lalu, biarkan itu
-        # Tapi jika tidak ada tanggal spesifik dan waktu sudah lewat, majukan ke besok
-        if not date_extracted:
-            scheduled_datetime_final += timedelta(days=1)
-        else:
-            # Jika tanggal spesifik diekstrak dan itu di masa lalu, ini adalah pengingat yang terlewat
-            # Untuk saat ini, kita akan mengembalikannya sebagai None atau membiarkannya.
-            # Untuk tujuan pengingat, kita ingin yang akan datang, jadi kita bisa kembalikan None
-            # atau majukan jika itu masuk akal.
-            # Untuk kasus ini, jika tanggal spesifik sudah diekstrak, kita asumsikan itu yang diinginkan
-            # dan tidak perlu majukan ke besok secara otomatis jika sudah di masa lalu.
-            # Namun, API kita akan menolak tanggal di masa lalu, jadi lebih baik kembalikan None.
-            # Atau, jika hanya waktu yang spesifik (misal, "jam 9 pagi") dan tanggal tidak, majukan.
-            if not time_extracted and not date_extracted: # Jika tidak ada waktu/tanggal spesifik, dan default 9 pagi di masa lalu
-                 return None # Jangan buat pengingat di masa lalu
-            elif time_extracted and not date_extracted: # Jika hanya waktu spesifik, dan sudah lewat hari ini
-                 scheduled_datetime_final += timedelta(days=1) # Majukan ke besok
-            else: # Ada tanggal spesifik dan itu di masa lalu
-                return None # Jangan buat pengingat di masa lalu
-            
-
-    if scheduled_datetime_final:
-        return {
-            "event": event_title,
-            "datetime": scheduled_datetime_final,
-            "repeat_type": repeat_type,
-            "repeat_interval": repeat_interval,
-            "metadata": metadata
-        }
-    return None
+# Parsing paralel lewat process pool untuk catatan besar (lihat schedule_parser.PARSE_POOL_THRESHOLD)
+PARALLEL_PARSE_ENABLED = os.environ.get('PARALLEL_PARSE', '0') == '1'
 
-
-def extract_multiple_schedules(full_text):
+def extract_multiple_schedules(full_text, parallel=PARALLEL_PARSE_ENABLED):
     """
     Menguraikan beberapa pengingat dari satu blok teks input.
     Memecah teks berdasarkan baris dan mencoba menguraikan setiap fragmen.
@@ -391,12 +85,7 @@ def extract_multiple_schedules(full_text):
     
     lines = [line.strip() for line in full_text.split('\n') if line.strip()]
     
-    parsed_reminders = []
-
-    for line_text in lines:
-        result = parse_single_schedule_fragment(line_text, now_local)
-        if result:
-            parsed_reminders.append(result)
+    parsed_reminders = [result for result in parse_lines(lines, now_local, parallel=parallel) if result]
             
     # Fallback: Jika tidak ada pengingat yang ditemukan dari baris individual,
     # coba parsing seluruh teks sebagai satu event utama.
@@ -408,6 +97,153 @@ def extract_multiple_schedules(full_text):
     return parsed_reminders
 
 
+# --- Serialisasi & Versi Perubahan per User ---
+# Field yang bisa diminta lewat `fields=`; metadata dan dua terakhir disusun dari kolom lain
+REMINDER_FIELDS = ('id', 'user_id', 'event', 'metadata', 'datetime', 'repeat_type', 'repeat_interval', 'notified',
+                   'formatted_datetime', 'notified_status')
+DERIVED_FIELD_COLUMNS = {'metadata': ('metadata',) + METADATA_COLUMNS, 'formatted_datetime': ('datetime',),
+                         'notified_status': ('notified',)}
+
+SERIALIZED_FIELDS = ('datetime', 'formatted_datetime', 'notified_status', 'metadata')
+
+def serialize_reminders(rows, fields=REMINDER_FIELDS):
+    """
+    Serialisasi satu result set sekaligus: keputusan per field dibuat sekali per batch, dan teks
+    tanggal/zona diambil dari DATETIME_FORMATTER (dihitung sekali per tanggal+offset).
+    """
+    plain_fields = [field for field in fields if field not in SERIALIZED_FIELDS]
+    with_datetime = 'datetime' in fields
+    with_formatted = 'formatted_datetime' in fields
+    with_status = 'notified_status' in fields
+    # Hanya disusun bila diminta; tampilan daftar bisa melewatinya dengan fields=
+    with_metadata = 'metadata' in fields
+    format_datetime = DATETIME_FORMATTER.format
+    serialized = []
+    for r in rows:
+        r_dict = dict(zip(plain_fields, [r[field] for field in plain_fields]))
+        if with_datetime or with_formatted:
+            iso_string, formatted = format_datetime(r['datetime'])
+            if with_datetime:
+                r_dict['datetime'] = iso_string
+            if with_formatted:
+                r_dict['formatted_datetime'] = formatted
+        if with_status:
+            r_dict['notified_status'] = "Selesai" if r['notified'] else "Akan Datang"
+        if with_metadata:
+            r_dict['metadata'] = row_metadata(r)
+        serialized.append(r_dict)
+    return serialized
+
+def serialize_reminder(r, fields=REMINDER_FIELDS):
+    return serialize_reminders((r,), fields)[0]
+
+def parse_fields_param(fields_param):
+    """`fields=event,datetime` -> (kolom yang dibaca store, field keluaran). id selalu disertakan. ValueError bila tidak dikenal."""
+    if not fields_param:
+        return REMINDER_LIST_COLUMNS, REMINDER_FIELDS
+    requested = [field.strip() for field in fields_param.split(',') if field.strip()]
+    unknown = [field for field in requested if field not in REMINDER_FIELDS]
+    if unknown:
+        raise ValueError(f"Field tidak dikenal: {', '.join(unknown)}")
+    fields = tuple(field for field in REMINDER_FIELDS if field == 'id' or field in requested)
+    columns = []
+    for field in fields:
+        for column in DERIVED_FIELD_COLUMNS.get(field, (field,)):
+            if column not in columns:
+                columns.append(column)
+    return tuple(columns), fields
+
+def get_user_version(user_id):
+    """Versi perubahan user (naik pada setiap insert/update/delete pengingatnya). Dibaca sekali per request."""
+    versions = g.setdefault('_user_versions', {})
+    if user_id not in versions:
+        versions[user_id] = store.user_version(user_id)
+    return versions[user_id]
+
+def with_version_etag(response, version):
+    response.set_etag(str(version))
+    # Browser selalu merevalidasi dengan If-None-Match, sehingga polling yang tidak berubah dibalas 304
+    response.headers['Cache-Control'] = 'no-cache'
+    return response
+
+def not_modified_response(version):
+    return with_version_etag(app.response_class(status=304), version)
+
+# --- Cache Respons (lihat response_cache.py) ---
+response_cache = ResponseCache()
+
+def cached_response(view):
+    """
+    Cache body JSON endpoint baca per (user, versi, path, parameter). Hit dilayani tanpa query
+    reminders maupun serialisasi; respons streaming disimpan sambil tetap di-stream.
+    """
+    @functools.wraps(view)
+    def wrapper(*args, **kwargs):
+        user_id = request.args.get('user_id')
+        if not user_id:
+            return view(*args, **kwargs)
+        version = get_user_version(user_id)
+        if request.if_none_match.contains(str(version)):
+            return not_modified_response(version)
+        key = cache_key(user_id, version, request.path, request.args)
+        body = response_cache.get(key)
+        if body is not None:
+            return with_version_etag(app.response_class(body, mimetype='application/json'), version)
+
+        result = view(*args, **kwargs)
+        response, status = result if isinstance(result, tuple) else (result, 200)
+        if status != 200:
+            return result
+        if response.is_streamed:
+            response.response = response_cache.tee(user_id, key, response.response)
+        else:
+            response_cache.set(user_id, key, response.get_data())
+        if not response.get_etag()[0]:
+            with_version_etag(response, version)
+        return response, status
+    return wrapper
+
+def invalidate_user_caches(user_ids):
+    for user_id in set(user_ids):
+        response_cache.invalidate_user(user_id)
+
+# --- Metrik & Profiling (lihat metrics.py dan profiler.py) ---
+# Tidak diukur: koneksi SSE yang berumur panjang dan scrape /metrics itu sendiri
+METRICS_SKIP_ENDPOINTS = {'events_api', 'metrics_api'}
+
+@app.before_request
+def start_request_timer():
+    g._request_started = time.perf_counter()
+    if PROFILER_ENABLED and request.headers.get(PROFILER_HEADER) == '1':
+        g._profiler = SamplingProfiler().start()
+
+@app.after_request
+def record_request_metrics(response):
+    started = g.pop('_request_started', None)
+    profiler = g.pop('_profiler', None)
+    endpoint = request.endpoint or 'unmatched'
+    if METRICS_ENABLED and started is not None and endpoint not in METRICS_SKIP_ENDPOINTS:
+        histogram = HTTP_REQUEST_SECONDS.labels(endpoint, request.method, str(response.status_code))
+        # Dicatat saat body selesai dikirim, sehingga respons streaming terukur penuh
+        response.call_on_close(lambda: histogram.observe(time.perf_counter() - started))
+    if profiler is not None:
+        title = f"{request.method} {request.full_path.rstrip('?')}"
+        response.call_on_close(lambda: finish_profile(profiler, endpoint, title))
+    return response
+
+def finish_profile(profiler, endpoint, title):
+    profiler.stop()
+    path = profiler.write_collapsed(endpoint)
+    print(profiler.report(title))
+    print(f"  Stack lengkap: {path}")
+
+@app.route('/metrics', methods=['GET'])
+def metrics_api():
+    """Metrik worker ini dalam format teks Prometheus."""
+    if not METRICS_ENABLED:
+        return jsonify({"error": "Metrik dinonaktifkan (METRICS=0)."}), 404
+    return app.response_class(REGISTRY.render(), mimetype='text/plain; version=0.0.4'), 200
+
 # --- API Endpoints ---
 @app.route('/')
 def serve_index():
@@ -435,44 +271,299 @@ def add_multiple_reminders_api():
     if not parsed_reminders:
         return jsonify({"success": False, "message": "Tidak dapat mendeteksi pengingat dari catatan Anda. Coba format lain."}), 400
 
-    added_count = 0
-    for reminder_info in parsed_reminders:
-        event = reminder_info['event']
-        scheduled_time = reminder_info['datetime']
-        repeat_type = reminder_info['repeat_type']
-        repeat_interval = reminder_info['repeat_interval']
-        metadata = json.dumps(reminder_info.get('metadata', {})) 
-
-        insert_db('INSERT INTO reminders (user_id, event, metadata, datetime, repeat_type, repeat_interval, notified) VALUES (?, ?, ?, ?, ?, ?, ?)',
-                  (user_id, event, metadata, scheduled_time.isoformat(), repeat_type, repeat_interval, 0))
-        added_count += 1
+    added_count = insert_reminders(user_id, parsed_reminders)
 
     return jsonify({"success": True, "message": f"{added_count} pengingat berhasil ditambahkan."}), 200
 
+# Baris per transaksi untuk /import_reminders
+IMPORT_BATCH_SIZE = int(os.environ.get('IMPORT_BATCH_SIZE', 1000))
+NDJSON_MIMETYPES = ('application/x-ndjson', 'application/jsonl', 'application/json-seq')
+
+def _ndjson_line_text(line_text):
+    """Satu baris NDJSON: objek {"text": "..."} atau string JSON biasa."""
+    value = json.loads(line_text)
+    if isinstance(value, dict):
+        value = value.get('text')
+    if not isinstance(value, str):
+        raise ValueError("Baris NDJSON harus berupa string atau objek dengan field 'text'.")
+    return value.strip()
+
+@app.route('/import_reminders', methods=['POST'])
+def import_reminders_api():
+    """
+    Impor massal: body berupa teks per baris (text/plain) atau NDJSON, dibaca secara streaming.
+    Setiap baris diurai dengan snapshot `now_local` yang sama, lalu disimpan per IMPORT_BATCH_SIZE
+    baris dalam satu transaksi. Hasil dikembalikan per baris, termasuk baris yang gagal diurai.
+    """
+    user_id = request.args.get('user_id')
+
+    if not user_id:
+        return jsonify({"success": False, "message": "User ID tidak ditemukan."}), 400
+
+    is_ndjson = request.mimetype in NDJSON_MIMETYPES
+    now_local = datetime.now(LOCAL_TIMEZONE)
+    results = []
+    batch = []
+    added_count = 0
+
+    for line_number, raw_line in enumerate(request.stream, start=1):
+        line_text = raw_line.decode('utf-8', errors='replace').strip()
+        if not line_text:
+            continue
+        if is_ndjson:
+            try:
+                line_text = _ndjson_line_text(line_text)
+            except ValueError as e:
+                results.append({"line": line_number, "success": False, "message": str(e)})
+                continue
+
+        reminder_info = parse_single_schedule_fragment(line_text, now_local) if line_text else None
+        if not reminder_info:
+            results.append({"line": line_number, "success": False, "message": "Tidak dapat mendeteksi pengingat dari baris ini."})
+            continue
+
+        results.append({"line": line_number, "success": True, "event": reminder_info['event'],
+                        "datetime": reminder_info['datetime'].isoformat(), "repeat_type": reminder_info['repeat_type']})
+        batch.append(reminder_info)
+        if len(batch) >= IMPORT_BATCH_SIZE:
+            added_count += insert_reminders(user_id, batch)
+            batch = []
+
+    added_count += insert_reminders(user_id, batch)
+
+    return jsonify({
+        "success": True,
+        "message": f"{added_count} pengingat berhasil diimpor.",
+        "added": added_count,
+        "failed": len(results) - added_count,
+        "results": results
+    }), 200
+
+# --- Daftar Pengingat: keyset pagination + streaming ---
+GET_REMINDERS_DEFAULT_PAGE_SIZE = 200
+GET_REMINDERS_MAX_PAGE_SIZE = 1000
+# Baris yang diambil dari store dan diserialisasi per potongan respons
+STREAM_CHUNK_ROWS = 500
+
+def encode_cursor(due_at, reminder_id):
+    return f"{due_at}:{reminder_id}"
+
+def decode_cursor(cursor):
+    due_at, reminder_id = cursor.split(':')
+    return int(due_at), int(reminder_id)
+
+def parse_page_params(paginate):
+    """
+    limit/cursor dari query string -> (cursor, limit). Tanpa limit: GET_REMINDERS_DEFAULT_PAGE_SIZE bila
+    `paginate`, selain itu None (tanpa pagination). ValueError dengan pesan tetap bila tidak valid.
+    """
+    try:
+        page_cursor = decode_cursor(request.args['cursor']) if request.args.get('cursor') else None
+    except ValueError:
+        raise ValueError("Cursor tidak valid.") from None
+    raw_limit = request.args.get('limit')
+    if not raw_limit:
+        return page_cursor, GET_REMINDERS_DEFAULT_PAGE_SIZE if paginate else None
+    try:
+        limit = int(raw_limit)
+    except ValueError:
+        raise ValueError("Parameter limit harus berupa bilangan bulat.") from None
+    return page_cursor, max(1, min(limit, GET_REMINDERS_MAX_PAGE_SIZE))
+
+def stream_reminders(rows, fields, limit=None):
+    """
+    Keluarkan JSON potongan demi potongan (memori dibatasi STREAM_CHUNK_ROWS, bukan jumlah baris user).
+    Tanpa limit: array JSON (format lama). Dengan limit: {"reminders": [...], "next_cursor": ...};
+    query mengambil limit + 1 baris sehingga baris ekstra menandakan masih ada halaman berikutnya.
+    """
+    yield '{"reminders":[' if limit is not None else '['
+    emitted = 0
+    last_row = None
+    has_more = False
+    try:
+        while True:
+            chunk_rows = list(itertools.islice(rows, STREAM_CHUNK_ROWS))
+            if not chunk_rows:
+                break
+            if limit is not None and emitted + len(chunk_rows) > limit:
+                chunk_rows = chunk_rows[:limit - emitted]
+                has_more = True
+            if chunk_rows:
+                chunk = ','.join(app.json.dumps(r_dict) for r_dict in serialize_reminders(chunk_rows, fields))
+                yield chunk if emitted == 0 else ',' + chunk
+                emitted += len(chunk_rows)
+                last_row = chunk_rows[-1]
+            if has_more:
+                break
+    finally:
+        # Kembalikan koneksi store meskipun klien memutus di tengah stream
+        rows.close()
+    if limit is None:
+        yield ']'
+    else:
+        next_cursor = encode_cursor(last_row['due_at'], last_row['id']) if has_more else None
+        yield '],"next_cursor":' + json.dumps(next_cursor) + '}'
+
 @app.route('/get_reminders', methods=['GET'])
+@cached_response
 def get_reminders_api():
+    """
+    Daftar pengingat user, diurutkan (due_at, id).
+    Parameter opsional: status=all|upcoming|done, activity_type=..., mood=..., fields=id,event,... (proyeksi),
+    limit/cursor (keyset pagination; cursor diambil dari next_cursor halaman sebelumnya).
+    """
     user_id = request.args.get('user_id')
 
     if not user_id:
         return jsonify({"success": False, "message": "User ID tidak ditemukan."}), 400
 
-    reminders = query_db('SELECT id, user_id, event, metadata, datetime, repeat_type, repeat_interval, notified FROM reminders WHERE user_id = ? ORDER BY datetime ASC', (user_id,))
-    
-    reminders_list = []
-    for r in reminders:
-        r_dict = dict(r)
-        dt_obj = datetime.fromisoformat(r_dict['datetime'])
-        r_dict['datetime'] = dt_obj.isoformat()
-        r_dict['formatted_datetime'] = dt_obj.strftime(f'%d %B %Y %H:%M {format_timezone_display(dt_obj)}')
-        r_dict['notified_status'] = "Selesai" if r_dict['notified'] else "Akan Datang"
-        
-        r_dict['metadata'] = json.loads(r_dict['metadata']) if r_dict['metadata'] else {}
-
-        reminders_list.append(r_dict)
-    
-    return jsonify(reminders_list), 200
+    status = request.args.get('status', 'all')
+    if status not in REMINDER_STATUSES:
+        return jsonify({"success": False, "message": "Status harus salah satu dari: all, upcoming, done."}), 400
+    try:
+        columns, fields = parse_fields_param(request.args.get('fields'))
+    except ValueError as e:
+        return jsonify({"success": False, "message": f"Parameter tidak valid: {e}"}), 400
+    try:
+        page_cursor, limit = parse_page_params(paginate=bool(request.args.get('cursor')))
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    # Versi tidak berubah sejak respons terakhir klien: 304 tanpa menyentuh baris reminders
+    version = get_user_version(user_id)
+    if request.if_none_match.contains(str(version)):
+        return not_modified_response(version)
+
+    # Filter kolom metadata bertipe. Satu baris ekstra menandakan masih ada halaman berikutnya.
+    filters = {column: request.args[column] for column in FILTER_COLUMNS if request.args.get(column)}
+    rows = store.list_by_user(user_id, columns, status=status, filters=filters, after=page_cursor,
+                              limit=limit + 1 if limit is not None else None)
+
+    response = app.response_class(stream_with_context(stream_reminders(rows, fields, limit)), mimetype='application/json')
+    return with_version_etag(response, version), 200
+
+@app.route('/get_reminder_history', methods=['GET'])
+@cached_response
+def get_reminder_history_api():
+    """
+    Riwayat: pengingat sekali jalan yang sudah diarsipkan oleh compaction.py, terbaru dulu.
+    limit/cursor seperti /get_reminders; hasil selalu berbentuk {"reminders": [...], "next_cursor": ...}.
+    """
+    user_id = request.args.get('user_id')
+
+    if not user_id:
+        return jsonify({"success": False, "message": "User ID tidak ditemukan."}), 400
+    try:
+        page_cursor, limit = parse_page_params(paginate=True)
+    except ValueError as e:
+        return jsonify({"success": False, "message": str(e)}), 400
+
+    version = get_user_version(user_id)
+    if request.if_none_match.contains(str(version)):
+        return not_modified_response(version)
+
+    rows = store.archived_by_user(user_id, before=page_cursor, limit=limit + 1)
+    next_cursor = encode_cursor(rows[limit - 1]['due_at'], rows[limit - 1]['id']) if len(rows) > limit else None
+    return with_version_etag(jsonify({"reminders": serialize_reminders(rows[:limit]), "next_cursor": next_cursor}), version), 200
+
+@app.route('/sync_reminders', methods=['GET'])
+@cached_response
+def sync_reminders_api():
+    """
+    Sinkronisasi delta: hanya baris yang berubah/terhapus setelah versi `since`.
+    Tanpa `since` (atau since=0) mengembalikan daftar lengkap dengan "full": true.
+    """
+    user_id = request.args.get('user_id')
+    since = request.args.get('since', default=0, type=int)
+
+    if not user_id:
+        return jsonify({"success": False, "message": "User ID tidak ditemukan."}), 400
+
+    version = get_user_version(user_id)
+    if request.if_none_match.contains(str(version)):
+        return not_modified_response(version)
+
+    if since > version:
+        # Klien memegang versi yang tidak dikenal server (mis. database direset): kirim ulang semuanya
+        since = 0
+
+    changed, deleted, full = store.changes_since(user_id, since)
+
+    return with_version_etag(jsonify({
+        "version": version,
+        "full": full,
+        "changed": serialize_reminders(changed),
+        "deleted": deleted
+    }), version), 200
+
+# --- Kalender: seri berulang dijabarkan per bulan ---
+month_expansion_cache = MonthExpansionCache()
+
+def month_bounds(year, month):
+    start_date = LOCAL_TIMEZONE.localize(datetime(year, month, 1))
+    if month == 12:
+        end_date = LOCAL_TIMEZONE.localize(datetime(year + 1, 1, 1))
+    else:
+        end_date = LOCAL_TIMEZONE.localize(datetime(year, month + 1, 1))
+    return start_date, end_date
+
+def get_month_expansion(user_id, year, month, version):
+    key = (user_id, year, month, version)
+    expansion = month_expansion_cache.get(key)
+    if expansion is None:
+        start_date, end_date = month_bounds(year, month)
+        start_epoch, end_epoch = datetime_to_epoch(start_date), datetime_to_epoch(end_date)
+        # Baris yang jatuh di bulan ini + seri berulang yang dimulai sebelumnya
+        rows = list(store.range_by_user(user_id, start_epoch, end_epoch)) + list(store.recurring_before(user_id, start_epoch))
+        expansion = expand_month(rows, start_date, end_date, LOCAL_TIMEZONE)
+        month_expansion_cache.put(key, expansion)
+    return expansion
+
+@app.route('/get_calendar_month', methods=['GET'])
+@cached_response
+def get_calendar_month_api():
+    """Jumlah kemunculan per tanggal untuk grid kalender (seri berulang ikut dijabarkan)."""
+    year = request.args.get('year', type=int)
+    month = request.args.get('month', type=int)
+    user_id = request.args.get('user_id')
+
+    if not year or not month or not user_id or not 1 <= month <= 12:
+        return jsonify({"error": "Missing year, month, or user_id parameter"}), 400
+
+    version = get_user_version(user_id)
+    if request.if_none_match.contains(str(version)):
+        return not_modified_response(version)
+
+    expansion = get_month_expansion(user_id, year, month, version)
+    return with_version_etag(jsonify({"year": year, "month": month, "version": version,
+                                      "days": expansion.day_counts()}), version), 200
+
+@app.route('/get_calendar_day', methods=['GET'])
+@cached_response
+def get_calendar_day_api():
+    """Detail kemunculan pada satu tanggal (YYYY-MM-DD), diambil dari ekspansi bulan yang sama."""
+    date_string = request.args.get('date')
+    user_id = request.args.get('user_id')
+
+    if not date_string or not user_id:
+        return jsonify({"error": "Missing date or user_id parameter"}), 400
+    try:
+        date = datetime.strptime(date_string, '%Y-%m-%d')
+    except ValueError:
+        return jsonify({"error": "Format tanggal harus YYYY-MM-DD"}), 400
+
+    version = get_user_version(user_id)
+    if request.if_none_match.contains(str(version)):
+        return not_modified_response(version)
+
+    expansion = get_month_expansion(user_id, date.year, date.month, version)
+    # Detail diserialisasi saat diminta, dengan datetime kemunculan (bukan datetime seri yang tersimpan)
+    occurrences = serialize_reminders([dict(expansion.rows[reminder_id], datetime=occurrence.isoformat())
+                                       for occurrence, reminder_id in expansion.days.get(date_string, [])])
+    return with_version_etag(jsonify(occurrences), version), 200
 
 @app.route('/get_reminders_for_month', methods=['GET'])
+@cached_response
 def get_reminders_for_month():
     year = request.args.get('year', type=int)
     month = request.args.get('month', type=int)
@@ -481,30 +572,59 @@ def get_reminders_for_month():
     if not year or not month or not user_id:
         return jsonify({"error": "Missing year, month, or user_id parameter"}), 400
 
-    start_date = datetime(year, month, 1, 0, 0, 0, tzinfo=LOCAL_TIMEZONE)
-    if month == 12:
-        end_date = datetime(year + 1, 1, 1, 23, 59, 59, tzinfo=LOCAL_TIMEZONE) - timedelta(days=1)
-    else:
-        end_date = datetime(year, month + 1, 1, 23, 59, 59, tzinfo=LOCAL_TIMEZONE) - timedelta(days=1)
+    start_date, end_date = month_bounds(year, month)
     
-    reminders = query_db(
-        'SELECT id, event, metadata, datetime FROM reminders WHERE user_id = ? AND datetime BETWEEN ? AND ? ORDER BY datetime ASC',
-        (user_id, start_date.isoformat(), end_date.isoformat())
-    )
+    reminders = store.range_by_user(user_id, datetime_to_epoch(start_date), datetime_to_epoch(end_date),
+                                    columns=('id', 'event', 'datetime', 'metadata') + METADATA_COLUMNS)
     
+    date_string = DATETIME_FORMATTER.date_string
     reminders_data = []
     for r in reminders:
-        r_dict = dict(r)
-        dt_obj = datetime.fromisoformat(r_dict['datetime'])
         reminders_data.append({
-            'id': r_dict['id'],
-            'event': r_dict['event'],
-            'metadata': json.loads(r_dict['metadata']) if r_dict['metadata'] else {},
-            'date': dt_obj.strftime('%Y-%m-%d')
+            'id': r['id'],
+            'event': r['event'],
+            'metadata': row_metadata(r),
+            'date': date_string(r['datetime'])
         })
     
     return jsonify(reminders_data), 200
 
+@app.route('/events', methods=['GET'])
+def events_api():
+    """
+    Server-Sent Events per user: "version" saat tersambung, lalu "changed" (versi naik) dan "due"
+    (pengingat jatuh tempo). Koneksi idle hanya menerima komentar heartbeat; jalankan gunicorn dengan
+    worker async (gevent, lihat Dockerfile) agar satu worker sanggup menahan ribuan koneksi.
+    """
+    user_id = request.args.get('user_id')
+
+    if not user_id:
+        return jsonify({"success": False, "message": "User ID tidak ditemukan."}), 400
+
+    version = get_user_version(user_id)
+    subscription = event_broker.subscribe(user_id, version)
+
+    def stream():
+        try:
+            yield f"retry: {EVENTS_RETRY_MS}\n\n"
+            yield format_sse('version', {"version": version})
+            while True:
+                # Heartbeat menjaga koneksi tetap hidup melewati proxy dan mendeteksi klien yang sudah pergi
+                yield subscription.get(EVENTS_HEARTBEAT_SECONDS) or ": ping\n\n"
+        finally:
+            event_broker.unsubscribe(subscription)
+
+    response = app.response_class(stream_with_context(stream()), mimetype='text/event-stream')
+    response.headers['Cache-Control'] = 'no-cache'
+    # Matikan buffering reverse proxy (nginx) agar event langsung terkirim
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
+@app.route('/cache_stats', methods=['GET'])
+def cache_stats_api():
+    """Penghitung hit/miss/eviction cache respons di worker ini."""
+    return jsonify(response_cache.stats()), 200
+
 @app.route('/delete_reminder/<int:reminder_id>', methods=['DELETE'])
 def delete_reminder_api(reminder_id):
     user_id = request.args.get('user_id')
@@ -512,121 +632,337 @@ def delete_reminder_api(reminder_id):
     if not user_id:
         return jsonify({"success": False, "message": "User ID tidak ditemukan."}), 400
 
-    cursor = get_db().execute('DELETE FROM reminders WHERE id = ? AND user_id = ?', (reminder_id, user_id))
-    get_db().commit()
-    if cursor.rowcount > 0:
+    deleted = store.delete(user_id, reminder_id)
+    if deleted > 0:
+        invalidate_user_caches([user_id])
+        event_broker.notify_changed()
         return jsonify({"success": True, "message": "Pengingat berhasil dihapus."}), 200
     else:
         return jsonify({"success": False, "message": "Pengingat tidak ditemukan atau Anda tidak memiliki izin untuk menghapusnya."}), 404
 
+# --- Operasi Massal (hapus / jadwalkan ulang banyak pengingat per request) ---
+# Satu transaksi per request, hanya baris milik user_id; pengganti ratusan DELETE /delete_reminder/<id>
+BULK_MAX_IDS = int(os.environ.get('BULK_MAX_IDS', 10000))
+BULK_FILTER_KEYS = ('status', 'start', 'end') + FILTER_COLUMNS
+
+def parse_bulk_ids(data):
+    """`ids` dari body JSON: daftar id pengingat. ValueError bila tidak valid."""
+    ids = data.get('ids')
+    if not isinstance(ids, list) or not ids or not all(isinstance(i, int) and not isinstance(i, bool) for i in ids):
+        raise ValueError("ids harus berupa daftar id pengingat (bilangan bulat).")
+    if len(ids) > BULK_MAX_IDS:
+        raise ValueError(f"Maksimal {BULK_MAX_IDS} id per request.")
+    return ids
+
+def parse_local_datetime(value):
+    """Tanggal/waktu ISO 8601 dari klien; tanpa zona dianggap LOCAL_TIMEZONE."""
+    try:
+        parsed = datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Tanggal/waktu tidak valid: {value!r}")
+    return LOCAL_TIMEZONE.localize(parsed) if parsed.tzinfo is None else parsed
+
+def parse_bulk_filter(filter_data):
+    """`filter` dari body JSON -> argumen store.delete_matching. Minimal satu kriteria; status "all" berarti semua."""
+    if not isinstance(filter_data, dict) or not filter_data:
+        raise ValueError(f"Sertakan ids atau filter ({', '.join(BULK_FILTER_KEYS)}).")
+    unknown = [key for key in filter_data if key not in BULK_FILTER_KEYS]
+    if unknown:
+        raise ValueError(f"Filter tidak dikenal: {', '.join(unknown)}")
+    # Nilai non-teks (daftar, objek, angka) tidak boleh sampai ke parameter query SQLite
+    not_text = [key for key, value in filter_data.items() if not isinstance(value, str)]
+    if not_text:
+        raise ValueError(f"Nilai filter harus berupa teks: {', '.join(not_text)}")
+    status = filter_data.get('status', 'all')
+    if status not in REMINDER_STATUSES:
+        raise ValueError("status harus salah satu dari: all, upcoming, done.")
+    criteria = {'status': status, 'filters': {column: filter_data[column] for column in FILTER_COLUMNS if filter_data.get(column)}}
+    # Rentang setengah terbuka start <= waktu < end, sama seperti range_by_user
+    if filter_data.get('start'):
+        criteria['start_epoch'] = datetime_to_epoch(parse_local_datetime(filter_data['start']))
+    if filter_data.get('end'):
+        criteria['end_epoch'] = datetime_to_epoch(parse_local_datetime(filter_data['end']))
+    return criteria
+
+@app.route('/delete_reminders', methods=['POST'])
+def delete_reminders_api():
+    """
+    Hapus banyak pengingat dalam satu transaksi. Body JSON: {"user_id", "ids": [...]} atau
+    {"user_id", "filter": {"status", "start", "end", "activity_type", "mood"}} (start/end ISO 8601).
+    Id milik user lain dilewati; dibalas jumlah yang terhapus.
+    """
+    data = request.get_json(silent=True) or {}
+    user_id = data.get('user_id')
+
+    if not user_id:
+        return jsonify({"success": False, "message": "User ID tidak ditemukan."}), 400
+
+    try:
+        if 'ids' in data and 'filter' in data:
+            raise ValueError("Sertakan ids atau filter, bukan keduanya.")
+        if 'ids' in data:
+            deleted = store.delete_many(user_id, parse_bulk_ids(data))
+        else:
+            deleted = store.delete_matching(user_id, **parse_bulk_filter(data.get('filter')))
+    except ValueError as e:
+        return jsonify({"success": False, "message": f"Parameter tidak valid: {e}"}), 400
+
+    if deleted:
+        invalidate_user_caches([user_id])
+        event_broker.notify_changed()
+    return jsonify({"success": True, "deleted": deleted, "message": f"{deleted} pengingat berhasil dihapus."}), 200
+
+@app.route('/reschedule_reminders', methods=['POST'])
+def reschedule_reminders_api():
+    """
+    Jadwalkan ulang banyak pengingat dalam satu transaksi. Body JSON: {"user_id", "ids": [...]} ditambah
+    "datetime" (ISO 8601, waktu baru untuk semuanya) atau "snooze_minutes" (tunda dari tenggat masing-masing,
+    atau dari sekarang bila sudah lewat). Pengingat menjadi belum dinotifikasi; dibalas jumlah yang diubah.
+    """
+    data = request.get_json(silent=True) or {}
+    user_id = data.get('user_id')
+
+    if not user_id:
+        return jsonify({"success": False, "message": "User ID tidak ditemukan."}), 400
+
+    try:
+        ids = parse_bulk_ids(data)
+        if data.get('datetime'):
+            new_datetime = parse_local_datetime(data['datetime'])
+            earliest_due_at = datetime_to_epoch(new_datetime)
+            updated = store.reschedule_many(user_id, ids, new_datetime)
+        else:
+            snooze_minutes = data.get('snooze_minutes')
+            if not isinstance(snooze_minutes, int) or isinstance(snooze_minutes, bool) or snooze_minutes <= 0:
+                raise ValueError("Sertakan datetime atau snooze_minutes (bilangan bulat positif).")
+            now_local = datetime.now(LOCAL_TIMEZONE)
+            earliest_due_at = int(now_local.timestamp()) + snooze_minutes * 60
+            updated = store.snooze_many(user_id, ids, snooze_minutes * 60, now_local)
+    except ValueError as e:
+        return jsonify({"success": False, "message": f"Parameter tidak valid: {e}"}), 400
+
+    if updated:
+        # Batas bawah tenggat baru: tenggat sebenarnya bisa lebih lambat, scheduler paling buruk bangun lebih awal
+        due_queue.push_many([(earliest_due_at, reminder_id) for reminder_id in ids])
+        wake_scheduler_if_earlier(earliest_due_at)
+        invalidate_user_caches([user_id])
+        event_broker.notify_changed()
+    return jsonify({"success": True, "updated": updated, "message": f"{updated} pengingat berhasil dijadwalkan ulang."}), 200
+
 # --- Scheduler untuk Mengecek Pengingat Jatuh Tempo ---
+# Batas tidur scheduler, supaya pengingat yang ditambahkan oleh proses lain tetap terambil
+MAX_SCHEDULER_SLEEP_SECONDS = int(os.environ.get('SCHEDULER_MAX_SLEEP_SECONDS', 30))
+CHECK_REMINDERS_JOB_ID = 'check_reminders'
+# Jumlah pengingat jatuh tempo yang dimajukan per transaksi
+SCHEDULER_BATCH_SIZE = int(os.environ.get('SCHEDULER_BATCH_SIZE', 500))
+
+due_queue = DueQueue()
+
 def check_reminders_job():
-    with app.app_context():
-        now_local = datetime.now(LOCAL_TIMEZONE)
-        
-        reminders = query_db('SELECT * FROM reminders WHERE notified = 0 ORDER BY datetime ASC')
+    try:
+        # Hanya leader (pemegang lease) yang memproses; proses lain cukup tidur sampai batas maksimum
+        if leader_lease.is_leader:
+            _process_due_reminders()
+    finally:
+        # Selalu jadwalkan putaran berikutnya, meskipun putaran ini gagal
+        schedule_next_check()
+
+# Shard dipindai paralel oleh thread biasa; sqlite3 melepas GIL selama query dan commit. Di worker
+# gevent thread menjadi greenlet: pemindaian berjalan serial dan query sqlite3 memblokir hub (semua
+# koneksi SSE/HTTP di worker itu). Karena itu Dockerfile memakai SCHEDULER_MODE=off + scheduler_worker.
+SCHEDULER_SHARD_WORKERS = int(os.environ.get('SCHEDULER_SHARD_WORKERS', min(len(store.shards), os.cpu_count() or 1)))
+_shard_executor = None
+
+def _process_due_reminders():
+    global _shard_executor
+    started = time.perf_counter()
+    shards = store.shards
+    if len(shards) == 1 or SCHEDULER_SHARD_WORKERS <= 1:
+        due_rows = sum(_process_shard_due_reminders(shard_store) for shard_store in shards)
+    else:
+        if _shard_executor is None:
+            _shard_executor = ThreadPoolExecutor(max_workers=SCHEDULER_SHARD_WORKERS, thread_name_prefix='shard-scan')
+        # sum() memunculkan exception pertama dari shard mana pun setelah semua selesai diproses
+        due_rows = sum(_shard_executor.map(_process_shard_due_reminders, shards))
+
+    due_queue.reload(store.next_due(due_queue.window_size))
+    SCHEDULER_DUE_ROWS.observe(due_rows)
+    SCHEDULER_TICK_SECONDS.observe(time.perf_counter() - started)
+
+def _process_shard_due_reminders(shard_store):
+    """Proses semua pengingat jatuh tempo di satu shard; mengembalikan jumlahnya."""
+    now_local = datetime.now(LOCAL_TIMEZONE)
+    now_epoch = int(now_local.timestamp())
+    processed = 0
+
+    # Diproses per batch: satu transaksi (satu fsync) per SCHEDULER_BATCH_SIZE pengingat.
+    # Baris yang sudah diproses tidak lagi cocok dengan `due_at <= now`, jadi loop pasti berhenti.
+    while True:
+        reminders = shard_store.due_before(now_epoch, SCHEDULER_BATCH_SIZE)
+        if not reminders:
+            break
 
+        notified_rows = []
+        advanced_rows = []
+        outbox_rows = []
+        # Event "due" untuk /events, dikirim oleh watcher EventBroker di setiap proses (lihat events.py)
+        due_events = []
         for reminder_data in reminders:
             reminder_dt = datetime.fromisoformat(reminder_data['datetime'])
-            
-            if reminder_dt.tzinfo is None and now_local.tzinfo is not None:
-                reminder_dt = LOCAL_TIMEZONE.localize(reminder_dt.replace(tzinfo=None))
-            elif reminder_dt.tzinfo is not None and now_local.tzinfo is None:
-                now_local = LOCAL_TIMEZONE.localize(now_local.replace(tzinfo=None))
-            
-            if now_local >= reminder_dt:
-                print(f"Mengirim notifikasi (simulasi di log) untuk: {reminder_data['event']} (User: {reminder_data['user_id']}) pada {reminder_dt}")
-                
-                if reminder_data['repeat_type'] == 'none':
-                    update_db('UPDATE reminders SET notified = 1 WHERE id = ?', (reminder_data['id'],))
+            if reminder_dt.tzinfo is None:
+                reminder_dt = LOCAL_TIMEZONE.localize(reminder_dt)
+
+            # Notifikasi hanya dicatat di outbox shard yang sama; pengiriman dilakukan NotificationDispatcher
+            outbox_rows.extend(dispatcher.outbox_rows(reminder_data['id'], reminder_data['user_id'], reminder_data['event'],
+                                                      reminder_dt.isoformat(), now_local.timestamp()))
+            due_events.append((reminder_data['user_id'], reminder_data['id'], reminder_data['event'], reminder_data['datetime'],
+                               now_local.timestamp()))
+
+            if reminder_data['repeat_type'] == 'none':
+                notified_rows.append((reminder_data['id'], reminder_data['due_at']))
+            else:
+                next_datetime = next_occurrence(reminder_dt, reminder_data['repeat_type'], reminder_data['repeat_interval'],
+                                                now_local, repeat_days=reminder_data['repeat_days'])
+                if next_datetime is None: # repeat_type tidak dikenal, perlakukan sebagai sekali jalan
+                    notified_rows.append((reminder_data['id'], reminder_data['due_at']))
                 else:
-                    next_datetime = reminder_dt
-                    repeat_interval = reminder_data['repeat_interval']
-                    
-                    if reminder_data['repeat_type'] == 'yearly':
-                        next_datetime = next_datetime.replace(year=next_datetime.year + repeat_interval, tzinfo=next_datetime.tzinfo)
-                    elif reminder_data['repeat_type'] == 'monthly_interval':
-                        next_datetime = add_months(next_datetime, repeat_interval)
-                    elif reminder_data['repeat_type'] == 'daily':
-                        next_datetime += timedelta(days=1)
-                    elif reminder_data['repeat_type'] == 'weekly':
-                        # Untuk weekly, repeat_interval menyimpan weekday number (0=Senin, 6=Minggu)
-                        current_day_of_week = next_datetime.weekday()
-                        target_day_of_week = repeat_interval
-                        
-                        days_to_advance = (target_day_of_week - current_day_of_week + 7) % 7
-                        if days_to_advance == 0:
-                            if next_datetime.time() <= now_local.time():
-                                days_to_advance = 7
-                            else:
-                                days_to_advance = 0
-                        
-                        next_datetime += timedelta(days=days_to_advance)
-
-                    elif reminder_data['repeat_type'] == 'weekly_custom':
-                        # Ini adalah yang paling kompleks, memerlukan array hari di metadata
-                        metadata_obj = json.loads(reminder_data['metadata'])
-                        repeat_days_str = metadata_obj.get("repeat_days")
-                        if repeat_days_str:
-                            day_map_str_to_int = {"mon":0, "tue":1, "wed":2, "thu":3, "fri":4, "sat":5, "sun":6}
-                            target_weekdays = sorted([day_map_str_to_int[d.lower()] for d in repeat_days_str.split(',') if d.lower() in day_map_str_to_int])
-                            
-                            if target_weekdays:
-                                current_weekday = next_datetime.weekday()
-                                found_next_day = False
-                                
-                                # Cari hari berikutnya dalam minggu yang sama atau minggu depan
-                                for target_day in target_weekdays:
-                                    # Jika target_day lebih besar dari hari ini, atau jika target_day sama dengan hari ini TAPI waktu belum lewat
-                                    if target_day > current_weekday or \
-                                       (target_day == current_weekday and next_datetime.time() >= now_local.time()):
-                                        days_to_advance = target_day - current_weekday
-                                        next_datetime += timedelta(days=days_to_advance)
-                                        found_next_day = True
-                                        break
-                                
-                                if not found_next_day: # Maju ke minggu depan, ambil hari pertama dari daftar
-                                    days_to_advance = (target_weekdays[0] - current_weekday + 7) % 7
-                                    next_datetime += timedelta(days=days_to_advance)
-                                
-                            else: # Fallback jika repeat_days tidak valid
-                                next_datetime += timedelta(days=7) 
-                        else:
-                            next_datetime += timedelta(days=7) 
-                            
-                    # Maju cepat jika pengingat terlewat banyak kali (penting untuk server yang down lama)
-                    while next_datetime <= now_local:
-                        if reminder_data['repeat_type'] == 'yearly':
-                            next_datetime = next_datetime.replace(year=next_datetime.year + repeat_interval, tzinfo=next_datetime.tzinfo)
-                        elif reminder_data['repeat_type'] == 'monthly_interval':
-                            next_datetime = add_months(next_datetime, repeat_interval)
-                        elif reminder_data['repeat_type'] == 'daily':
-                            next_datetime += timedelta(days=1)
-                        elif reminder_data['repeat_type'] == 'weekly':
-                            next_datetime += timedelta(days=7)
-                        elif reminder_data['repeat_type'] == 'weekly_custom':
-                            # Untuk advance-multiple-skip logic, ini akan kompleks.
-                            # Cukup maju 1 minggu per iterasi untuk ini.
-                            next_datetime += timedelta(weeks=1) 
-                            
-                    update_db('UPDATE reminders SET datetime = ?, notified = 0 WHERE id = ?', 
-                              (next_datetime.isoformat(), reminder_data['id']))
-        get_db().commit()
-    
-scheduler = BackgroundScheduler()
-scheduler.add_job(check_reminders_job, IntervalTrigger(seconds=30), id='check_reminders', replace_existing=True)
+                    advanced_rows.append((next_datetime.isoformat(), datetime_to_epoch(next_datetime), reminder_data['id'],
+                                          reminder_data['due_at']))
+
+        # Pengingat yang diubah user (snooze/jadwal ulang) sejak due_before dilewati; bila masih jatuh tempo,
+        # putaran loop berikutnya membacanya lagi dengan due_at barunya
+        advanced_ids = shard_store.advance_many(notified_rows, advanced_rows, outbox_rows, due_events)
+        advanced = [reminder_data for reminder_data in reminders if reminder_data['id'] in advanced_ids]
+        dispatcher.wake()
+        invalidate_user_caches(reminder_data['user_id'] for reminder_data in advanced)
+        processed += len(advanced)
+        processed_at = time.time()
+        for reminder_data in advanced:
+            SCHEDULER_LAG_SECONDS.observe(max(0.0, processed_at - reminder_data['due_at']))
+        event_broker.notify_changed()
+
+        if len(reminders) < SCHEDULER_BATCH_SIZE:
+            break
+    return processed
 
-if __name__ != '__main__':
-    scheduler.start()
-    print("Scheduler started in background for production.")
+def schedule_next_check(due_at=None):
+    """
+    Jadwalkan check_reminders_job tepat pada tenggat terdekat di due_queue
+    (paling lama MAX_SCHEDULER_SLEEP_SECONDS dari sekarang).
+    """
+    now_epoch = time.time()
+    if due_at is None:
+        due_at = due_queue.next_due_at()
+    wake_at = now_epoch + MAX_SCHEDULER_SLEEP_SECONDS
+    if due_at is not None:
+        wake_at = max(now_epoch, min(wake_at, due_at))
+    from apscheduler.triggers.date import DateTrigger
+    get_scheduler().add_job(check_reminders_job, DateTrigger(run_date=datetime.fromtimestamp(wake_at, pytz.utc)),
+                            id=CHECK_REMINDERS_JOB_ID, replace_existing=True, misfire_grace_time=None)
+
+def wake_scheduler_if_earlier(due_at):
+    if scheduler is None or not scheduler.running:
+        # SCHEDULER_MODE=off: proses scheduler terpisah mengambilnya paling lama MAX_SCHEDULER_SLEEP_SECONDS kemudian
+        return
+    job = scheduler.get_job(CHECK_REMINDERS_JOB_ID)
+    if job is None or job.next_run_time is None or job.next_run_time.timestamp() > due_at:
+        schedule_next_check(due_at)
+
+def compaction_job():
+    """Arsipkan pengingat sekali jalan yang sudah lama lewat (lihat compaction.py). Hanya di leader."""
+    if not leader_lease.is_leader:
+        return
+    def on_batch(user_ids):
+        invalidate_user_caches(user_ids)
+        event_broker.notify_changed()
+    reports = compact(store, on_batch=on_batch)
+    if any(report['archived'] or report['tombstones_pruned'] or report['reclaimed_bytes'] for report in reports):
+        print(format_report(reports))
+
+def renew_leadership_job():
+    was_leader = leader_lease.is_leader
+    if leader_lease.try_acquire() and not was_leader:
+        print(f"Scheduler menjadi leader ({leader_lease.holder}).")
+        # Baru menjadi leader: langsung proses yang sudah jatuh tempo
+        schedule_next_check(time.time())
+    elif was_leader and not leader_lease.is_leader:
+        print(f"Scheduler kehilangan lease leader ({leader_lease.holder}).")
+
+leader_lease = LeaderLease(DATABASE)
+dispatcher = NotificationDispatcher(DATABASE, senders_from_env(), outboxes=store.outboxes())
+event_broker = EventBroker(store)
+
+# Dibuat saat pertama dibutuhkan (get_scheduler): worker dengan SCHEDULER_MODE=off tidak pernah mengimport APScheduler
+scheduler = None
+_scheduler_lock = threading.Lock()
+
+def get_scheduler():
+    """BackgroundScheduler proses ini beserta job tetapnya (belum dimulai; lihat start_scheduler)."""
+    global scheduler
+    with _scheduler_lock:
+        if scheduler is None:
+            from apscheduler.schedulers.background import BackgroundScheduler
+            from apscheduler.triggers.interval import IntervalTrigger
+            new_scheduler = BackgroundScheduler()
+            # Putaran pertama langsung saat start; setelah itu check_reminders_job menjadwalkan dirinya sendiri
+            new_scheduler.add_job(check_reminders_job, id=CHECK_REMINDERS_JOB_ID, replace_existing=True, misfire_grace_time=None)
+            new_scheduler.add_job(renew_leadership_job, IntervalTrigger(seconds=LEASE_RENEW_SECONDS), id='renew_leadership',
+                                  replace_existing=True, next_run_time=datetime.now(pytz.utc))
+            # Pemadatan di thread executor scheduler sendiri; batch kecil sehingga putaran pengingat tidak tertahan
+            new_scheduler.add_job(compaction_job, IntervalTrigger(seconds=COMPACTION_INTERVAL_SECONDS), id='compaction',
+                                  replace_existing=True, max_instances=1, coalesce=True)
+            scheduler = new_scheduler
+        return scheduler
+
+def start_scheduler():
+    """Mulai scheduler di background (idempoten). Lease dilepas saat proses keluar agar cepat diambil alih."""
+    background_scheduler = get_scheduler()
+    if background_scheduler.running:
+        return
+    background_scheduler.start()
+    dispatcher.start()
+    atexit.register(leader_lease.release)
+
+# SCHEDULER_MODE=embedded (default): setiap worker web ikut pemilihan leader.
+# SCHEDULER_MODE=off: worker web tidak menjalankan scheduler; jalankan `python -m scheduler_worker` terpisah.
+# Worker gunicorn gevent sebaiknya selalu off (lihat _process_due_reminders dan Dockerfile).
+SCHEDULER_MODE = os.environ.get('SCHEDULER_MODE', 'embedded')
+
+# --- App Factory ---
+# Import app.py tanpa efek samping (tanpa migrasi, thread, maupun APScheduler), sehingga worker cepat
+# di-boot dan modul aman diimport oleh benchmark/skrip. Setup dilakukan sekali per proses oleh create_app.
+_app_ready = False
+_app_ready_lock = threading.Lock()
+
+def create_app():
+    """
+    Siapkan proses ini lalu kembalikan `app`: periksa versi skema (tanpa migrasi; menolak start bila
+    `python -m database` belum dijalankan) dan, dengan SCHEDULER_MODE=embedded, scheduler + dispatcher.
+    Dipakai gunicorn sebagai `'app:create_app()'`; pemanggilan berikutnya langsung mengembalikan `app`.
+    """
+    global _app_ready
+    if _app_ready:
+        return app
+    with _app_ready_lock:
+        if not _app_ready:
+            check_schema()
+            if SCHEDULER_MODE == 'embedded':
+                start_scheduler()
+                print("Scheduler started in background for production.")
+            _app_ready = True
+    return app
+
+@app.before_request
+def ensure_app_ready():
+    # `gunicorn app:app` (tanpa factory): setup dijalankan oleh request pertama
+    if not _app_ready:
+        create_app()
 
 # --- Main Run Block ---
 if __name__ == '__main__':
-    if not os.path.exists(DATABASE):
-        from database import init_db
-        init_db()
-    
-    scheduler.start()
+    init_db()
+    create_app()
+    start_scheduler()
     print("Scheduler started for local development.")
     
     port = int(os.environ.get('PORT', 5000))
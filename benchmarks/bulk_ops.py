@@ -0,0 +1,124 @@
+"""
+Benchmark operasi massal terhadap N panggilan satu per satu, di satu file SQLite:
+
+- delete: N x store.delete vs satu store.delete_many, dan N x DELETE /delete_reminder/<id> vs satu
+  POST /delete_reminders (lewat test client Flask, tanpa jaringan).
+- snooze: N x store.snooze_many dengan satu id vs satu store.snooze_many untuk N id.
+
+Sebelum setiap pengulangan, N pengingat baru ditambahkan untuk satu user (di luar waktu yang diukur),
+di samping BACKGROUND_USERS x BACKGROUND_ROWS_PER_USER baris milik user lain. Dijalankan tersendiri
+(bukan bagian benchmarks.suite): app harus diimport dengan cwd direktori sementara berisi reminders.db.
+
+    python -m benchmarks.bulk_ops [--quick] [--out hasil.json]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime
+
+os.environ.setdefault('SCHEDULER_MODE', 'off')
+
+import database
+from benchmarks import datagen
+from benchmarks.results import format_metrics, metric, save_results
+
+BATCH_SIZES = [10, 100, 1000]
+QUICK_BATCH_SIZES = [10, 100]
+BACKGROUND_USERS = 20
+BACKGROUND_ROWS_PER_USER = 500
+REPEATS = 3
+BENCH_USER = 'bulk-user'
+
+
+def fresh_ids(store, count, reference):
+    """Tambahkan `count` pengingat baru milik BENCH_USER; mengembalikan id-nya."""
+    return store.add_many(BENCH_USER, datagen.reminder_rows(BENCH_USER, count, random.Random(count), reference))
+
+
+def timed(store, count, reference, fn):
+    """Waktu terbaik dari REPEATS pengulangan fn(ids), masing-masing dengan id baru."""
+    best = float('inf')
+    for _ in range(REPEATS):
+        ids = fresh_ids(store, count, reference)
+        start = time.perf_counter()
+        fn(ids)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def compare(metrics, name, count, individual_seconds, bulk_seconds):
+    metrics[f'bulk.{name}.{count}.individual_ms'] = metric(individual_seconds * 1000, 'ms')
+    metrics[f'bulk.{name}.{count}.bulk_ms'] = metric(bulk_seconds * 1000, 'ms')
+    metrics[f'bulk.{name}.{count}.speedup'] = metric(individual_seconds / bulk_seconds, 'x', 'higher')
+
+
+def bench_count(app, count, reference):
+    store, client = app.store, app.app.test_client()
+    now_local = datetime.now(app.LOCAL_TIMEZONE)
+    metrics = {}
+
+    def delete_individually(ids):
+        for reminder_id in ids:
+            assert store.delete(BENCH_USER, reminder_id) == 1
+
+    def delete_bulk(ids):
+        assert store.delete_many(BENCH_USER, ids) == len(ids)
+    compare(metrics, 'delete_store', count, timed(store, count, reference, delete_individually),
+            timed(store, count, reference, delete_bulk))
+
+    def delete_http_individually(ids):
+        for reminder_id in ids:
+            assert client.delete(f'/delete_reminder/{reminder_id}?user_id={BENCH_USER}').status_code == 200
+
+    def delete_http_bulk(ids):
+        assert client.post('/delete_reminders', json={'user_id': BENCH_USER, 'ids': ids}).json['deleted'] == len(ids)
+    compare(metrics, 'delete_http', count, timed(store, count, reference, delete_http_individually),
+            timed(store, count, reference, delete_http_bulk))
+
+    def snooze_individually(ids):
+        for reminder_id in ids:
+            store.snooze_many(BENCH_USER, [reminder_id], 600, now_local)
+
+    def snooze_bulk(ids):
+        assert store.snooze_many(BENCH_USER, ids, 600, now_local) == len(ids)
+    compare(metrics, 'snooze_store', count, timed(store, count, reference, snooze_individually),
+            timed(store, count, reference, snooze_bulk))
+    # Sisa baris snooze tidak ikut ke ukuran berikutnya
+    store.delete_matching(BENCH_USER)
+    return metrics
+
+
+def run(quick=False):
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        # app.store memakai 'reminders.db' relatif terhadap cwd saat import
+        os.chdir(tmp)
+        try:
+            database.DATABASE = os.path.join(tmp, 'reminders.db')
+            database.init_db(shard_count=1)
+            import app
+            app.create_app()
+            reference = datetime.now(app.LOCAL_TIMEZONE)
+            datagen.populate_store(app.store, datagen.generate(BACKGROUND_USERS, BACKGROUND_ROWS_PER_USER, reference=reference))
+            metrics = {}
+            for count in QUICK_BATCH_SIZES if quick else BATCH_SIZES:
+                metrics.update(bench_count(app, count, reference))
+            return metrics
+        finally:
+            os.chdir(previous_dir)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark operasi massal vs N panggilan satu per satu.')
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--out', help='file JSON hasil (default benchmarks/results/bulk_ops-<waktu>.json)')
+    args = parser.parse_args()
+    metrics = run(args.quick)
+    print(format_metrics(metrics))
+    print(f"Hasil: {save_results('bulk_ops', metrics, args.out)}")
+
+
+if __name__ == '__main__':
+    main()
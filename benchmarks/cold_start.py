@@ -0,0 +1,163 @@
+"""
+Benchmark cold start worker: waktu import app.py, setup create_app() dan request pertama, serta waktu
+dari spawn gunicorn sampai respons 200 pertama. Setiap pengukuran memakai interpreter baru.
+
+- import: `python -X importtime -c "import app"`; dilaporkan median total dan paket dengan waktu
+  import sendiri (self) terbesar dari run terakhir.
+- first_request: di proses baru, import app -> create_app() (pemeriksaan skema) -> GET /get_reminders
+  lewat test client, pada database yang baru dimigrasikan (`python -m database`, tidak diukur).
+- gunicorn: `python -m database` lalu spawn `gunicorn 'app:create_app()'` (seperti CMD Dockerfile) sampai
+  /cache_stats membalas 200, untuk database kosong (termasuk migrasi) dan database yang sudah ada.
+
+SCHEDULER_MODE=off kecuali --scheduler embedded, agar angka tidak bergantung pada putaran scheduler.
+
+    python -m benchmarks.cold_start [--quick] [--scheduler embedded] [--out hasil.json]
+"""
+import argparse
+import http.client
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from benchmarks.load import REPO_DIR, SERVER_START_TIMEOUT_SECONDS, _free_port, stop_server
+from benchmarks.results import format_metrics, metric, save_results
+
+REPEATS = 7
+QUICK_REPEATS = 3
+TOP_PACKAGES = 8
+READY_POLL_SECONDS = 0.01
+
+FIRST_REQUEST_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+app.create_app()
+ready = time.perf_counter()
+response = app.app.test_client().get('/get_reminders?user_id=cold-start')
+assert response.status_code == 200, response.status_code
+done = time.perf_counter()
+print(json.dumps({'import': imported - started, 'create_app': ready - imported, 'first_request': done - ready}))
+"""
+
+
+def _env(scheduler_mode):
+    return dict(os.environ, SCHEDULER_MODE=scheduler_mode, PYTHONPATH=REPO_DIR)
+
+
+def parse_importtime(stderr):
+    """Baris `import time: self | cumulative | modul` -> [(modul, self_us, cumulative_us)]."""
+    rows = []
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'self [us]' in line:
+            continue
+        self_us, cumulative_us, module = line[len('import time:'):].split('|')
+        rows.append((module.strip(), int(self_us), int(cumulative_us)))
+    return rows
+
+
+def bench_import(directory, repeats, scheduler_mode):
+    totals = []
+    rows = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', 'import app'], cwd=directory,
+                                env=_env(scheduler_mode), capture_output=True, text=True, check=True)
+        rows = parse_importtime(result.stderr)
+        totals.append(next(cumulative for module, _, cumulative in rows if module == 'app'))
+    packages = {}
+    for module, self_us, _ in rows:
+        package = module.split('.')[0]
+        packages[package] = packages.get(package, 0) + self_us
+    top = sorted(packages.items(), key=lambda item: item[1], reverse=True)[:TOP_PACKAGES]
+    print("Import sendiri terbesar per paket (run terakhir):")
+    for package, self_us in top:
+        print(f"  {package:<24} {self_us / 1000:>7.1f} ms")
+    return {'cold_start.import_app_ms': metric(statistics.median(totals) / 1000, 'ms')}
+
+
+def bench_first_request(directory, repeats, scheduler_mode):
+    samples = []
+    for index in range(repeats):
+        run_dir = os.path.join(directory, f'first-request-{index}')
+        os.mkdir(run_dir)
+        migrate(run_dir, scheduler_mode)
+        result = subprocess.run([sys.executable, '-c', FIRST_REQUEST_SCRIPT], cwd=run_dir, env=_env(scheduler_mode),
+                                capture_output=True, text=True, check=True)
+        samples.append(json.loads(result.stdout.strip().splitlines()[-1]))
+    return {f'cold_start.{stage}_ms': metric(statistics.median(sample[stage] for sample in samples) * 1000, 'ms')
+            for stage in ('import', 'create_app', 'first_request')}
+
+
+def migrate(directory, scheduler_mode):
+    subprocess.run([sys.executable, '-m', 'database'], cwd=directory, env=_env(scheduler_mode),
+                   stdout=subprocess.DEVNULL, check=True)
+
+
+def gunicorn_boot_seconds(directory, scheduler_mode, worker_class):
+    """Detik dari `python -m database` + spawn gunicorn (satu worker) sampai /cache_stats membalas 200."""
+    port = _free_port()
+    command = [sys.executable, '-m', 'gunicorn', 'app:create_app()', '--pythonpath', REPO_DIR, '--bind', f'127.0.0.1:{port}',
+               '--workers', '1', '--worker-class', worker_class, '--log-level', 'warning']
+    started = time.perf_counter()
+    migrate(directory, scheduler_mode)
+    process = subprocess.Popen(command, cwd=directory, env=_env(scheduler_mode), stdout=subprocess.DEVNULL)
+    try:
+        while time.perf_counter() - started < SERVER_START_TIMEOUT_SECONDS:
+            if process.poll() is not None:
+                raise RuntimeError(f"gunicorn berhenti dengan kode {process.returncode}")
+            try:
+                connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+                connection.request('GET', '/cache_stats')
+                if connection.getresponse().status == 200:
+                    return time.perf_counter() - started
+            except OSError:
+                time.sleep(READY_POLL_SECONDS)
+        raise RuntimeError("gunicorn tidak siap dalam batas waktu")
+    finally:
+        stop_server(process)
+
+
+def bench_gunicorn(directory, repeats, scheduler_mode, worker_class):
+    fresh, existing = [], []
+    for index in range(repeats):
+        run_dir = os.path.join(directory, f'gunicorn-{index}')
+        os.mkdir(run_dir)
+        fresh.append(gunicorn_boot_seconds(run_dir, scheduler_mode, worker_class))
+        existing.append(gunicorn_boot_seconds(run_dir, scheduler_mode, worker_class))
+    return {
+        'cold_start.gunicorn_fresh_db_ms': metric(statistics.median(fresh) * 1000, 'ms'),
+        'cold_start.gunicorn_existing_db_ms': metric(statistics.median(existing) * 1000, 'ms'),
+    }
+
+
+def run(quick=False, scheduler_mode='off', worker_class='gevent'):
+    repeats = QUICK_REPEATS if quick else REPEATS
+    directory = tempfile.mkdtemp(prefix='reminders-cold-start-')
+    try:
+        metrics = bench_import(directory, repeats, scheduler_mode)
+        metrics.update(bench_first_request(directory, repeats, scheduler_mode))
+        metrics.update(bench_gunicorn(directory, repeats, scheduler_mode, worker_class))
+        return metrics
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark waktu import, boot dan request pertama worker.')
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--scheduler', default='off', choices=['off', 'embedded'], help='SCHEDULER_MODE proses yang diukur')
+    parser.add_argument('--worker-class', default='gevent')
+    parser.add_argument('--out', help='file JSON hasil (default benchmarks/results/cold_start-<waktu>.json)')
+    args = parser.parse_args()
+    metrics = run(args.quick, args.scheduler, args.worker_class)
+    print(format_metrics(metrics))
+    print(f"Hasil: {save_results('cold_start', metrics, args.out)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Benchmark pemadatan (compaction.py) pada database yang didominasi pengingat sekali jalan yang sudah
+lewat: ukuran file, waktu daftar /get_reminders (seluruh daftar dan halaman terakhir) dan jumlah
+baris, sebelum dan sesudah. Selama pemadatan, satu thread penulis kecil (insert + delete) berjalan
+dan latensi p99/maksimumnya dicetak untuk menunjukkan batch kecil tidak menahan penulis lain.
+Gagal bila file utama tidak mengecil: arsip tinggal di file tersendiri, jadi halaman yang dibebaskan
+harus kembali ke sistem file lewat incremental vacuum.
+
+Jalankan: python -m benchmarks.compaction
+"""
+import os
+import random
+import tempfile
+import threading
+import time
+
+import compaction
+import database
+from reminder_metadata import split_metadata
+from reminder_store import REMINDER_INSERT_SQL, SQLiteReminderStore
+
+USER_COUNT = 100
+REMINDERS_PER_USER = 2000
+# Porsi pengingat sekali jalan yang sudah dinotifikasi dan lebih tua dari COMPACTION_MIN_AGE_DAYS
+FIRED_FRACTION = 0.9
+REPEATS = 5
+
+
+def build_db(path, now):
+    database.DATABASE = path
+    database.init_db()
+    rng = random.Random(5)
+    conn = database.connect(path)
+    rows = []
+    for user in range(USER_COUNT):
+        for _ in range(REMINDERS_PER_USER):
+            if rng.random() < FIRED_FRACTION:
+                due_at, notified = int(now - rng.randint(31, 720) * 86400), 1
+            else:
+                due_at, notified = int(now + rng.randint(0, 365) * 86400), 0
+            rows.append((f"user-{user}", 'Bench', '2030-01-01T09:00:00+07:00', 'none', 0, notified, due_at)
+                        + split_metadata({'notes': 'catatan ' * 8}))
+    conn.executemany(REMINDER_INSERT_SQL, rows)
+    conn.commit()
+    conn.close()
+
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(store):
+    stats = store.storage_stats()
+    return {
+        'baris reminders': stats['reminders'],
+        'file (MiB)': stats['file_bytes'] / 1048576,
+        'file arsip (MiB)': stats['archive_bytes'] / 1048576,
+        'daftar penuh (ms)': best_of(lambda: list(store.list_by_user('user-1'))) * 1000,
+        'upcoming (ms)': best_of(lambda: list(store.list_by_user('user-1', status='upcoming'))) * 1000,
+        'putaran tick (ms)': best_of(lambda: store.next_due(1000)) * 1000,
+    }
+
+
+def main():
+    now = time.time()
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'compaction.db')
+        build_db(path, now)
+        store = SQLiteReminderStore(path)
+        before = measure(store)
+
+        stop_event = threading.Event()
+        latencies = []
+
+        def writer():
+            conn = database.connect(path)
+            while not stop_event.is_set():
+                start = time.perf_counter()
+                def write():
+                    with conn:
+                        reminder_id = conn.execute(REMINDER_INSERT_SQL, ('writer', 'Kecil', '2030-01-01T09:00:00+07:00', 'none', 0, 0,
+                                                                         int(now)) + split_metadata(None)).lastrowid
+                        conn.execute('DELETE FROM reminders WHERE id = ?', (reminder_id,))
+                database.run_with_lock_retry(write)
+                latencies.append(time.perf_counter() - start)
+                time.sleep(0.002)
+            conn.close()
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        reports = compaction.compact(store)
+        stop_event.set()
+        thread.join()
+        after = measure(store)
+
+    print(f"{USER_COUNT} user x {REMINDERS_PER_USER} pengingat, {FIRED_FRACTION:.0%} sudah lewat")
+    print(compaction.format_report(reports))
+    print(f"{'':>20} {'sebelum':>10} {'sesudah':>10}")
+    for name in before:
+        print(f"{name:>20} {before[name]:>10.2f} {after[name]:>10.2f}")
+    latencies.sort()
+    print(f"Penulis bersamaan: {len(latencies)} tulis, p99 {latencies[int(len(latencies) * 0.99)] * 1000:.1f} ms, "
+          f"maks {latencies[-1] * 1000:.1f} ms")
+    assert reports[0]['reclaimed_bytes'] > 0 and after['file (MiB)'] < before['file (MiB)'], \
+        f"File utama tidak mengecil: {before['file (MiB)']:.1f} -> {after['file (MiB)']:.1f} MiB"
+
+
+if __name__ == '__main__':
+    main()
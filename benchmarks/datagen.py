@@ -0,0 +1,127 @@
+"""
+Generator data sintetis untuk benchmark: user x pengingat dengan campuran repeat_type, metadata dan
+sebaran waktu yang menyerupai data produksi. Deterministik untuk seed yang sama, sehingga dua run
+(mis. sebelum dan sesudah perubahan) memakai data yang persis sama.
+
+    python -m benchmarks.datagen --users 200 --per-user 500 --out /tmp/reminders.db
+
+Sebagai modul: reminder_rows(...) menghasilkan baris urutan REMINDER_RECORD_COLUMNS untuk
+ReminderStore.add_many / REMINDER_INSERT_SQL, note_lines(...) menghasilkan teks catatan untuk parser.
+"""
+import argparse
+import random
+from datetime import datetime, timedelta
+
+import pytz
+
+import database
+from benchmarks.parser_corpus import DAY, EXTRA, REPEAT, SUBJECTS, TZ, WHEN
+from database import datetime_to_epoch
+from reminder_metadata import split_metadata
+from reminder_store import store_from_env
+
+LOCAL_TIMEZONE = pytz.timezone('Asia/Jakarta')
+DEFAULT_SEED = 2024
+# Waktu acuan tetap agar data tidak bergantung pada hari benchmark dijalankan
+REFERENCE_TIME = LOCAL_TIMEZONE.localize(datetime(2030, 1, 15, 8, 0))
+
+# (repeat_type, bobot, interval) -- sebagian besar pengingat sekali jalan
+REPEAT_MIX = [
+    ('none', 70, lambda rng: 0),
+    ('daily', 10, lambda rng: 1),
+    ('weekly', 8, lambda rng: rng.randint(0, 6)),
+    ('weekly_custom', 4, lambda rng: 0),
+    ('monthly_interval', 5, lambda rng: rng.choice([1, 1, 2, 3, 6])),
+    ('yearly', 3, lambda rng: 1),
+]
+ACTIVITY_TYPES = ['gym', 'online course', 'reading', 'groceries', 'in-office day', 'standup', 'rapat', 'class', 'meeting']
+MOODS = ['semangat', 'lelah', 'senang', 'tenang']
+EVENTS = ['Rapat', 'Gym', 'Bayar', 'Telepon', 'Minum', 'Belajar', 'Standup', 'Belanja', 'Pengingat']
+# Rentang waktu relatif terhadap REFERENCE_TIME: sebagian sudah lewat (riwayat), sisanya ke depan
+PAST_DAYS = 60
+FUTURE_DAYS = 365
+
+
+def _pick_repeat(rng):
+    weights = [weight for _, weight, _ in REPEAT_MIX]
+    repeat_type, _, interval = rng.choices(REPEAT_MIX, weights)[0]
+    return repeat_type, interval(rng)
+
+
+def reminder_metadata(rng):
+    metadata = {}
+    if rng.random() < 0.4:
+        metadata['activity_type'] = rng.choice(ACTIVITY_TYPES)
+    if rng.random() < 0.2:
+        metadata['mood'] = rng.choice(MOODS)
+    if rng.random() < 0.3:
+        metadata['notes'] = ' '.join(rng.choice(['bawa', 'laptop', 'slide', 'dokumen', 'kunci', 'obat']) for _ in range(rng.randint(1, 6)))
+    return metadata
+
+
+def user_ids(user_count):
+    return [f"user-{index}" for index in range(user_count)]
+
+
+def reminder_rows(user_id, count, rng, reference=REFERENCE_TIME):
+    """`count` baris untuk satu user, urutan REMINDER_RECORD_COLUMNS."""
+    rows = []
+    for _ in range(count):
+        repeat_type, interval = _pick_repeat(rng)
+        metadata = reminder_metadata(rng)
+        if repeat_type == 'weekly_custom':
+            metadata['repeat_days'] = 'Mon,Wed,Fri'
+        scheduled = reference + timedelta(minutes=rng.randint(-PAST_DAYS * 1440, FUTURE_DAYS * 1440))
+        scheduled = LOCAL_TIMEZONE.normalize(scheduled).replace(second=0)
+        # Sekali jalan yang sudah lewat sudah dinotifikasi; seri berulang selalu punya kemunculan berikutnya
+        notified = 1 if repeat_type == 'none' and scheduled < reference else 0
+        if repeat_type != 'none' and scheduled < reference:
+            scheduled += timedelta(days=PAST_DAYS + 1)
+        event = metadata['activity_type'].capitalize() if 'activity_type' in metadata else rng.choice(EVENTS)
+        rows.append((user_id, event, scheduled.isoformat(), repeat_type, interval, notified,
+                     datetime_to_epoch(scheduled)) + split_metadata(metadata))
+    return rows
+
+
+def generate(user_count, per_user, seed=DEFAULT_SEED, reference=REFERENCE_TIME):
+    """{user_id: [baris, ...]} untuk semua user."""
+    rng = random.Random(seed)
+    return {user_id: reminder_rows(user_id, per_user, rng, reference) for user_id in user_ids(user_count)}
+
+
+def note_lines(count, seed=DEFAULT_SEED):
+    """Baris catatan bebas seperti yang diketik pengguna di /add_multiple_reminders."""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(count):
+        parts = [rng.choice(SUBJECTS), rng.choice(WHEN), rng.choice(DAY), rng.choice(REPEAT), rng.choice(TZ), rng.choice(EXTRA)]
+        line = ' '.join(part for part in parts if part)
+        lines.append(line or 'pengingat')
+    return lines
+
+
+def populate_store(store, data):
+    for user_id, rows in data.items():
+        store.add_many(user_id, rows)
+
+
+def populate_db(path, user_count, per_user, seed=DEFAULT_SEED):
+    """Buat (atau tambahkan ke) database di `path` (semua shard bila DB_SHARDS > 1), satu transaksi per user."""
+    database.DATABASE = path
+    database.init_db()
+    populate_store(store_from_env(path), generate(user_count, per_user, seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Isi database dengan pengingat sintetis untuk benchmark.')
+    parser.add_argument('--users', type=int, default=100)
+    parser.add_argument('--per-user', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=DEFAULT_SEED)
+    parser.add_argument('--out', default='reminders.db')
+    args = parser.parse_args()
+    populate_db(args.out, args.users, args.per_user, args.seed)
+    print(f"{args.users * args.per_user} pengingat untuk {args.users} user ditulis ke {args.out}")
+
+
+if __name__ == '__main__':
+    main()
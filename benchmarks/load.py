@@ -0,0 +1,199 @@
+"""
+Load driver HTTP lokal untuk /get_reminders, /get_reminders_for_month dan /add_multiple_reminders.
+
+Tanpa --url: membuat database sintetis (benchmarks.datagen) di direktori sementara, menjalankan
+gunicorn seperti di Dockerfile (SCHEDULER_MODE=off agar putaran scheduler tidak mengganggu angka),
+lalu mematikannya setelah selesai. Dengan --url: menembak server yang sudah berjalan, yang datanya
+harus dibuat dengan `python -m benchmarks.datagen` (seed dan jumlah user yang sama).
+
+Setiap skenario dijalankan --duration detik oleh --concurrency thread klien (koneksi keep-alive per
+thread, setelah --warmup detik pemanasan). Dilaporkan: throughput, p50/p90/p99/maks latensi, error.
+Klien dan server berbagi CPU yang sama; bandingkan hanya run dari mesin dan konfigurasi yang sama.
+Env diteruskan ke server: RESPONSE_CACHE=0 mengukur jalur baca tanpa cache respons.
+
+    python -m benchmarks.load [--quick] [--workers 2] [--worker-class gevent] [--out hasil.json]
+    python -m benchmarks.load --url http://127.0.0.1:5000 --users 100
+"""
+import argparse
+import http.client
+import json
+import os
+import random
+import shutil
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from datetime import timedelta
+from urllib.parse import urlsplit
+
+from benchmarks import datagen
+from benchmarks.results import format_metrics, metric, percentile, save_results
+
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_USERS = 100
+DEFAULT_PER_USER = 500
+NOTE_LINES_PER_REQUEST = 5
+SERVER_START_TIMEOUT_SECONDS = 30
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(directory, workers, worker_class):
+    """Jalankan gunicorn dengan cwd `directory` (berisi reminders.db). Mengembalikan (proses, base_url)."""
+    port = _free_port()
+    env = dict(os.environ, SCHEDULER_MODE='off')
+    command = [sys.executable, '-m', 'gunicorn', 'app:create_app()', '--pythonpath', REPO_DIR, '--bind', f'127.0.0.1:{port}',
+               '--workers', str(workers), '--worker-class', worker_class, '--log-level', 'warning']
+    process = subprocess.Popen(command, cwd=directory, env=env)
+    base_url = f'http://127.0.0.1:{port}'
+    deadline = time.monotonic() + SERVER_START_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"gunicorn berhenti dengan kode {process.returncode}")
+        try:
+            connection = http.client.HTTPConnection('127.0.0.1', port, timeout=1)
+            connection.request('GET', '/cache_stats')
+            if connection.getresponse().status == 200:
+                return process, base_url
+        except OSError:
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("gunicorn tidak siap dalam batas waktu")
+
+
+def stop_server(process):
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+
+# --- Skenario: fungsi (rng, users, notes) -> (method, path, body) ---
+def get_reminders_request(rng, users, notes):
+    return 'GET', f"/get_reminders?user_id={rng.choice(users)}", None
+
+
+def month_request(rng, users, notes):
+    month_dt = datagen.REFERENCE_TIME.replace(day=1) + timedelta(days=rng.randint(0, 330))
+    return 'GET', f"/get_reminders_for_month?user_id={rng.choice(users)}&year={month_dt.year}&month={month_dt.month}", None
+
+
+def add_request(rng, users, notes):
+    body = {'user_id': rng.choice(users), 'full_note_text': '\n'.join(rng.sample(notes, NOTE_LINES_PER_REQUEST))}
+    return 'POST', '/add_multiple_reminders', json.dumps(body)
+
+
+SCENARIOS = [
+    ('get_reminders', get_reminders_request),
+    ('get_reminders_for_month', month_request),
+    ('add_multiple_reminders', add_request),
+]
+
+
+def drive(base_url, make_request, users, concurrency, duration, warmup):
+    """Jalankan satu skenario; mengembalikan (latensi terurut dalam detik, jumlah error, durasi ukur)."""
+    parts = urlsplit(base_url)
+    notes = [line for line in datagen.note_lines(500) if 'jam' in line or 'pukul' in line]
+    latencies = []
+    errors = [0]
+    lock = threading.Lock()
+    start_at = time.perf_counter() + warmup
+    stop_at = start_at + duration
+
+    def worker(worker_index):
+        rng = random.Random(worker_index)
+        connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+        own_latencies, own_errors = [], 0
+        while True:
+            method, path, body = make_request(rng, users, notes)
+            started = time.perf_counter()
+            if started >= stop_at:
+                break
+            try:
+                connection.request(method, path, body=body, headers={'Content-Type': 'application/json'} if body else {})
+                response = connection.getresponse()
+                response.read()
+                failed = response.status >= 400
+            except (OSError, http.client.HTTPException):
+                connection.close()
+                connection = http.client.HTTPConnection(parts.hostname, parts.port, timeout=30)
+                failed = True
+            if started >= start_at:
+                own_latencies.append(time.perf_counter() - started)
+                own_errors += failed
+        connection.close()
+        with lock:
+            latencies.extend(own_latencies)
+            errors[0] += own_errors
+
+    threads = [threading.Thread(target=worker, args=(index,)) for index in range(concurrency)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    latencies.sort()
+    return latencies, errors[0], duration
+
+
+def run_scenarios(base_url, users, concurrency, duration, warmup):
+    metrics = {}
+    for name, make_request in SCENARIOS:
+        latencies, errors, seconds = drive(base_url, make_request, users, concurrency, duration, warmup)
+        metrics[f'load.{name}.rps'] = metric(len(latencies) / seconds, 'req/s', 'higher')
+        for q in (50, 90, 99):
+            metrics[f'load.{name}.p{q}_ms'] = metric(percentile(latencies, q) * 1000, 'ms')
+        metrics[f'load.{name}.max_ms'] = metric((latencies[-1] if latencies else 0) * 1000, 'ms')
+        metrics[f'load.{name}.errors'] = metric(errors, 'req')
+    return metrics
+
+
+def run(quick=False, url=None, users=DEFAULT_USERS, per_user=DEFAULT_PER_USER, concurrency=8, duration=None,
+        warmup=1.0, workers=2, worker_class='gevent'):
+    duration = duration or (3.0 if quick else 15.0)
+    if quick:
+        users, per_user = min(users, 20), min(per_user, 200)
+    user_list = datagen.user_ids(users)
+    if url:
+        return run_scenarios(url, user_list, concurrency, duration, warmup)
+
+    directory = tempfile.mkdtemp(prefix='reminders-load-')
+    try:
+        datagen.populate_db(os.path.join(directory, 'reminders.db'), users, per_user)
+        process, base_url = start_server(directory, workers, worker_class)
+        try:
+            return run_scenarios(base_url, user_list, concurrency, duration, warmup)
+        finally:
+            stop_server(process)
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load test HTTP lokal dengan laporan p50/p99 dan throughput.')
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--url', help='server yang sudah berjalan (default: jalankan gunicorn sendiri)')
+    parser.add_argument('--users', type=int, default=DEFAULT_USERS)
+    parser.add_argument('--per-user', type=int, default=DEFAULT_PER_USER)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--duration', type=float, help='detik per skenario (default 15, --quick 3)')
+    parser.add_argument('--warmup', type=float, default=1.0)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--worker-class', default='gevent')
+    parser.add_argument('--out', help='file JSON hasil (default benchmarks/results/load-<waktu>.json)')
+    args = parser.parse_args()
+    metrics = run(args.quick, args.url, args.users, args.per_user, args.concurrency, args.duration, args.warmup,
+                  args.workers, args.worker_class)
+    print(format_metrics(metrics))
+    print(f"Hasil: {save_results('load', metrics, args.out)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark biaya decode metadata per baris: JSON di kolom metadata (skema versi 8) vs kolom bertipe
++ extras (versi 9, reminder_metadata.py), pada database yang sama sebelum dan sesudah migrasi.
+
+Diukur: baca semua baris dengan metadata, baca tanpa metadata (proyeksi fields=), dan filter
+activity_type (sebelum: decode semua baris di Python; sesudah: indeks). Waktu migrasi ikut dicetak.
+
+Jalankan: python -m benchmarks.metadata_decode
+"""
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+
+import database
+from reminder_metadata import METADATA_SELECT_COLUMNS, row_metadata
+
+ROW_COUNT = 50000
+USER_COUNT = 20
+REPEATS = 3
+ACTIVITIES = ['gym', 'online course', 'reading', 'groceries', 'rapat', 'class', 'meeting']
+
+
+def random_metadata(rng):
+    metadata = {}
+    if rng.random() < 0.1:
+        metadata['repeat_days'] = 'Mon,Wed,Fri'
+    if rng.random() < 0.2:
+        metadata['notes'] = 'bawa laptop dan charger'
+    if rng.random() < 0.2:
+        metadata['mood'] = rng.choice(['semangat', 'lelah', 'fokus'])
+    if rng.random() < 0.5:
+        metadata['activity_type'] = rng.choice(ACTIVITIES)
+    if rng.random() < 0.1:
+        metadata['coffee_preference'] = 'hitam tanpa gula'
+    return metadata
+
+
+def build_v8_database(path):
+    conn = database.connect(path)
+    for version, migration in database.MIGRATIONS:
+        if version > 8:
+            break
+        migration(conn)
+        conn.execute(f'PRAGMA user_version = {version}')
+        conn.commit()
+    rng = random.Random(7)
+    rows = []
+    for i in range(ROW_COUNT):
+        due_at = 1893456000 + i * 60
+        rows.append((f"user-{i % USER_COUNT}", "Bench", json.dumps(random_metadata(rng)), '2030-01-01T09:00:00+07:00',
+                     'none', 0, 0, due_at))
+    conn.executemany('INSERT INTO reminders (user_id, event, metadata, datetime, repeat_type, repeat_interval, notified, due_at) '
+                     'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.commit()
+    return conn
+
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'metadata.db')
+        conn = build_v8_database(path)
+        conn.row_factory = sqlite3.Row
+
+        def read_json_metadata():
+            for r in conn.execute('SELECT id, event, metadata FROM reminders WHERE user_id = ?', ('user-1',)):
+                json.loads(r['metadata']) if r['metadata'] else {}
+
+        def filter_json_activity():
+            return [r['id'] for r in conn.execute('SELECT id, metadata FROM reminders WHERE user_id = ?', ('user-1',))
+                    if r['metadata'] and json.loads(r['metadata']).get('activity_type') == 'gym']
+
+        before = {
+            'baca + metadata': best_of(read_json_metadata),
+            'filter activity_type': best_of(filter_json_activity),
+        }
+        expected_ids = filter_json_activity()
+
+        start = time.perf_counter()
+        database.migrate(conn)
+        migrate_seconds = time.perf_counter() - start
+
+        def read_typed_metadata():
+            for r in conn.execute(f'SELECT id, event, {METADATA_SELECT_COLUMNS} FROM reminders WHERE user_id = ?', ('user-1',)):
+                row_metadata(r)
+
+        def read_without_metadata():
+            for r in conn.execute('SELECT id, event FROM reminders WHERE user_id = ?', ('user-1',)):
+                r['event']
+
+        def filter_indexed_activity():
+            return [r['id'] for r in conn.execute('SELECT id FROM reminders WHERE user_id = ? AND activity_type = ? ORDER BY id',
+                                                  ('user-1', 'gym'))]
+
+        after = {
+            'baca + metadata': best_of(read_typed_metadata),
+            'filter activity_type': best_of(filter_indexed_activity),
+        }
+        assert filter_indexed_activity() == sorted(expected_ids)
+        rows_per_user = ROW_COUNT // USER_COUNT
+
+        print(f"{ROW_COUNT} baris, {rows_per_user} per user; migrasi ke versi 9: {migrate_seconds:.2f}s")
+        print(f"{'operasi':>22} {'JSON (ms)':>10} {'kolom (ms)':>11} {'us/baris sesudah':>17}")
+        for name in before:
+            print(f"{name:>22} {before[name] * 1000:>10.2f} {after[name] * 1000:>11.2f} {after[name] * 1e6 / rows_per_user:>17.2f}")
+        print(f"{'baca tanpa metadata':>22} {'-':>10} {best_of(read_without_metadata) * 1000:>11.2f}")
+        conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,97 @@
+"""
+Microbenchmark jalur panas: parsing (ScheduleParser.parse tanpa cache dan catatan multi-baris), serialisasi
+/get_reminders (serialize_reminders + JSON) dan pemajuan pengingat berulang (next_occurrence),
+semuanya di atas data dari benchmarks.datagen.
+
+    python -m benchmarks.micro [--quick] [--out hasil.json]
+"""
+import argparse
+import json
+import os
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('SCHEDULER_MODE', 'off')
+
+import app
+from benchmarks import datagen
+from benchmarks.results import format_metrics, metric, save_results
+from memory_store import MemoryReminderStore
+from recurrence import next_occurrence
+from reminder_store import REMINDER_RECORD_COLUMNS
+from schedule_parser import ScheduleParser
+
+REPEATS = 5
+CATCHUP_GAPS_DAYS = [1, 30, 365]
+
+
+def best_of(fn, repeats=REPEATS):
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def bench_parse(line_count):
+    lines = datagen.note_lines(line_count)
+    now = datagen.REFERENCE_TIME
+    # Tanpa cache parse: mengukur pipeline regex penuh (benchmarks.parse_cache mengukur cache-nya)
+    parser = ScheduleParser(cache_size=0, stage_sample_every=0)
+    seconds = best_of(lambda: [parser.parse(line, now) for line in lines])
+    note = '\n'.join(lines[:50])
+    note_seconds = best_of(lambda: app.extract_multiple_schedules(note, parallel=False))
+    return {
+        'parse.fragment_us': metric(seconds / line_count * 1e6, 'us'),
+        'parse.lines_per_second': metric(line_count / seconds, 'baris/s', 'higher'),
+        'parse.note_50_lines_ms': metric(note_seconds * 1000, 'ms'),
+    }
+
+
+def bench_serialization(user_count, per_user):
+    store = MemoryReminderStore()
+    datagen.populate_store(store, datagen.generate(user_count, per_user))
+    rows = [row for user_id in datagen.user_ids(user_count) for row in store.list_by_user(user_id)]
+    seconds = best_of(lambda: app.serialize_reminders(rows))
+    json_seconds = best_of(lambda: json.dumps(app.serialize_reminders(rows)))
+    return {
+        'serialize.row_us': metric(seconds / len(rows) * 1e6, 'us'),
+        'serialize.row_json_us': metric(json_seconds / len(rows) * 1e6, 'us'),
+    }
+
+
+def bench_recurrence(user_count, per_user):
+    rows = [dict(zip(REMINDER_RECORD_COLUMNS, row)) for rows in datagen.generate(user_count, per_user).values()
+            for row in rows if row[REMINDER_RECORD_COLUMNS.index('repeat_type')] != 'none']
+    series = [(datetime.fromisoformat(row['datetime']), row['repeat_type'], row['repeat_interval'], row['repeat_days'])
+              for row in rows]
+    results = {}
+    for gap_days in CATCHUP_GAPS_DAYS:
+        gap = timedelta(days=gap_days)
+        seconds = best_of(lambda: [next_occurrence(current_dt, repeat_type, repeat_interval, current_dt + gap, repeat_days=repeat_days)
+                                   for current_dt, repeat_type, repeat_interval, repeat_days in series])
+        results[f'recurrence.catchup_{gap_days}d_us'] = metric(seconds / len(series) * 1e6, 'us')
+    return results
+
+
+def run(quick=False):
+    metrics = {}
+    metrics.update(bench_parse(500 if quick else 5000))
+    metrics.update(bench_serialization(5 if quick else 20, 500 if quick else 1000))
+    metrics.update(bench_recurrence(5 if quick else 20, 500 if quick else 1000))
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Microbenchmark parser, serialisasi dan pengulangan.')
+    parser.add_argument('--quick', action='store_true', help='data lebih kecil, untuk pemeriksaan cepat')
+    parser.add_argument('--out', help='file JSON hasil (default benchmarks/results/micro-<waktu>.json)')
+    args = parser.parse_args()
+    metrics = run(args.quick)
+    print(format_metrics(metrics))
+    print(f"Hasil: {save_results('micro', metrics, args.out)}")
+
+
+if __name__ == '__main__':
+    main()
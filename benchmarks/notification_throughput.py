@@ -0,0 +1,95 @@
+"""
+Benchmark throughput pipeline notifikasi (outbox -> dispatcher -> webhook).
+
+Menjalankan penerima HTTP lokal sebagai pengganti layanan webhook sungguhan, mengisi outbox
+dengan N notifikasi, lalu mengukur notifikasi/detik untuk beberapa tingkat konkurensi.
+Sebagian permintaan sengaja digagalkan untuk melatih jalur retry.
+
+Jalankan: python -m benchmarks.notification_throughput
+"""
+import json
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import database
+import notifications
+
+NOTIFICATION_COUNT = 2000
+CONCURRENCY_LEVELS = [1, 8, 32]
+RECEIVER_LATENCY_SECONDS = 0.005
+FAILURE_EVERY = 50
+
+
+class Receiver(BaseHTTPRequestHandler):
+    received = 0
+    lock = threading.Lock()
+
+    def do_POST(self):
+        json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        time.sleep(RECEIVER_LATENCY_SECONDS)
+        with Receiver.lock:
+            Receiver.received += 1
+            fail = Receiver.received % FAILURE_EVERY == 0
+        self.send_response(503 if fail else 204)
+        self.end_headers()
+
+    def log_message(self, format, *args):
+        pass
+
+
+class ReceiverServer(ThreadingHTTPServer):
+    # Backlog default (5) membuat koneksi paralel tertunda oleh retransmisi SYN
+    request_queue_size = 128
+    daemon_threads = True
+
+
+def fill_outbox(path, dispatcher, count):
+    conn = sqlite3.connect(path)
+    rows = []
+    for i in range(count):
+        rows.extend(dispatcher.outbox_rows(i, f"user-{i % 100}", "Bench", "2026-01-01T09:00:00+07:00", 0))
+    conn.executemany(notifications.OUTBOX_INSERT_SQL, rows)
+    conn.commit()
+    conn.close()
+
+
+def pending_count(path):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute("SELECT COUNT(*) FROM notification_outbox WHERE status = 'pending'").fetchone()[0]
+    finally:
+        conn.close()
+
+
+def main():
+    server = ReceiverServer(('127.0.0.1', 0), Receiver)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/notify"
+    # Retry langsung agar benchmark mengukur throughput, bukan waktu tunggu backoff
+    notifications.NOTIFY_BACKOFF_SECONDS = 0
+
+    print(f"{'concurrency':>12} {'notifications':>14} {'seconds':>8} {'notif/s':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for concurrency in CONCURRENCY_LEVELS:
+            path = os.path.join(tmp, f"notify_{concurrency}.db")
+            database.DATABASE = path
+            database.init_db()
+            dispatcher = notifications.NotificationDispatcher(path, {'webhook': notifications.WebhookSender(url)},
+                                                              concurrency=concurrency, rate_per_second=100000)
+            fill_outbox(path, dispatcher, NOTIFICATION_COUNT)
+            start = time.perf_counter()
+            dispatcher.start()
+            while pending_count(path):
+                time.sleep(0.02)
+            elapsed = time.perf_counter() - start
+            dispatcher.stop()
+            print(f"{concurrency:>12} {NOTIFICATION_COUNT:>14} {elapsed:>8.2f} {NOTIFICATION_COUNT / elapsed:>9,.0f}")
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
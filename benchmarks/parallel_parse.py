@@ -0,0 +1,42 @@
+"""
+Benchmark parsing inline vs process pool untuk catatan besar.
+
+Jalankan: python -m benchmarks.parallel_parse
+"""
+import time
+from datetime import datetime
+
+import schedule_parser
+from benchmarks.parser_corpus import build_corpus
+
+LINE_COUNTS = [1000, 10000, 100000]
+
+
+def make_lines(count):
+    corpus = [line for line in build_corpus() if line.strip()]
+    return [corpus[i % len(corpus)] for i in range(count)]
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def main():
+    now_local = datetime.now(schedule_parser.LOCAL_TIMEZONE)
+    # Pemanasan: proses pool dibuat (spawn) sekali dan dipakai bersama, seperti di server
+    schedule_parser.parse_lines(make_lines(schedule_parser.PARSE_POOL_THRESHOLD), now_local, parallel=True)
+
+    print(f"workers={schedule_parser.PARSE_POOL_WORKERS} chunk={schedule_parser.PARSE_POOL_CHUNK_SIZE}")
+    print(f"{'lines':>8} {'inline (lines/s)':>17} {'pool (lines/s)':>15} {'speedup':>8}")
+    for count in LINE_COUNTS:
+        lines = make_lines(count)
+        inline, inline_time = timed(lambda: schedule_parser.parse_lines(lines, now_local))
+        pooled, pool_time = timed(lambda: schedule_parser.parse_lines(lines, now_local, parallel=True))
+        assert inline == pooled, "Hasil pool harus identik dan berurutan sama dengan inline"
+        print(f"{count:>8} {count / inline_time:>17,.0f} {count / pool_time:>15,.0f} {inline_time / pool_time:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
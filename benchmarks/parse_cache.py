@@ -0,0 +1,82 @@
+"""
+Benchmark cache hasil parse (schedule_parser.ParseCache) dengan korpus template berulang yang
+menyerupai catatan pengguna: sebagian besar baris adalah template populer yang ditempel berulang kali
+(distribusi Zipf), sisanya baris unik (catatan/angka berbeda).
+
+Diukur per ukuran cache: baris/detik, hit rate dan jumlah entri, dibandingkan dengan tanpa cache.
+Hasil dengan cache diverifikasi identik dengan tanpa cache. `now` bergeser beberapa detik per baris
+(mensimulasikan request sepanjang hari), sehingga bentuk relatif ikut teruji.
+
+    python -m benchmarks.parse_cache [--out hasil.json]
+"""
+import argparse
+import random
+import time
+from datetime import timedelta
+
+from benchmarks import datagen
+from benchmarks.results import metric, save_results
+from schedule_parser import ScheduleParser
+
+TEMPLATES = [
+    "gym setiap hari jam 6 pagi", "standup senin jam 9", "minum obat setiap hari jam 8 malam", "rapat tim besok jam 10 pagi",
+    "dalam 2 jam lagi telepon ibu", "dalam 30 menit angkat jemuran", "bayar listrik setiap 1 bulan", "olahraga setelah subuh",
+    "meeting klien jumat jam 2 siang wita", "reading setiap hari jam 9 malam", "groceries sabtu jam 10 pagi",
+    "in-office day senin jam 8 pagi", "class bahasa mon/wed/fri jam 7 malam", "ulang tahun ibu setiap tahun",
+    "rapat besok jam 9 notes: bawa laptop", "gym lusa jam 5 sore mood: semangat", "standup hari ini jam 9:30",
+    "online course setiap hari jam 8 pm est", "belanja minggu depan", "cek email jam 8 pagi",
+]
+LINE_COUNT = 50000
+UNIQUE_FRACTION = 0.2
+CACHE_SIZES = [0, 100, 1000, 10000]
+ZIPF_EXPONENT = 1.1
+
+
+def build_corpus(line_count=LINE_COUNT, seed=7):
+    rng = random.Random(seed)
+    templates = TEMPLATES + datagen.note_lines(200, seed)
+    weights = [1 / (rank + 1) ** ZIPF_EXPONENT for rank in range(len(templates))]
+    lines = []
+    for index in range(line_count):
+        if rng.random() < UNIQUE_FRACTION:
+            lines.append(f"{rng.choice(templates)} notes: catatan {index}")
+        else:
+            lines.append(rng.choices(templates, weights)[0])
+    return lines
+
+
+def run_parser(parser, lines, start):
+    results = []
+    begin = time.perf_counter()
+    for index, line in enumerate(lines):
+        results.append(parser.parse(line, start + timedelta(seconds=index * 3)))
+    return time.perf_counter() - begin, results
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description='Benchmark cache hasil parse.')
+    arg_parser.add_argument('--out', help='file JSON hasil (default benchmarks/results/parse_cache-<waktu>.json)')
+    args = arg_parser.parse_args()
+
+    lines = build_corpus()
+    start = datagen.REFERENCE_TIME
+    print(f"{len(lines)} baris, {len(set(lines))} berbeda ({UNIQUE_FRACTION:.0%} baris unik)")
+    print(f"{'cache':>8} {'baris/detik':>12} {'hit rate':>9} {'entri':>7} {'speedup':>8}")
+    metrics = {}
+    baseline_seconds, baseline_results = None, None
+    for cache_size in CACHE_SIZES:
+        parser = ScheduleParser(cache_size=cache_size, stage_sample_every=0)
+        seconds, results = run_parser(parser, lines, start)
+        if baseline_results is None:
+            baseline_seconds, baseline_results = seconds, results
+        assert results == baseline_results, f"hasil dengan cache {cache_size} berbeda dari tanpa cache"
+        stats = parser.cache.stats() if parser.cache is not None else {'hit_rate': 0.0, 'entries': 0}
+        print(f"{cache_size:>8} {len(lines) / seconds:>12,.0f} {stats['hit_rate']:>9.1%} {stats['entries']:>7} "
+              f"{baseline_seconds / seconds:>7.1f}x")
+        metrics[f'parse_cache.{cache_size}.lines_per_second'] = metric(len(lines) / seconds, 'baris/s', 'higher')
+        metrics[f'parse_cache.{cache_size}.hit_rate'] = metric(stats['hit_rate'], 'rasio', 'higher')
+    print(f"Hasil: {save_results('parse_cache', metrics, args.out)}")
+
+
+if __name__ == '__main__':
+    main()
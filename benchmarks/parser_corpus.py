@@ -0,0 +1,100 @@
+"""
+Korpus golden-output untuk parse_single_schedule_fragment + microbenchmark baris/detik.
+
+Tanpa argumen: memverifikasi parser terhadap benchmarks/parser_golden.json lalu mengukur throughput.
+--update: menulis ulang file golden dari parser saat ini (hanya jika perubahan output memang disengaja).
+
+Jalankan: python -m benchmarks.parser_corpus [--update]
+"""
+import itertools
+import json
+import os
+import sys
+import time
+from datetime import datetime
+
+GOLDEN_PATH = os.path.join(os.path.dirname(__file__), 'parser_golden.json')
+BENCH_SECONDS = 2.0
+
+NOW_CONTEXTS = [
+    (2026, 3, 11, 7, 30),    # Rabu pagi, sebelum jam 9 default
+    (2026, 3, 11, 20, 45),   # Rabu malam, setelah sebagian besar waktu lewat
+    (2026, 12, 28, 23, 50),  # Akhir tahun
+    (2026, 8, 2, 12, 0),     # Minggu siang
+]
+
+SUBJECTS = ["rapat tim", "gym", "beli groceries", "standup", "Online Course python", "minum obat",
+            "in-office day", "class bahasa", "", "12345", "Meeting klien", "reading novel"]
+WHEN = ["", "jam 9", "jam 7 pagi", "pukul 3 sore", "jam 10.30 malam", "jam 12 siang", "19:15", "jam 8 pm",
+        "dalam 2 jam lagi", "dalam 45 menit", "3 jam ke depan", "setelah maghrib", "subuh", "jam 25", "jam 9:75"]
+DAY = ["", "besok", "hari ini", "lusa", "minggu depan", "senin", "jumat", "minggu", "15 agustus 2026",
+       "1/2/2027", "31 februari 2026", "10 januari 2020"]
+REPEAT = ["", "setiap hari", "daily", "setiap 3 bulan", "2 bulan kedepan", "setiap tahun", "tiap 2 tahun",
+          "mon/wed/fri", "senins", "setiap hari mon/wed/fri"]
+TZ = ["", "WIB", "wita", "WIT", "est", "pst", "gmt", "UTC", "gmt+7"]
+EXTRA = ["", "notes: \"bawa laptop\"", "catatan: siapkan slide mood: semangat", "mood: lelah",
+         "saran: tidur cepat", "makanan favorit: nasi goreng", "kopi: hitam tanpa gula", "suasana hati: senang notes: x"]
+
+
+def build_corpus():
+    lines = []
+    # Kombinasi penuh waktu x hari, lalu subjek/pengulangan/zona/metadata secara bergiliran
+    for index, (when, day) in enumerate(itertools.product(WHEN, DAY)):
+        parts = [SUBJECTS[index % len(SUBJECTS)], when, day, REPEAT[index % len(REPEAT)],
+                 TZ[index % len(TZ)], EXTRA[index % len(EXTRA)]]
+        lines.append(' '.join(p for p in parts if p))
+    lines += ["ingatkan saya rapat besok jam 10 pagi WIB", "gym setiap hari jam 6 pagi", "standup senin jam 9",
+              "Catatan: “kutipan” penting", "   ", "pengingat", "jam", "untuk saya di pada"]
+    return lines
+
+
+def serialize(result):
+    if result is None:
+        return None
+    result = dict(result)
+    result['datetime'] = result['datetime'].isoformat()
+    return result
+
+
+def now_contexts(local_timezone):
+    return [local_timezone.localize(datetime(*parts)) for parts in NOW_CONTEXTS]
+
+
+def main():
+    from schedule_parser import SCHEDULE_PARSER
+
+    lines = build_corpus()
+    contexts = now_contexts(SCHEDULE_PARSER.local_timezone)
+
+    def run_all():
+        return [{'now': now.isoformat(), 'text': text, 'expected': serialize(SCHEDULE_PARSER.parse(text, now))}
+                for now in contexts for text in lines]
+
+    if '--update' in sys.argv:
+        with open(GOLDEN_PATH, 'w') as f:
+            # Satu entri per baris agar diff golden mudah dibaca
+            f.write('[\n' + ',\n'.join(json.dumps(entry, ensure_ascii=False, sort_keys=True) for entry in run_all()) + '\n]\n')
+        print(f"Golden output ditulis ulang: {GOLDEN_PATH}")
+        return
+
+    with open(GOLDEN_PATH) as f:
+        golden = json.load(f)
+    mismatches = [(g, r) for g, r in zip(golden, run_all()) if g != r]
+    assert len(golden) == len(lines) * len(contexts), "Korpus berubah; jalankan --update bila disengaja"
+    for expected, got in mismatches[:10]:
+        print(f"BEDA: {expected['text']!r} @ {expected['now']}\n  expected={expected['expected']}\n  got     ={got['expected']}")
+    assert not mismatches, f"{len(mismatches)} dari {len(golden)} baris berbeda dari golden output"
+    print(f"{len(golden)} baris cocok dengan golden output.")
+
+    count = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < BENCH_SECONDS:
+        for text in lines:
+            SCHEDULE_PARSER.parse(text, contexts[0])
+        count += len(lines)
+    elapsed = time.perf_counter() - start
+    print(f"parse_single_schedule_fragment: {count / elapsed:,.0f} baris/detik")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Benchmark catch-up mesin pengulangan (recurrence.py): waktu catch-up untuk jeda downtime
+yang besar, algoritma lama (maju satu interval per iterasi) vs bentuk tertutup.
+Kesetaraan keduanya diperiksa oleh tests/test_recurrence.py.
+
+Jalankan: python -m benchmarks.recurrence_catchup
+"""
+import time
+from datetime import datetime, timedelta, timezone
+
+from recurrence import add_months, next_occurrence
+
+TZ = timezone(timedelta(hours=7))
+GAPS_DAYS = [1, 30, 365, 3650]
+REPEATS = 2000
+
+
+def legacy_step_by_step(current_dt, repeat_type, repeat_interval, now_local):
+    """Salinan loop lama di check_reminders_job (tanpa cabang weekly_custom)."""
+    next_datetime = current_dt
+    if repeat_type == 'yearly':
+        next_datetime = next_datetime.replace(year=next_datetime.year + repeat_interval)
+    elif repeat_type == 'monthly_interval':
+        next_datetime = add_months(next_datetime, repeat_interval)
+    elif repeat_type == 'daily':
+        next_datetime += timedelta(days=1)
+    elif repeat_type == 'weekly':
+        days_to_advance = (repeat_interval - next_datetime.weekday() + 7) % 7
+        if days_to_advance == 0:
+            days_to_advance = 7 if next_datetime.time() <= now_local.time() else 0
+        next_datetime += timedelta(days=days_to_advance)
+    while next_datetime <= now_local:
+        if repeat_type == 'yearly':
+            next_datetime = next_datetime.replace(year=next_datetime.year + repeat_interval)
+        elif repeat_type == 'monthly_interval':
+            next_datetime = add_months(next_datetime, repeat_interval)
+        elif repeat_type == 'daily':
+            next_datetime += timedelta(days=1)
+        elif repeat_type == 'weekly':
+            next_datetime += timedelta(days=7)
+    return next_datetime
+
+
+def best_of(fn):
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) / REPEATS
+
+
+def main():
+    current_dt = datetime(2020, 1, 6, 9, 0, tzinfo=TZ)
+    print(f"{'type':>18} {'gap (days)':>11} {'step-by-step (us)':>18} {'closed-form (us)':>17}")
+    for repeat_type, repeat_interval in [('daily', 1), ('weekly', 0), ('monthly_interval', 1), ('yearly', 1)]:
+        for gap in GAPS_DAYS:
+            now_local = current_dt + timedelta(days=gap)
+            legacy = best_of(lambda: legacy_step_by_step(current_dt, repeat_type, repeat_interval, now_local))
+            closed = best_of(lambda: next_occurrence(current_dt, repeat_type, repeat_interval, now_local))
+            print(f"{repeat_type:>18} {gap:>11} {legacy * 1e6:>18.1f} {closed * 1e6:>17.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Penyimpanan dan perbandingan hasil benchmark dalam JSON.
+
+Setiap file berisi {"suite", "created_at", "environment", "metrics"}; "metrics" adalah peta datar
+nama -> {"value", "unit", "better"} sehingga dua run bisa dibandingkan tanpa mengetahui benchmark
+mana yang menghasilkannya ("better": "lower" untuk latensi, "higher" untuk throughput).
+
+    python -m benchmarks.results baseline.json candidate.json [--threshold 0.1]
+
+Keluar dengan status 1 bila ada metrik yang memburuk lebih dari threshold (untuk CI).
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sqlite3
+import subprocess
+import sys
+import time
+
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+DEFAULT_THRESHOLD = 0.10
+
+
+def percentile(sorted_values, q):
+    """Persentil q (0..100) dari daftar yang sudah terurut, metode nearest-rank."""
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(q / 100 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def metric(value, unit, better='lower'):
+    return {'value': value, 'unit': unit, 'better': better}
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True, timeout=5,
+                              cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def environment():
+    """Hal yang memengaruhi angka: versi, CPU, dan konfigurasi env yang relevan."""
+    return {
+        'commit': _git_commit(),
+        'python': platform.python_version(),
+        'sqlite': sqlite3.sqlite_version,
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'env': {name: value for name, value in os.environ.items()
+                if name.startswith(('DB_', 'REMINDER_', 'RESPONSE_CACHE', 'SCHEDULER_', 'PARSE', 'METRICS'))},
+    }
+
+
+def save_results(suite, metrics, path=None):
+    """Tulis hasil ke `path` (default benchmarks/results/<suite>-<waktu>.json) dan kembalikan path-nya."""
+    if path is None:
+        os.makedirs(RESULTS_DIR, exist_ok=True)
+        path = os.path.join(RESULTS_DIR, f"{suite}-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    with open(path, 'w') as f:
+        json.dump({'suite': suite, 'created_at': time.time(), 'environment': environment(), 'metrics': metrics},
+                  f, indent=2, sort_keys=True)
+    return path
+
+
+def load_results(path):
+    with open(path) as f:
+        return json.load(f)
+
+
+def compare(baseline, candidate, threshold=DEFAULT_THRESHOLD):
+    """Daftar (nama, nilai lama, nilai baru, perubahan relatif, memburuk?) untuk metrik yang ada di keduanya."""
+    rows = []
+    for name, old in sorted(baseline['metrics'].items()):
+        new = candidate['metrics'].get(name)
+        if new is None or not old['value']:
+            continue
+        change = (new['value'] - old['value']) / old['value']
+        worse = change > threshold if old['better'] == 'lower' else change < -threshold
+        rows.append((name, old, new, change, worse))
+    return rows
+
+
+def format_comparison(rows):
+    lines = [f"{'metrik':<48} {'baseline':>12} {'kandidat':>12} {'perubahan':>10}"]
+    for name, old, new, change, worse in rows:
+        lines.append(f"{name:<48} {old['value']:>12.4g} {new['value']:>12.4g} {change:>+9.1%}{'  MEMBURUK' if worse else ''}")
+    return '\n'.join(lines)
+
+
+def format_metrics(metrics):
+    return '\n'.join(f"{name:<48} {entry['value']:>12.4g} {entry['unit']}" for name, entry in metrics.items())
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bandingkan dua file hasil benchmark.')
+    parser.add_argument('baseline')
+    parser.add_argument('candidate')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help='perubahan relatif yang dianggap memburuk (default 0.10 = 10%%)')
+    args = parser.parse_args()
+    rows = compare(load_results(args.baseline), load_results(args.candidate), args.threshold)
+    print(format_comparison(rows))
+    regressions = [row[0] for row in rows if row[4]]
+    if regressions:
+        print(f"{len(regressions)} metrik memburuk lebih dari {args.threshold:.0%}: {', '.join(regressions)}")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark biaya satu putaran scheduler terhadap ukuran tabel.
+
+Membandingkan cara lama (SELECT semua notified = 0 lalu fromisoformat per baris)
+dengan query berindeks `due_at <= now`. Jalankan: python -m benchmarks.scheduler_tick
+"""
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+import database
+
+TABLE_SIZES = [1000, 10000, 100000, 300000]
+DUE_PER_TICK = 20
+REPEATS = 5
+
+
+def build_db(path, size, now_local):
+    database.DATABASE = path
+    database.init_db()
+    conn = sqlite3.connect(path)
+    rows = []
+    for i in range(size):
+        # Sebagian kecil sudah jatuh tempo, sisanya tersebar hingga setahun ke depan
+        if i < DUE_PER_TICK:
+            dt = now_local - timedelta(minutes=random.randint(1, 60))
+        else:
+            dt = now_local + timedelta(minutes=random.randint(1, 525600))
+        rows.append((f"user-{i % 500}", "Bench", "{}", dt.isoformat(), "none", 0, 0, database.datetime_to_epoch(dt)))
+    conn.executemany('INSERT INTO reminders (user_id, event, metadata, datetime, repeat_type, repeat_interval, notified, due_at) '
+                     'VALUES (?, ?, ?, ?, ?, ?, ?, ?)', rows)
+    conn.commit()
+    return conn
+
+
+def full_scan_tick(conn, now_local):
+    due = []
+    for row in conn.execute('SELECT * FROM reminders WHERE notified = 0 ORDER BY datetime ASC'):
+        if now_local >= datetime.fromisoformat(row[4]):
+            due.append(row)
+    return due
+
+
+def indexed_tick(conn, now_local):
+    return conn.execute('SELECT * FROM reminders WHERE notified = 0 AND due_at <= ? ORDER BY due_at ASC',
+                        (int(now_local.timestamp()),)).fetchall()
+
+
+def best_of(fn, *args):
+    timings = []
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn(*args)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main():
+    now_local = datetime.now(pytz.timezone('Asia/Jakarta'))
+    print(f"{'rows':>10} {'full scan (ms)':>16} {'indexed (ms)':>14} {'speedup':>9}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in TABLE_SIZES:
+            conn = build_db(os.path.join(tmp, f"bench_{size}.db"), size, now_local)
+            assert len(full_scan_tick(conn, now_local)) == len(indexed_tick(conn, now_local))
+            full = best_of(full_scan_tick, conn, now_local)
+            indexed = best_of(indexed_tick, conn, now_local)
+            print(f"{size:>10} {full * 1000:>16.2f} {indexed * 1000:>14.3f} {full / indexed:>8.0f}x")
+            conn.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark serialisasi 50k baris /get_reminders: versi lama (fromisoformat + strftime + deteksi
+zona per baris) vs serialize_reminders (format per (tanggal, offset) dari DATETIME_FORMATTER).
+Keluaran keduanya diverifikasi identik sebelum waktu diukur.
+
+Jalankan: python -m benchmarks.serialization
+"""
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('SCHEDULER_MODE', 'off')
+
+import app
+import database
+from formatting import format_timezone_display
+from reminder_metadata import row_metadata
+from reminder_store import REMINDER_INSERT_SQL, REMINDER_LIST_COLUMNS
+
+ROW_COUNT = 50000
+DAY_COUNT = 60
+REPEATS = 3
+
+
+def legacy_serialize_reminder(r):
+    """Implementasi per baris sebelum lapisan formatting (sebagai pembanding)."""
+    r_dict = {field: r[field] for field in ('id', 'user_id', 'event', 'repeat_type', 'repeat_interval', 'notified')}
+    dt_obj = datetime.fromisoformat(r['datetime'])
+    r_dict['datetime'] = dt_obj.isoformat()
+    r_dict['formatted_datetime'] = dt_obj.strftime(f'%d %B %Y %H:%M {format_timezone_display(dt_obj)}')
+    r_dict['notified_status'] = "Selesai" if r['notified'] else "Akan Datang"
+    r_dict['metadata'] = row_metadata(r)
+    return r_dict
+
+
+def build_rows(path):
+    database.DATABASE = path
+    database.init_db()
+    rng = random.Random(11)
+    start = app.LOCAL_TIMEZONE.localize(datetime(2030, 1, 1))
+    rows = []
+    for i in range(ROW_COUNT):
+        # Pengingat menumpuk di sedikit hari, dengan jam yang beragam
+        scheduled = start + timedelta(days=rng.randrange(DAY_COUNT), minutes=rng.randrange(0, 24 * 60, 5))
+        rows.append(app.reminder_insert_row('bench', {'event': 'Bench', 'datetime': scheduled, 'repeat_type': 'none',
+                                                      'repeat_interval': 0, 'metadata': {'activity_type': 'gym'}}))
+    conn = database.connect(path)
+    conn.executemany(REMINDER_INSERT_SQL, rows)
+    conn.commit()
+    conn.row_factory = sqlite3.Row
+    result = conn.execute(f"SELECT {', '.join(REMINDER_LIST_COLUMNS)} FROM reminders ORDER BY due_at, id").fetchall()
+    conn.close()
+    return result
+
+
+def best_of(fn):
+    best = float('inf')
+    for _ in range(REPEATS):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        rows = build_rows(os.path.join(tmp, 'serialization.db'))
+
+    legacy = [legacy_serialize_reminder(r) for r in rows]
+    batched = app.serialize_reminders(rows)
+    assert json.dumps(legacy, sort_keys=True) == json.dumps(batched, sort_keys=True), "keluaran berbeda"
+
+    legacy_seconds = best_of(lambda: [legacy_serialize_reminder(r) for r in rows])
+    batched_seconds = best_of(lambda: app.serialize_reminders(rows))
+    projected_seconds = best_of(lambda: app.serialize_reminders(rows, ('id', 'event', 'formatted_datetime')))
+    print(f"{ROW_COUNT} baris dalam {DAY_COUNT} hari")
+    print(f"{'varian':>28} {'ms':>9} {'us/baris':>9}")
+    for name, seconds in [('per baris (lama)', legacy_seconds), ('serialize_reminders', batched_seconds),
+                          ('fields=id,event,formatted', projected_seconds)]:
+        print(f"{name:>28} {seconds * 1000:>9.1f} {seconds * 1e6 / ROW_COUNT:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
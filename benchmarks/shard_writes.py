@@ -0,0 +1,102 @@
+"""
+Benchmark penulisan bersamaan dengan dan tanpa sharding (DB_SHARDS).
+
+Satu importer berat (transaksi besar berulang untuk satu user) berjalan bersamaan dengan
+beberapa penulis kecil (insert + delete satu baris, seperti /delete_reminder) milik user lain.
+Dengan satu file, penulis kecil mengantre di belakang lock tulis importer; dengan N shard,
+user yang berada di shard lain tidak ikut menunggu. Dicetak: throughput dan latensi p50/p99
+penulis kecil. Pada mesin dengan satu CPU, yang terlihat terutama penurunan waktu tunggu lock.
+
+Jalankan: python -m benchmarks.shard_writes
+"""
+import os
+import tempfile
+import threading
+import time
+
+import database
+
+SHARD_COUNTS = [1, 2, 4]
+DURATION_SECONDS = 3
+SMALL_WRITERS = 4
+IMPORT_BATCH_ROWS = 5000
+# Jeda antar batch impor (parsing catatan berikutnya)
+IMPORT_PAUSE_SECONDS = 0.02
+INSERT_SQL = ('INSERT INTO reminders (user_id, event, datetime, repeat_type, repeat_interval, notified, due_at) '
+              'VALUES (?, ?, ?, \'none\', 0, 0, ?)')
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))] if values else 0.0
+
+
+def run(tmp, shard_count):
+    base_path = os.path.join(tmp, f'bench{shard_count}.db')
+    database.DATABASE = base_path
+    database.init_db(shard_count=shard_count)
+    router = database.ShardRouter(database.shard_paths(base_path, shard_count))
+
+    # Importer memakai user-import; penulis kecil memakai user yang (bila mungkin) berada di shard lain
+    import_user = 'user-import'
+    candidates = (f'user-{i}' for i in range(10000))
+    small_users = []
+    for user_id in candidates:
+        if shard_count == 1 or router.shard_for_user(user_id) != router.shard_for_user(import_user):
+            small_users.append(user_id)
+        if len(small_users) == SMALL_WRITERS:
+            break
+
+    stop_event = threading.Event()
+    latencies = []
+    latencies_lock = threading.Lock()
+
+    def importer():
+        conn = database.connect(router.path_for_user(import_user))
+        rows = [(import_user, 'Impor', '2030-01-01T09:00:00+07:00', 1893470400)] * IMPORT_BATCH_ROWS
+
+        def write():
+            with conn:
+                conn.executemany(INSERT_SQL, rows)
+        while not stop_event.is_set():
+            database.run_with_lock_retry(write)
+            time.sleep(IMPORT_PAUSE_SECONDS)
+        conn.close()
+
+    def small_writer(user_id):
+        conn = database.connect(router.path_for_user(user_id))
+        own = []
+        while not stop_event.is_set():
+            start = time.perf_counter()
+
+            def write():
+                with conn:
+                    reminder_id = conn.execute(INSERT_SQL, (user_id, 'Kecil', '2030-01-01T09:00:00+07:00', 1893470400)).lastrowid
+                    conn.execute('DELETE FROM reminders WHERE id = ? AND user_id = ?', (reminder_id, user_id))
+            database.run_with_lock_retry(write)
+            own.append(time.perf_counter() - start)
+        conn.close()
+        with latencies_lock:
+            latencies.extend(own)
+
+    threads = [threading.Thread(target=importer)] + [threading.Thread(target=small_writer, args=(user_id,)) for user_id in small_users]
+    for thread in threads:
+        thread.start()
+    time.sleep(DURATION_SECONDS)
+    stop_event.set()
+    for thread in threads:
+        thread.join()
+    return len(latencies) / DURATION_SECONDS, percentile(latencies, 0.5), percentile(latencies, 0.99)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        print(f"{SMALL_WRITERS} penulis kecil + 1 importer ({IMPORT_BATCH_ROWS} baris/transaksi), {DURATION_SECONDS}s per konfigurasi")
+        print(f"{'shard':>6} {'tulis kecil/s':>14} {'p50 (ms)':>9} {'p99 (ms)':>9}")
+        for shard_count in SHARD_COUNTS:
+            throughput, p50, p99 = run(tmp, shard_count)
+            print(f"{shard_count:>6} {throughput:>14.0f} {p50 * 1000:>9.2f} {p99 * 1000:>9.2f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,164 @@
+"""
+Load test stream /events: menahan banyak koneksi SSE idle pada satu worker gunicorn gevent.
+
+Menjalankan gunicorn (1 worker, --worker-class gevent) dengan database sementara, membuka
+CONNECTION_COUNT koneksi SSE yang tersebar ke USER_COUNT user, menahannya selama HOLD_SECONDS,
+lalu menambah pengingat untuk satu user dan mengukur berapa lama event "changed" sampai ke
+semua tab user tersebut. Dilaporkan juga RSS worker sebelum dan sesudah koneksi dibuka.
+
+Jalankan: python -m benchmarks.sse_idle_connections [jumlah_koneksi]
+"""
+import asyncio
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+
+import database
+
+CONNECTION_COUNT = 5000
+USER_COUNT = 1000
+HOLD_SECONDS = 5
+CONNECT_CONCURRENCY = 500
+REPO_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(('127.0.0.1', 0))
+        return s.getsockname()[1]
+
+
+def wait_for_server(port, timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            with socket.create_connection(('127.0.0.1', port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.1)
+    raise RuntimeError("gunicorn tidak merespons")
+
+
+def worker_pid(master_pid, timeout=15):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        with open(f'/proc/{master_pid}/task/{master_pid}/children') as f:
+            children = f.read().split()
+        if children:
+            return int(children[0])
+        time.sleep(0.1)
+    raise RuntimeError("worker gunicorn tidak muncul")
+
+
+def rss_mib(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmRSS:'):
+                return int(line.split()[1]) / 1024
+    return 0.0
+
+
+class SseClient:
+    def __init__(self, port, user_id):
+        self.port = port
+        self.user_id = user_id
+        self.connected = asyncio.Event()
+        self.changed_at = None
+        self.closed = False
+
+    async def run(self, semaphore):
+        async with semaphore:
+            reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+            writer.write(f"GET /events?user_id={self.user_id} HTTP/1.1\r\nHost: localhost\r\nAccept: text/event-stream\r\n\r\n".encode())
+            await writer.drain()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                if line.startswith(b'event: version'):
+                    self.connected.set()
+                elif line.startswith(b'event: changed') and self.changed_at is None:
+                    self.changed_at = time.perf_counter()
+        finally:
+            self.closed = True
+            writer.close()
+
+
+def add_reminder(port, user_id):
+    body = json.dumps({"full_note_text": "Rapat tim besok jam 9", "user_id": user_id}).encode()
+    req = urllib.request.Request(f"http://127.0.0.1:{port}/add_multiple_reminders", data=body,
+                                 headers={'Content-Type': 'application/json'}, method='POST')
+    with urllib.request.urlopen(req, timeout=10) as response:
+        response.read()
+
+
+async def load_test(port, worker, connection_count):
+    semaphore = asyncio.Semaphore(CONNECT_CONCURRENCY)
+    clients = [SseClient(port, f"user-{i % USER_COUNT}") for i in range(connection_count)]
+    rss_before = rss_mib(worker)
+
+    start = time.perf_counter()
+    tasks = [asyncio.ensure_future(client.run(semaphore)) for client in clients]
+    await asyncio.gather(*(client.connected.wait() for client in clients))
+    connect_seconds = time.perf_counter() - start
+    rss_after = rss_mib(worker)
+    print(f"{connection_count} koneksi tersambung dalam {connect_seconds:.2f}s")
+    print(f"RSS worker: {rss_before:.1f} MiB -> {rss_after:.1f} MiB "
+          f"(~{(rss_after - rss_before) * 1024 / connection_count:.1f} KiB/koneksi)")
+
+    await asyncio.sleep(HOLD_SECONDS)
+    open_count = sum(1 for client in clients if not client.closed)
+    print(f"Masih terbuka setelah {HOLD_SECONDS}s idle: {open_count}/{connection_count}")
+
+    target_user = "user-0"
+    targets = [client for client in clients if client.user_id == target_user]
+    published_at = time.perf_counter()
+    await asyncio.get_running_loop().run_in_executor(None, add_reminder, port, target_user)
+    while any(client.changed_at is None for client in targets) and time.perf_counter() - published_at < 10:
+        await asyncio.sleep(0.005)
+    delivered = [client.changed_at - published_at for client in targets if client.changed_at is not None]
+    others = sum(1 for client in clients if client.user_id != target_user and client.changed_at is not None)
+    print(f"Event 'changed' sampai ke {len(delivered)}/{len(targets)} tab {target_user}, "
+          f"maks {max(delivered) * 1000 if delivered else float('nan'):.1f} ms setelah POST; "
+          f"tab user lain yang ikut menerima: {others}")
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+def main():
+    connection_count = int(sys.argv[1]) if len(sys.argv) > 1 else CONNECTION_COUNT
+    # Klien dan server sama-sama memakai satu file descriptor per koneksi
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+    if hard < connection_count + 100:
+        print(f"Peringatan: ulimit -n ({hard}) lebih kecil dari jumlah koneksi yang diminta")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE = os.path.join(tmp, 'reminders.db')
+        database.init_db()
+        port = free_port()
+        env = dict(os.environ, PYTHONPATH=REPO_DIR, SCHEDULER_MODE='off')
+        server = subprocess.Popen(
+            [sys.executable, '-m', 'gunicorn', 'app:app', '--bind', f'127.0.0.1:{port}', '--workers', '1',
+             '--worker-class', 'gevent', '--worker-connections', str(connection_count + 100),
+             '--backlog', '4096', '--log-level', 'warning'],
+            cwd=tmp, env=env)
+        try:
+            wait_for_server(port)
+            asyncio.run(load_test(port, worker_pid(server.pid), connection_count))
+        finally:
+            server.terminate()
+            server.wait()
+
+
+if __name__ == '__main__':
+    main()
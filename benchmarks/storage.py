@@ -0,0 +1,100 @@
+"""
+Benchmark operasi ReminderStore: engine SQLite (satu file, pool koneksi) vs engine in-memory
+(memory_store.py) sebagai baseline, dengan data dan urutan operasi yang sama.
+
+Diukur per operasi: add_many (satu batch per user), list_by_user (halaman pertama dan seluruh
+daftar), range_by_user (satu bulan), due_before + advance_many (satu putaran scheduler), dan delete.
+
+Jalankan: python -m benchmarks.storage
+"""
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+import pytz
+
+import database
+from memory_store import MemoryReminderStore
+from reminder_metadata import split_metadata
+from reminder_store import SQLiteReminderStore
+
+USER_COUNT = 50
+REMINDERS_PER_USER = 2000
+PAGE_SIZE = 200
+DUE_PER_TICK = 500
+REPEATS = 5
+LOCAL_TIMEZONE = pytz.timezone('Asia/Jakarta')
+
+
+def build_rows(user_id, rng, start):
+    rows = []
+    for _ in range(REMINDERS_PER_USER):
+        scheduled = start + timedelta(minutes=rng.randint(0, 365 * 24 * 60))
+        repeat_type = rng.choice(['none'] * 7 + ['daily', 'weekly', 'monthly_interval'])
+        rows.append((user_id, 'Bench', scheduled.isoformat(), repeat_type, 1 if repeat_type != 'none' else 0, 0,
+                     database.datetime_to_epoch(scheduled)) + split_metadata({'activity_type': rng.choice(['gym', 'rapat'])}))
+    return rows
+
+
+def timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return time.perf_counter() - start, result
+
+
+def best_of(fn):
+    return min(timed(fn)[0] for _ in range(REPEATS))
+
+
+def run(store, rows_by_user, now_epoch):
+    results = {}
+    users = list(rows_by_user)
+    results['add_many (per user)'] = sum(timed(lambda: store.add_many(user_id, rows))[0]
+                                         for user_id, rows in rows_by_user.items()) / len(users)
+    user_id = users[0]
+    results['list_by_user halaman'] = best_of(lambda: list(store.list_by_user(user_id, limit=PAGE_SIZE)))
+    results['list_by_user semua'] = best_of(lambda: list(store.list_by_user(user_id)))
+    results['list upcoming+filter'] = best_of(lambda: list(store.list_by_user(user_id, status='upcoming',
+                                                                              filters={'activity_type': 'gym'})))
+    month_start = now_epoch + 30 * 86400
+    results['range_by_user bulan'] = best_of(lambda: store.range_by_user(user_id, month_start, month_start + 30 * 86400))
+
+    def tick():
+        due = store.due_before(now_epoch + 3 * 86400, DUE_PER_TICK)
+        store.advance_many([(row['id'], row['due_at']) for row in due if row['repeat_type'] == 'none'],
+                           [(row['datetime'], row['due_at'] + 86400, row['id'], row['due_at']) for row in due if row['repeat_type'] != 'none'])
+        return due
+    # Sekali saja: putaran berikutnya tidak lagi menemukan baris jatuh tempo yang sama
+    results['tick (due+advance)'] = timed(tick)[0]
+
+    victims = [row['id'] for row in store.list_by_user(users[1], limit=REPEATS * 20)]
+    start = time.perf_counter()
+    for reminder_id in victims:
+        store.delete(users[1], reminder_id)
+    results['delete (per id)'] = (time.perf_counter() - start) / len(victims)
+    return results
+
+
+def main():
+    rng = random.Random(11)
+    start = LOCAL_TIMEZONE.localize(datetime(2030, 1, 1))
+    rows_by_user = {f"user-{i}": build_rows(f"user-{i}", rng, start) for i in range(USER_COUNT)}
+    now_epoch = database.datetime_to_epoch(start)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database.DATABASE = os.path.join(tmp, 'storage.db')
+        database.init_db()
+        sqlite_results = run(SQLiteReminderStore(database.DATABASE), rows_by_user, now_epoch)
+    memory_results = run(MemoryReminderStore(), rows_by_user, now_epoch)
+
+    print(f"{USER_COUNT} user x {REMINDERS_PER_USER} pengingat")
+    print(f"{'operasi':>22} {'SQLite (ms)':>12} {'memori (ms)':>12} {'rasio':>7}")
+    for name, sqlite_seconds in sqlite_results.items():
+        memory_seconds = memory_results[name]
+        print(f"{name:>22} {sqlite_seconds * 1000:>12.3f} {memory_seconds * 1000:>12.3f} {sqlite_seconds / memory_seconds:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
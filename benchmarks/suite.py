@@ -0,0 +1,50 @@
+"""
+Menjalankan seluruh suite benchmark (micro, tick_sizes, load, cold_start) dan menyimpan satu file JSON hasil,
+opsional langsung dibandingkan dengan run sebelumnya:
+
+    python -m benchmarks.suite --quick
+    python -m benchmarks.suite --out hasil-baru.json --compare benchmarks/results/suite-lama.json
+    python -m benchmarks.suite --skip load
+
+Data sintetis berasal dari benchmarks.datagen dengan seed tetap, jadi dua run di mesin yang sama
+mengukur pekerjaan yang sama. Lihat benchmarks.results untuk format file dan perbandingan.
+"""
+import argparse
+import sys
+
+from benchmarks import cold_start, load, micro, tick_sizes
+from benchmarks.results import (DEFAULT_THRESHOLD, compare, format_comparison, format_metrics, load_results,
+                                save_results)
+
+PARTS = {'micro': micro.run, 'tick_sizes': tick_sizes.run, 'load': load.run, 'cold_start': cold_start.run}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Jalankan semua benchmark dan simpan hasil JSON.')
+    parser.add_argument('--quick', action='store_true', help='data dan durasi lebih kecil')
+    parser.add_argument('--skip', action='append', choices=sorted(PARTS), default=[])
+    parser.add_argument('--out', help='file JSON hasil (default benchmarks/results/suite-<waktu>.json)')
+    parser.add_argument('--compare', help='file hasil sebelumnya sebagai baseline')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD)
+    args = parser.parse_args()
+
+    metrics = {}
+    for name, run in PARTS.items():
+        if name in args.skip:
+            continue
+        print(f"== {name}")
+        part_metrics = run(quick=args.quick)
+        print(format_metrics(part_metrics))
+        metrics.update(part_metrics)
+    path = save_results('suite', metrics, args.out)
+    print(f"Hasil: {path}")
+
+    if args.compare:
+        rows = compare(load_results(args.compare), load_results(path), args.threshold)
+        print(format_comparison(rows))
+        if any(row[4] for row in rows):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,101 @@
+"""
+Benchmark putaran scheduler terhadap ukuran tabel, lewat fungsi yang sama dengan yang dipakai
+check_reminders_job (app._process_shard_due_reminders + next_due untuk due_queue).
+
+Per ukuran tabel (data benchmarks.datagen, satu file SQLite): putaran idle (tidak ada yang jatuh
+tempo) dan putaran dengan DUE_PER_TICK pengingat jatuh tempo. Baris yang sama dijadikan jatuh
+tempo lagi sebelum setiap pengulangan, sehingga setiap pengulangan mengerjakan hal yang sama.
+
+    python -m benchmarks.tick_sizes [--quick] [--sizes 1000,10000,100000] [--out hasil.json]
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('SCHEDULER_MODE', 'off')
+
+import app
+import database
+from benchmarks import datagen
+from benchmarks.results import format_metrics, metric, save_results
+from reminder_store import SQLiteReminderStore
+
+TABLE_SIZES = [1000, 10000, 100000]
+QUICK_TABLE_SIZES = [1000, 10000]
+REMINDERS_PER_USER = 500
+DUE_PER_TICK = 100
+REPEATS = 5
+
+
+def build_store(path, size):
+    database.DATABASE = path
+    database.init_db(shard_count=1)
+    store = SQLiteReminderStore(path)
+    reference = datetime.now(app.LOCAL_TIMEZONE)
+    user_count = max(1, size // REMINDERS_PER_USER)
+    datagen.populate_store(store, datagen.generate(user_count, min(size, REMINDERS_PER_USER), reference=reference))
+    return store
+
+
+def make_due(path, reminder_ids):
+    """Jadikan reminder_ids jatuh tempo satu menit yang lalu (belum dinotifikasi)."""
+    due_dt = datetime.now(app.LOCAL_TIMEZONE).replace(microsecond=0) - timedelta(minutes=1)
+    conn = database.connect(path)
+    with conn:
+        conn.executemany('UPDATE reminders SET datetime = ?, due_at = ?, notified = 0 WHERE id = ?',
+                         [(due_dt.isoformat(), database.datetime_to_epoch(due_dt), reminder_id) for reminder_id in reminder_ids])
+    conn.close()
+
+
+def timed_tick(store):
+    start = time.perf_counter()
+    processed = app._process_shard_due_reminders(store)
+    store.next_due(app.due_queue.window_size)
+    return time.perf_counter() - start, processed
+
+
+def bench_size(tmp, size):
+    path = os.path.join(tmp, f'tick-{size}.db')
+    store = build_store(path, size)
+    # Semua yang belum dinotifikasi (due_before dengan batas waktu tak terhingga)
+    upcoming = [row['id'] for row in store.due_before(2 ** 62, size)]
+    due_ids = random.Random(size).sample(upcoming, min(DUE_PER_TICK, len(upcoming)))
+
+    idle = min(timed_tick(store)[0] for _ in range(REPEATS))
+    busy = []
+    for _ in range(REPEATS):
+        make_due(path, due_ids)
+        seconds, processed = timed_tick(store)
+        assert processed == len(due_ids), f"{processed} diproses, {len(due_ids)} diharapkan"
+        busy.append(seconds)
+    return {
+        f'tick.{size}.idle_ms': metric(idle * 1000, 'ms'),
+        f'tick.{size}.due{DUE_PER_TICK}_ms': metric(min(busy) * 1000, 'ms'),
+    }
+
+
+def run(quick=False, sizes=None):
+    metrics = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in sizes or (QUICK_TABLE_SIZES if quick else TABLE_SIZES):
+            metrics.update(bench_size(tmp, size))
+    return metrics
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark putaran scheduler terhadap ukuran tabel.')
+    parser.add_argument('--quick', action='store_true')
+    parser.add_argument('--sizes', help='daftar ukuran tabel dipisah koma')
+    parser.add_argument('--out', help='file JSON hasil (default benchmarks/results/tick_sizes-<waktu>.json)')
+    args = parser.parse_args()
+    sizes = [int(size) for size in args.sizes.split(',')] if args.sizes else None
+    metrics = run(args.quick, sizes)
+    print(format_metrics(metrics))
+    print(f"Hasil: {save_results('tick_sizes', metrics, args.out)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+from collections import OrderedDict
+from datetime import datetime
+import os
+import threading
+
+from recurrence import occurrences_between
+
+# --- Ekspansi Kalender Bulanan ---
+# Seri berulang (daily, weekly, weekly_custom, monthly_interval, yearly) dijabarkan menjadi
+# kemunculan di dalam jendela bulan, dikelompokkan per tanggal lokal. Hasilnya di-cache per
+# (user, tahun, bulan, versi): versi user naik pada setiap perubahan, jadi entri lama tidak
+# perlu dihapus secara eksplisit dan cukup tersingkir oleh LRU.
+CALENDAR_CACHE_SIZE = int(os.environ.get('CALENDAR_CACHE_SIZE', 512))
+
+
+class MonthExpansion:
+    """Kemunculan satu bulan: `days` = {'YYYY-MM-DD': [(datetime kemunculan, reminder_id), ...]}."""
+
+    def __init__(self, rows, days):
+        self.rows = rows
+        self.days = days
+
+    def day_counts(self):
+        return {date: len(occurrences) for date, occurrences in self.days.items()}
+
+
+def expand_month(rows, window_start, window_end, local_timezone):
+    """
+    `rows`: baris reminders (mapping dengan id, datetime, repeat_type, repeat_interval, repeat_days, notified)
+    yang kemunculan berikutnya sebelum window_end. Tanggal dikelompokkan menurut zona waktu lokal.
+    """
+    rows_by_id = {}
+    days = {}
+    for r in rows:
+        start_dt = datetime.fromisoformat(r['datetime'])
+        if start_dt.tzinfo is None:
+            start_dt = local_timezone.localize(start_dt)
+        repeat_type = r['repeat_type'] if not r['notified'] else 'none'
+        for occurrence in occurrences_between(start_dt, repeat_type, r['repeat_interval'], window_start, window_end,
+                                              repeat_days=r['repeat_days']):
+            date = occurrence.astimezone(local_timezone).strftime('%Y-%m-%d')
+            days.setdefault(date, []).append((occurrence, r['id']))
+            rows_by_id[r['id']] = dict(r)
+    for occurrences in days.values():
+        occurrences.sort(key=lambda item: (item[0], item[1]))
+    return MonthExpansion(rows_by_id, days)
+
+
+class MonthExpansionCache:
+    def __init__(self, max_entries=CALENDAR_CACHE_SIZE):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            expansion = self._entries.get(key)
+            if expansion is not None:
+                self._entries.move_to_end(key)
+            return expansion
+
+    def put(self, key, expansion):
+        with self._lock:
+            self._entries[key] = expansion
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
@@ -0,0 +1,106 @@
+"""
+Pemadatan tabel reminders: pengingat sekali jalan yang sudah dinotifikasi dan lebih tua dari
+COMPACTION_MIN_AGE_DAYS dipindah ke reminders_archive dalam batch kecil (satu transaksi pendek per
+batch, dengan jeda agar penulis lain mendapat lock), halaman kosong dikembalikan dengan
+incremental vacuum, dan tombstone lebih tua dari TOMBSTONE_RETENTION_DAYS dipangkas. Arsip tinggal di
+file tersendiri (reminders.archive.db, lihat database.archive_path), sehingga file utama benar-benar
+mengecil.
+
+Berjalan otomatis di proses leader scheduler setiap COMPACTION_INTERVAL_SECONDS (lihat app.py),
+atau manual:
+
+    python -m compaction                     # sekali jalan, cetak laporan
+    python -m compaction --min-age-days 7
+"""
+import argparse
+import os
+import time
+
+COMPACTION_INTERVAL_SECONDS = float(os.environ.get('COMPACTION_INTERVAL_SECONDS', 3600))
+COMPACTION_MIN_AGE_DAYS = float(os.environ.get('COMPACTION_MIN_AGE_DAYS', 30))
+COMPACTION_BATCH_SIZE = int(os.environ.get('COMPACTION_BATCH_SIZE', 500))
+# Jeda antar batch: penulis (endpoint, scheduler) tidak pernah menunggu lebih dari satu batch
+COMPACTION_PAUSE_SECONDS = float(os.environ.get('COMPACTION_PAUSE_SECONDS', 0.05))
+# Halaman yang dikembalikan per langkah incremental_vacuum
+COMPACTION_VACUUM_PAGES = int(os.environ.get('COMPACTION_VACUUM_PAGES', 2000))
+TOMBSTONE_RETENTION_DAYS = float(os.environ.get('TOMBSTONE_RETENTION_DAYS', 90))
+
+
+def compact_shard(shard_store, min_age_days=COMPACTION_MIN_AGE_DAYS, batch_size=COMPACTION_BATCH_SIZE,
+                  pause_seconds=COMPACTION_PAUSE_SECONDS, on_batch=None):
+    """Padatkan satu shard. `on_batch(user_ids)` dipanggil setelah setiap batch arsip ter-commit."""
+    now = time.time()
+    report = {'before': shard_store.storage_stats(), 'archived': 0, 'batches': 0, 'max_batch_ms': 0.0,
+              'tombstones_pruned': 0, 'reclaimed_bytes': 0}
+    started = time.perf_counter()
+
+    before_epoch = int(now - min_age_days * 86400)
+    while True:
+        batch_started = time.perf_counter()
+        user_ids = shard_store.archive_completed(before_epoch, batch_size)
+        report['max_batch_ms'] = max(report['max_batch_ms'], (time.perf_counter() - batch_started) * 1000)
+        if not user_ids:
+            break
+        report['archived'] += len(user_ids)
+        report['batches'] += 1
+        if on_batch is not None:
+            on_batch(user_ids)
+        if len(user_ids) < batch_size:
+            break
+        time.sleep(pause_seconds)
+
+    tombstone_before = now - TOMBSTONE_RETENTION_DAYS * 86400
+    while True:
+        pruned = shard_store.prune_tombstones(tombstone_before, batch_size)
+        report['tombstones_pruned'] += pruned
+        if pruned < batch_size:
+            break
+        time.sleep(pause_seconds)
+
+    while True:
+        reclaimed = shard_store.reclaim_space(COMPACTION_VACUUM_PAGES)
+        report['reclaimed_bytes'] += reclaimed
+        if reclaimed <= 0:
+            break
+        time.sleep(pause_seconds)
+
+    report['seconds'] = time.perf_counter() - started
+    report['after'] = shard_store.storage_stats()
+    return report
+
+
+def compact(store, **kwargs):
+    """Padatkan semua shard berurutan. Mengembalikan laporan per shard."""
+    return [compact_shard(shard_store, **kwargs) for shard_store in store.shards]
+
+
+def format_report(reports):
+    lines = []
+    for shard, report in enumerate(reports):
+        before, after = report['before'], report['after']
+        lines.append(
+            f"Shard {shard}: {report['archived']} diarsipkan dalam {report['batches']} batch "
+            f"(batch terlama {report['max_batch_ms']:.1f} ms), {report['tombstones_pruned']} tombstone dipangkas, "
+            f"{report['seconds']:.2f}s. reminders {before['reminders']} -> {after['reminders']}, "
+            f"arsip {before['archived']} -> {after['archived']}, "
+            f"file {before['file_bytes'] / 1048576:.1f} -> {after['file_bytes'] / 1048576:.1f} MiB "
+            f"(kosong {after['free_bytes'] / 1048576:.1f} MiB, "
+            f"{report['reclaimed_bytes'] / 1048576:.1f} MiB dikembalikan), "
+            f"file arsip {before['archive_bytes'] / 1048576:.1f} -> {after['archive_bytes'] / 1048576:.1f} MiB")
+    return '\n'.join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Arsipkan pengingat sekali jalan yang sudah lewat dan padatkan database.')
+    parser.add_argument('--min-age-days', type=float, default=COMPACTION_MIN_AGE_DAYS)
+    args = parser.parse_args()
+
+    import database
+    from reminder_store import store_from_env
+
+    database.init_db()
+    print(format_report(compact(store_from_env(database.DATABASE), min_age_days=args.min_age_days)))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,11 +1,214 @@
 import sqlite3
+import contextlib
+import json
+import os
+import math
+import random
+import threading
+import time
+import zlib
+from datetime import datetime
+import pytz
+
+try:
+    import fcntl
+except ImportError:  # Windows: tanpa kunci migrasi antarproses
+    fcntl = None
+
+from reminder_metadata import METADATA_COLUMNS, split_metadata
 
 DATABASE = 'reminders.db'
+LOCAL_TIMEZONE = pytz.timezone(os.environ.get('TZ', 'Asia/Jakarta'))
+BACKFILL_BATCH_SIZE = 1000
+
+# --- Koneksi SQLite: pragma, pool per worker, dan strategi busy-timeout ---
+# WAL: pembaca tidak diblokir oleh penulis (mis. scheduler). synchronous=NORMAL aman di WAL
+# dan menghemat fsync per commit. Nilai negatif cache_size berarti KiB.
+SQLITE_BUSY_TIMEOUT_MS = int(os.environ.get('SQLITE_BUSY_TIMEOUT_MS', 5000))
+SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE', 64 * 1024 * 1024))
+SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE', -16000))
+SQLITE_STATEMENT_CACHE_SIZE = int(os.environ.get('SQLITE_STATEMENT_CACHE_SIZE', 256))
+DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE', 8))
+# Penulisan yang tetap gagal "database is locked" setelah busy_timeout dicoba ulang dengan backoff
+DB_LOCKED_RETRIES = int(os.environ.get('DB_LOCKED_RETRIES', 3))
+DB_LOCKED_BACKOFF_SECONDS = float(os.environ.get('DB_LOCKED_BACKOFF_SECONDS', 0.05))
+
+def archive_path(path):
+    """File arsip milik satu file database: reminders.db -> reminders.archive.db."""
+    stem, ext = os.path.splitext(path)
+    return f"{stem}.archive{ext}"
+
+def connect(path=None):
+    """Buka koneksi dengan pragma standar aplikasi; file arsipnya di-ATTACH sebagai skema `archive`."""
+    path = path or DATABASE
+    conn = sqlite3.connect(path,
+                           timeout=SQLITE_BUSY_TIMEOUT_MS / 1000,
+                           cached_statements=SQLITE_STATEMENT_CACHE_SIZE,
+                           # Koneksi di pool bisa dipakai thread berbeda, tapi tidak pernah bersamaan
+                           check_same_thread=False,
+                           # BEGIN IMMEDIATE: lock tulis diambil di awal transaksi sehingga busy_timeout berlaku,
+                           # bukan gagal seketika saat upgrade dari baca ke tulis
+                           isolation_level='IMMEDIATE')
+    conn.execute('PRAGMA journal_mode = WAL')
+    conn.execute('PRAGMA synchronous = NORMAL')
+    conn.execute(f'PRAGMA busy_timeout = {SQLITE_BUSY_TIMEOUT_MS}')
+    conn.execute(f'PRAGMA mmap_size = {SQLITE_MMAP_SIZE}')
+    conn.execute(f'PRAGMA cache_size = {SQLITE_CACHE_SIZE}')
+    # reminders_archive (setelah migrasi 14) tinggal di file sendiri: nama tabel tanpa skema tetap menemukannya
+    conn.execute('ATTACH DATABASE ? AS archive', (archive_path(path),))
+    conn.execute('PRAGMA archive.journal_mode = WAL')
+    conn.execute('PRAGMA archive.synchronous = NORMAL')
+    return conn
+
+class ConnectionPool:
+    """Pool koneksi sederhana (LIFO) untuk satu file database di satu proses."""
+
+    def __init__(self, path, max_size=DB_POOL_SIZE):
+        self.path = path
+        self.max_size = max_size
+        self._idle = []
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        with self._lock:
+            if self._idle:
+                return self._idle.pop()
+        return connect(self.path)
+
+    def release(self, conn):
+        if conn.in_transaction:
+            conn.rollback()
+        with self._lock:
+            if len(self._idle) < self.max_size:
+                self._idle.append(conn)
+                return
+        conn.close()
+
+    def close_all(self):
+        with self._lock:
+            idle, self._idle = self._idle, []
+        for conn in idle:
+            conn.close()
+
+_pools = {}
+_pools_pid = None
+_pools_lock = threading.Lock()
+
+def get_pool(path=None):
+    """Pool per proses worker: setelah fork, pool milik proses induk tidak dipakai ulang."""
+    global _pools, _pools_pid
+    path = path or DATABASE
+    with _pools_lock:
+        if _pools_pid != os.getpid():
+            _pools = {}
+            _pools_pid = os.getpid()
+        if path not in _pools:
+            _pools[path] = ConnectionPool(path)
+        return _pools[path]
+
+# --- Sharding opsional per user_id ---
+# DB_SHARDS=1 (default): semua user di DATABASE. DB_SHARDS=N: user dipetakan ke N file SQLite
+# (shard 0 = DATABASE, shard i = reminders.shard{i}.db) lewat crc32(user_id) % N, sehingga penulisan
+# user berbeda tidak berebut satu lock tulis. Tabel user_shards di DATABASE menyimpan pengecualian
+# yang ditulis oleh `python -m rebalance_shards`; lease scheduler selalu ada di DATABASE.
+DB_SHARDS = int(os.environ.get('DB_SHARDS', 1))
+
+def shard_paths(base_path=None, shard_count=None):
+    base_path = base_path or DATABASE
+    stem, ext = os.path.splitext(base_path)
+    return [base_path] + [f"{stem}.shard{i}{ext}" for i in range(1, shard_count or DB_SHARDS)]
+
+def hash_shard(user_id, shard_count):
+    # crc32 stabil antar proses dan antar restart (berbeda dengan hash() bawaan Python)
+    return zlib.crc32(user_id.encode('utf-8')) % shard_count
+
+def load_shard_overrides(base_path):
+    conn = sqlite3.connect(base_path, timeout=SQLITE_BUSY_TIMEOUT_MS / 1000)
+    try:
+        return dict(conn.execute('SELECT user_id, shard FROM user_shards').fetchall())
+    except sqlite3.OperationalError:
+        # Database belum dimigrasi: belum ada pengecualian
+        return {}
+    finally:
+        conn.close()
+
+class ShardRouter:
+    def __init__(self, paths, overrides=None, base_path=None):
+        self.paths = paths
+        self.base_path = base_path
+        # Dengan base_path, pengecualian dibaca saat routing pertama, bukan saat modul diimpor
+        if overrides is None and base_path is None:
+            overrides = {}
+        self._overrides = overrides
+        self._overrides_lock = threading.Lock()
+
+    @property
+    def overrides(self):
+        if self._overrides is None:
+            with self._overrides_lock:
+                if self._overrides is None:
+                    self._overrides = load_shard_overrides(self.base_path)
+        return self._overrides
 
-def init_db():
-    conn = sqlite3.connect(DATABASE)
-    cursor = conn.cursor()
-    cursor.execute('''
+    def shard_for_user(self, user_id):
+        if len(self.paths) == 1:
+            return 0
+        shard = self.overrides.get(user_id)
+        if shard is None or shard >= len(self.paths):
+            shard = hash_shard(user_id, len(self.paths))
+        return shard
+
+    def path_for_user(self, user_id):
+        return self.paths[self.shard_for_user(user_id)]
+
+_routers = {}
+_routers_lock = threading.Lock()
+
+def get_router(base_path=None):
+    """Router per proses; pengecualian dibaca sekali saat dibutuhkan (rebalance dijalankan offline, lalu aplikasi di-restart)."""
+    base_path = base_path or DATABASE
+    with _routers_lock:
+        if base_path not in _routers:
+            _routers[base_path] = ShardRouter(shard_paths(base_path), base_path=base_path)
+        return _routers[base_path]
+
+def run_with_lock_retry(fn, *args, **kwargs):
+    """Jalankan fungsi tulis; ulangi dengan backoff eksponensial + jitter bila database terkunci."""
+    for attempt in range(DB_LOCKED_RETRIES + 1):
+        try:
+            return fn(*args, **kwargs)
+        except sqlite3.OperationalError as e:
+            if 'locked' not in str(e) and 'busy' not in str(e):
+                raise
+            if attempt == DB_LOCKED_RETRIES:
+                raise
+            time.sleep(DB_LOCKED_BACKOFF_SECONDS * (2 ** attempt) * (1 + random.random()))
+
+def datetime_to_epoch(dt_object):
+    """Detik epoch UTC (dibulatkan ke atas) untuk kolom due_at. Datetime naive dianggap waktu lokal."""
+    if dt_object.tzinfo is None:
+        dt_object = LOCAL_TIMEZONE.localize(dt_object)
+    return math.ceil(dt_object.timestamp())
+
+def iso_to_epoch(iso_string):
+    return datetime_to_epoch(datetime.fromisoformat(iso_string))
+
+def backfill_due_at(conn, batch_size=BACKFILL_BATCH_SIZE):
+    """Isi due_at untuk baris lama secara bertahap agar tidak menahan lock terlalu lama."""
+    while True:
+        rows = conn.execute('SELECT id, datetime FROM reminders WHERE due_at IS NULL LIMIT ?', (batch_size,)).fetchall()
+        if not rows:
+            break
+        conn.executemany('UPDATE reminders SET due_at = ? WHERE id = ?',
+                         [(iso_to_epoch(row[1]), row[0]) for row in rows])
+        conn.commit()
+
+# --- Migrasi Skema Berversi ---
+# Versi skema disimpan di PRAGMA user_version. Setiap migrasi harus aman dijalankan
+# pada database lama yang dibuat sebelum sistem migrasi ini ada (versi 0).
+
+def _create_reminders_table(conn):
+    conn.execute('''
         CREATE TABLE IF NOT EXISTS reminders (
             id INTEGER PRIMARY KEY AUTOINCREMENT,
             user_id TEXT NOT NULL,
@@ -18,9 +221,288 @@ def init_db():
             -- Kolom description, notes, mood, suggestion dihapus
         )
     ''')
+
+def _add_due_at_column(conn):
+    # Waktu jatuh tempo dalam detik epoch UTC, monoton terhadap waktu (tidak seperti string ISO dengan offset berbeda)
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(reminders)')]
+    if 'due_at' not in columns:
+        conn.execute('ALTER TABLE reminders ADD COLUMN due_at INTEGER')
+        conn.commit()
+    backfill_due_at(conn)
+
+def _create_due_indexes(conn):
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_reminders_notified_due ON reminders (notified, due_at)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_reminders_user_due ON reminders (user_id, due_at)')
+
+def _create_scheduler_lease_table(conn):
+    # Satu baris per lease; pemegang lease adalah satu-satunya proses yang menjalankan loop pengingat
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS scheduler_lease (
+            name TEXT PRIMARY KEY,
+            holder TEXT NOT NULL,
+            expires_at REAL NOT NULL      -- Detik epoch (time.time())
+        )
+    ''')
+
+def _create_notification_outbox_table(conn):
+    # Outbox transaksional: ditulis dalam transaksi yang sama dengan pemajuan pengingat,
+    # lalu dikirim oleh dispatcher (at-least-once). Baris yang berhasil terkirim dihapus.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS notification_outbox (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            reminder_id INTEGER NOT NULL,
+            user_id TEXT NOT NULL,
+            target TEXT NOT NULL,         -- Nama sender (log, webhook, ...)
+            payload TEXT NOT NULL,        -- JSON
+            status TEXT NOT NULL DEFAULT 'pending', -- pending | failed
+            attempts INTEGER NOT NULL DEFAULT 0,
+            next_attempt_at REAL NOT NULL,
+            last_error TEXT,
+            created_at REAL NOT NULL
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_outbox_status_next ON notification_outbox (status, next_attempt_at)')
+
+# Kolom reminders yang perubahannya menaikkan versi (semua kecuali id dan version itu sendiri)
+VERSIONED_REMINDER_COLUMNS = 'user_id, event, metadata, datetime, repeat_type, repeat_interval, notified, due_at'
+
+def _bump_user_version_sql(user_expr):
+    return f'''
+            INSERT OR IGNORE INTO user_versions (user_id, version) VALUES ({user_expr}, 0);
+            UPDATE user_versions SET version = version + 1 WHERE user_id = {user_expr};
+    '''
+
+def _create_version_update_trigger(conn, columns):
+    conn.executescript(f'''
+        CREATE TRIGGER IF NOT EXISTS trg_reminders_version_update AFTER UPDATE OF {columns} ON reminders BEGIN
+            {_bump_user_version_sql('NEW.user_id')}
+            UPDATE reminders SET version = (SELECT version FROM user_versions WHERE user_id = NEW.user_id) WHERE id = NEW.id;
+        END;
+    ''')
+
+def _create_change_versions(conn):
+    # Versi perubahan per user untuk sinkronisasi delta (/sync_reminders) dan ETag.
+    # Dipelihara oleh trigger agar semua jalur tulis (endpoint, scheduler, impor) ikut tercatat.
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(reminders)')]
+    if 'version' not in columns:
+        conn.execute('ALTER TABLE reminders ADD COLUMN version INTEGER NOT NULL DEFAULT 0')
+    conn.executescript(f'''
+        CREATE TABLE IF NOT EXISTS user_versions (
+            user_id TEXT PRIMARY KEY,
+            version INTEGER NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS reminder_tombstones (
+            user_id TEXT NOT NULL,
+            reminder_id INTEGER NOT NULL,
+            version INTEGER NOT NULL,
+            deleted_at REAL NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_reminders_user_version ON reminders (user_id, version);
+        CREATE INDEX IF NOT EXISTS idx_tombstones_user_version ON reminder_tombstones (user_id, version);
+
+        CREATE TRIGGER IF NOT EXISTS trg_reminders_version_insert AFTER INSERT ON reminders BEGIN
+            {_bump_user_version_sql('NEW.user_id')}
+            UPDATE reminders SET version = (SELECT version FROM user_versions WHERE user_id = NEW.user_id) WHERE id = NEW.id;
+        END;
+        CREATE TRIGGER IF NOT EXISTS trg_reminders_version_delete AFTER DELETE ON reminders BEGIN
+            {_bump_user_version_sql('OLD.user_id')}
+            INSERT INTO reminder_tombstones (user_id, reminder_id, version, deleted_at)
+                VALUES (OLD.user_id, OLD.id, (SELECT version FROM user_versions WHERE user_id = OLD.user_id), CAST(strftime('%s', 'now') AS INTEGER));
+        END;
+    ''')
+    _create_version_update_trigger(conn, VERSIONED_REMINDER_COLUMNS)
+
+def _create_user_status_index(conn):
+    # /get_reminders?status=upcoming|done: range scan langsung per status, tetap terurut due_at
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_reminders_user_notified_due ON reminders (user_id, notified, due_at)')
+
+def _create_user_recurring_index(conn):
+    # Partial index: kalender bulanan mengambil seri berulang yang dimulai sebelum jendela
+    # tanpa memindai semua pengingat sekali jalan yang sudah lewat
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_reminders_user_recurring_due ON reminders (user_id, due_at) WHERE repeat_type != 'none'")
+
+def _promote_metadata_columns(conn):
+    # Field metadata utama jadi kolom bertipe; kolom metadata hanya menyimpan sisanya (lihat reminder_metadata.py)
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(reminders)')]
+    for column in METADATA_COLUMNS:
+        if column not in columns:
+            conn.execute(f'ALTER TABLE reminders ADD COLUMN {column} TEXT')
+    # Pemindahan data tidak mengubah isi pengingat: trigger versi dilepas dulu agar klien tidak sinkron ulang,
+    # lalu dipasang kembali dengan daftar kolom baru
+    conn.execute('DROP TRIGGER IF EXISTS trg_reminders_version_update')
     conn.commit()
-    conn.close()
-    print("Database initialized successfully.")
+    last_id = 0
+    while True:
+        rows = conn.execute('SELECT id, metadata FROM reminders WHERE id > ? AND metadata IS NOT NULL ORDER BY id LIMIT ?',
+                            (last_id, BACKFILL_BATCH_SIZE)).fetchall()
+        if not rows:
+            break
+        updates = []
+        for reminder_id, metadata_json in rows:
+            try:
+                metadata = json.loads(metadata_json)
+            except ValueError:
+                metadata = None
+            if isinstance(metadata, dict):
+                updates.append(split_metadata(metadata) + (reminder_id,))
+        conn.executemany(f"UPDATE reminders SET {', '.join(f'{column} = ?' for column in METADATA_COLUMNS)}, metadata = ? WHERE id = ?",
+                         updates)
+        conn.commit()
+        last_id = rows[-1][0]
+    _create_version_update_trigger(conn, f"{VERSIONED_REMINDER_COLUMNS}, {', '.join(METADATA_COLUMNS)}")
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_reminders_user_activity_due ON reminders (user_id, activity_type, due_at)')
+
+def _create_user_shards_table(conn):
+    # Hanya dipakai di DATABASE (shard 0): user yang dipindah rebalance_shards ke shard selain hash-nya
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS user_shards (
+            user_id TEXT PRIMARY KEY,
+            shard INTEGER NOT NULL
+        )
+    ''')
+
+def _create_archive_table_in(conn, schema):
+    # Pengingat sekali jalan yang sudah lewat dipindah ke sini oleh compaction.py; id asli dipertahankan
+    # (AUTOINCREMENT tidak pernah memakai ulang id) sehingga riwayat tetap bisa dirujuk
+    metadata_columns = ',\n            '.join(f'{column} TEXT' for column in METADATA_COLUMNS)
+    conn.execute(f'''
+        CREATE TABLE IF NOT EXISTS {schema}.reminders_archive (
+            id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            event TEXT NOT NULL,
+            metadata TEXT,
+            datetime TEXT NOT NULL,
+            repeat_type TEXT,
+            repeat_interval INTEGER,
+            notified BOOLEAN,
+            due_at INTEGER,
+            {metadata_columns},
+            archived_at REAL NOT NULL     -- Detik epoch (time.time())
+        )
+    ''')
+    conn.execute(f'CREATE INDEX IF NOT EXISTS {schema}.idx_archive_user_due ON reminders_archive (user_id, due_at)')
+
+def _create_archive_table(conn):
+    _create_archive_table_in(conn, 'main')
+    # Tombstone lama dipangkas; klien dengan `since` di bawah pruned_version harus sinkron penuh
+    columns = [row[1] for row in conn.execute('PRAGMA table_info(user_versions)')]
+    if 'pruned_version' not in columns:
+        conn.execute('ALTER TABLE user_versions ADD COLUMN pruned_version INTEGER NOT NULL DEFAULT 0')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_tombstones_deleted_at ON reminder_tombstones (deleted_at)')
+
+def _enable_incremental_vacuum(conn):
+    # auto_vacuum hanya berubah lewat VACUUM penuh (sekali, saat init_db); sesudahnya halaman kosong
+    # dikembalikan sedikit demi sedikit dengan PRAGMA incremental_vacuum oleh compaction.py
+    if conn.execute('PRAGMA auto_vacuum').fetchone()[0] != 2:
+        conn.commit()
+        conn.execute('PRAGMA auto_vacuum = INCREMENTAL')
+        conn.execute('VACUUM')
+
+def _create_due_events_table(conn):
+    # Event "due" untuk /events: ditulis scheduler dalam transaksi yang sama dengan advance_many, lalu dibaca
+    # watcher EventBroker di setiap worker web untuk rentang versi user yang baru dilihatnya. Umurnya pendek
+    # (DUE_EVENTS_RETENTION_SECONDS), dipangkas oleh scheduler sendiri.
+    conn.execute('''
+        CREATE TABLE IF NOT EXISTS due_events (
+            id INTEGER PRIMARY KEY,
+            user_id TEXT NOT NULL,
+            reminder_id INTEGER NOT NULL,
+            event TEXT NOT NULL,
+            datetime TEXT NOT NULL,
+            version INTEGER NOT NULL,     -- Versi user setelah pemajuan yang memicu event ini
+            created_at REAL NOT NULL      -- Detik epoch (time.time())
+        )
+    ''')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_due_events_user_version ON due_events (user_id, version)')
+    conn.execute('CREATE INDEX IF NOT EXISTS idx_due_events_created_at ON due_events (created_at)')
+
+def _move_archive_to_own_file(conn):
+    # Arsip di file yang sama dengan reminders membuat pemadatan tidak pernah mengecilkan file: halaman yang
+    # dibebaskan dari reminders langsung dipakai lagi oleh baris arsip. Di file sendiri (archive_path,
+    # di-ATTACH oleh connect), halaman itu kembali ke sistem file lewat incremental_vacuum.
+    _create_archive_table_in(conn, 'archive')
+    if conn.execute("SELECT 1 FROM main.sqlite_master WHERE type = 'table' AND name = 'reminders_archive'").fetchone():
+        columns = ', '.join(row[1] for row in conn.execute('PRAGMA main.table_info(reminders_archive)'))
+        conn.execute(f'INSERT OR IGNORE INTO archive.reminders_archive ({columns}) SELECT {columns} FROM main.reminders_archive')
+        conn.execute('DROP TABLE main.reminders_archive')
+
+MIGRATIONS = [
+    (1, _create_reminders_table),
+    (2, _add_due_at_column),
+    (3, _create_due_indexes),
+    (4, _create_scheduler_lease_table),
+    (5, _create_notification_outbox_table),
+    (6, _create_change_versions),
+    (7, _create_user_status_index),
+    (8, _create_user_recurring_index),
+    (9, _promote_metadata_columns),
+    (10, _create_user_shards_table),
+    (11, _create_archive_table),
+    (12, _enable_incremental_vacuum),
+    (13, _create_due_events_table),
+    (14, _move_archive_to_own_file),
+]
+
+def get_schema_version(conn):
+    return conn.execute('PRAGMA user_version').fetchone()[0]
+
+def migrate(conn):
+    """Jalankan semua migrasi yang belum diterapkan, berurutan. Mengembalikan versi akhir."""
+    version = get_schema_version(conn)
+    for target_version, migration in MIGRATIONS:
+        if target_version <= version:
+            continue
+        migration(conn)
+        conn.execute(f'PRAGMA user_version = {target_version}')
+        conn.commit()
+        version = target_version
+    return version
+
+@contextlib.contextmanager
+def migration_lock(path):
+    """
+    Kunci file antarproses selama migrasi satu file: perintah migrasi yang berjalan bersamaan (mis. beberapa
+    kontainer yang start serentak) bergiliran, dan yang datang belakangan membaca user_version yang sudah terbaru.
+    """
+    if fcntl is None:
+        yield
+        return
+    with open(f'{path}.migrate-lock', 'a') as lock_file:
+        fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def init_db(shard_count=None):
+    """
+    Migrasikan DATABASE dan semua file shard (DB_SHARDS). Idempoten dan aman dijalankan paralel.
+    Dijalankan sebagai langkah tersendiri (`python -m database`) sebelum gunicorn, bukan saat worker boot:
+    migrasi tertentu (VACUUM penuh, backfill metadata) bisa jauh melebihi timeout worker.
+    """
+    paths = shard_paths(DATABASE, shard_count)
+    for path in paths:
+        with migration_lock(path):
+            conn = connect(path)
+            version = migrate(conn)
+            conn.close()
+    shards_note = f", {len(paths)} shards" if len(paths) > 1 else ""
+    print(f"Database initialized successfully (schema version {version}{shards_note}).")
+
+def check_schema(shard_count=None):
+    """Pastikan DATABASE dan semua shard sudah di versi skema terbaru; RuntimeError bila belum (tanpa migrasi)."""
+    latest_version = MIGRATIONS[-1][0]
+    for path in shard_paths(DATABASE, shard_count):
+        version = 0
+        if os.path.exists(path):
+            conn = connect(path)
+            try:
+                version = get_schema_version(conn)
+            finally:
+                conn.close()
+        if version < latest_version:
+            raise RuntimeError(f"Skema database {path} versi {version}, dibutuhkan versi {latest_version}. "
+                               "Jalankan `python -m database` terlebih dahulu.")
 
 if __name__ == '__main__':
     init_db()
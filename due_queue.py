@@ -0,0 +1,38 @@
+import heapq
+import threading
+
+DEFAULT_WINDOW_SIZE = 1000
+
+class DueQueue:
+    """
+    Min-heap (due_at, reminder_id) berisi pengingat terdekat yang belum dinotifikasi.
+    Scheduler memakainya untuk tidur sampai tenggat berikutnya, bukan polling interval tetap.
+    Entri yang sudah basi (dihapus/dimajukan) tidak berbahaya: saat jatuh tempo,
+    query `due_at <= now` ke database tidak akan mengembalikan apa-apa untuknya.
+    """
+
+    def __init__(self, window_size=DEFAULT_WINDOW_SIZE):
+        self.window_size = window_size
+        self._heap = []
+        self._lock = threading.Lock()
+
+    def reload(self, entries):
+        """Ganti isi heap dengan `window_size` tenggat terdekat (pasangan (due_at, id) terurut, lihat ReminderStore.next_due)."""
+        # Daftar yang sudah terurut sudah memenuhi sifat heap
+        heap = list(entries)[:self.window_size]
+        with self._lock:
+            self._heap = heap
+
+    def push_many(self, entries):
+        """Tambah banyak entri (due_at, reminder_id). Mengembalikan tenggat paling awal setelahnya."""
+        with self._lock:
+            for entry in entries:
+                heapq.heappush(self._heap, entry)
+            return self._heap[0][0] if self._heap else None
+
+    def next_due_at(self):
+        with self._lock:
+            return self._heap[0][0] if self._heap else None
+
+    def __len__(self):
+        return len(self._heap)
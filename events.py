@@ -0,0 +1,139 @@
+import json
+import os
+import queue
+import threading
+
+# --- Pub/Sub Perubahan Pengingat untuk Server-Sent Events ---
+# Broker in-process: setiap koneksi /events punya satu antrean kecil. Endpoint tambah/hapus dan
+# scheduler memanggil notify_changed(); thread watcher lalu membaca versi (store.user_versions) untuk user yang
+# sedang berlangganan (SATU query per putaran untuk semua koneksi, bukan satu per tab) dan mengirim
+# event "changed" bila versinya naik. Karena sumbernya tabel user_versions, perubahan yang ditulis
+# worker atau proses scheduler lain juga sampai, paling lambat EVENTS_POLL_SECONDS kemudian.
+# Event "due" (pengingat jatuh tempo) menempuh jalur yang sama: scheduler menyimpannya di tabel due_events
+# bersama versi user sesudah pemajuan, dan watcher setiap proses mengambil event dalam rentang versi yang
+# baru dilihatnya, sehingga pelanggan di worker web mana pun menerimanya (scheduler bisa di proses lain).
+EVENTS_POLL_SECONDS = float(os.environ.get('EVENTS_POLL_SECONDS', 2))
+EVENTS_HEARTBEAT_SECONDS = float(os.environ.get('EVENTS_HEARTBEAT_SECONDS', 25))
+EVENTS_RETRY_MS = int(os.environ.get('EVENTS_RETRY_MS', 3000))
+# Antrean per koneksi; klien yang terlalu lambat kehilangan event lama, bukan memblokir broker
+EVENTS_QUEUE_SIZE = int(os.environ.get('EVENTS_QUEUE_SIZE', 32))
+
+def format_sse(event_type, data):
+    return f"event: {event_type}\ndata: {json.dumps(data)}\n\n"
+
+class Subscription:
+    def __init__(self, user_id, maxsize=EVENTS_QUEUE_SIZE):
+        self.user_id = user_id
+        self._queue = queue.Queue(maxsize=maxsize)
+
+    def put(self, message):
+        try:
+            self._queue.put_nowait(message)
+        except queue.Full:
+            # Buang event tertua; "changed" berikutnya tetap membuat klien sinkron ulang
+            try:
+                self._queue.get_nowait()
+            except queue.Empty:
+                pass
+            try:
+                self._queue.put_nowait(message)
+            except queue.Full:
+                # Pengirim lain mengisi slot yang baru dikosongkan; event ini boleh hilang (lihat di atas)
+                pass
+
+    def get(self, timeout):
+        """Pesan SSE berikutnya, atau None bila tidak ada apa-apa selama `timeout` detik."""
+        try:
+            return self._queue.get(timeout=timeout)
+        except queue.Empty:
+            return None
+
+class EventBroker:
+    def __init__(self, store, poll_seconds=EVENTS_POLL_SECONDS):
+        self.store = store
+        self.poll_seconds = poll_seconds
+        self._subscribers = {}     # user_id -> set(Subscription)
+        self._versions = {}        # user_id -> versi terakhir yang sudah dikirim
+        self._lock = threading.Lock()
+        self._wake_event = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def subscribe(self, user_id, version):
+        subscription = Subscription(user_id)
+        with self._lock:
+            self._subscribers.setdefault(user_id, set()).add(subscription)
+            self._versions.setdefault(user_id, version)
+        self._ensure_watcher()
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self._lock:
+            subscribers = self._subscribers.get(subscription.user_id)
+            if subscribers is None:
+                return
+            subscribers.discard(subscription)
+            if not subscribers:
+                del self._subscribers[subscription.user_id]
+                self._versions.pop(subscription.user_id, None)
+
+    def subscriber_count(self):
+        with self._lock:
+            return sum(len(subscribers) for subscribers in self._subscribers.values())
+
+    def publish(self, user_id, event_type, data):
+        """Kirim event ke semua koneksi user ini di proses ini."""
+        with self._lock:
+            subscribers = list(self._subscribers.get(user_id, ()))
+        if not subscribers:
+            return
+        message = format_sse(event_type, data)
+        for subscription in subscribers:
+            subscription.put(message)
+
+    def notify_changed(self):
+        """Dipanggil setelah commit yang mengubah reminders: watcher langsung memeriksa versi."""
+        self._wake_event.set()
+
+    # --- Watcher versi ---
+    def _ensure_watcher(self):
+        # Thread tidak ikut ter-fork ke worker gunicorn, jadi dicek per pid
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name='event-broker', daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            self._wake_event.wait(self.poll_seconds)
+            self._wake_event.clear()
+            try:
+                self.poll_versions()
+            except Exception as e:
+                print(f"Event broker gagal membaca versi: {e}")
+
+    def poll_versions(self):
+        """Kirim "due" lalu "changed" untuk setiap user berlangganan yang versinya naik sejak event terakhir."""
+        with self._lock:
+            user_ids = list(self._subscribers)
+        if not user_ids:
+            return
+        current = self.store.user_versions(user_ids)
+
+        version_ranges = {}
+        with self._lock:
+            for user_id, version in current.items():
+                if user_id in self._versions and version > self._versions[user_id]:
+                    version_ranges[user_id] = (self._versions[user_id], version)
+                    self._versions[user_id] = version
+        if not version_ranges:
+            return
+        for due_event in self.store.due_events_between(version_ranges):
+            user_id = due_event.pop('user_id')
+            self.publish(user_id, 'due', due_event)
+        for user_id, (_, version) in version_ranges.items():
+            self.publish(user_id, 'changed', {"version": version})
@@ -0,0 +1,64 @@
+from datetime import datetime
+import functools
+import re
+
+# --- Format Tanggal/Waktu untuk Serialisasi ---
+# Pengingat menumpuk di hari-hari yang sama, jadi bagian "tanggal + zona" dari teks tampilan
+# dihitung sekali per (tanggal, offset) lalu dipakai ulang; per baris hanya jam:menit yang disisipkan.
+DATETIME_FORMATTER_MAX_ENTRIES = 4096
+
+# String ISO kanonik hasil datetime.isoformat(): aman dipakai apa adanya tanpa parse ulang
+# (mikrodetik nol tidak pernah ditulis isoformat, jadi ".000000" sengaja tidak cocok)
+CANONICAL_ISO_RE = re.compile(r'^(\d{4}-\d{2}-\d{2})T(\d{2}:\d{2}):\d{2}(?:\.(?!0{6})\d{6})?([+-]\d{2}:\d{2})?$')
+
+@functools.lru_cache(maxsize=256)
+def timezone_abbreviation(tz_name):
+    if tz_name:
+        if "Western Indonesia Standard Time" in tz_name:
+            return "WIB"
+        elif "Central Indonesia Standard Time" in tz_name:
+            return "WITA"
+        elif "Eastern Indonesia Standard Time" in tz_name:
+            return "WIT"
+        return ""
+    return ""
+
+def format_timezone_display(dt_object):
+    return timezone_abbreviation(dt_object.tzname())
+
+def format_datetime_display(dt_object):
+    return dt_object.strftime(f'%d %B %Y %H:%M {format_timezone_display(dt_object)}')
+
+class DatetimeFormatter:
+    def __init__(self, max_entries=DATETIME_FORMATTER_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._day_parts = {}  # (tanggal, offset) -> (awalan "dd Bulan yyyy ", akhiran " zona")
+
+    def format(self, iso_string):
+        """String ISO tersimpan -> (datetime ISO untuk API, teks tampilan "dd Bulan yyyy HH:MM zona")."""
+        # Jalur cepat untuk bentuk yang ditulis aplikasi: "YYYY-MM-DDTHH:MM:SS+HH:MM" (25 karakter)
+        if len(iso_string) == 25 and iso_string[10] == 'T' and iso_string[19] in '+-':
+            date, hour_minute, offset = iso_string[:10], iso_string[11:16], iso_string[19:]
+        else:
+            match = CANONICAL_ISO_RE.match(iso_string)
+            if match is None:
+                dt_object = datetime.fromisoformat(iso_string)
+                return dt_object.isoformat(), format_datetime_display(dt_object)
+            date, hour_minute, offset = match.groups()
+        parts = self._day_parts.get((date, offset))
+        if parts is None:
+            dt_object = datetime.fromisoformat(iso_string)
+            parts = (dt_object.strftime('%d %B %Y '), ' ' + format_timezone_display(dt_object))
+            if len(self._day_parts) >= self.max_entries:
+                self._day_parts.clear()
+            self._day_parts[(date, offset)] = parts
+        return iso_string, parts[0] + hour_minute + parts[1]
+
+    def date_string(self, iso_string):
+        """Tanggal 'YYYY-MM-DD' pada offset tersimpan."""
+        match = CANONICAL_ISO_RE.match(iso_string)
+        if match is None:
+            return datetime.fromisoformat(iso_string).strftime('%Y-%m-%d')
+        return match.group(1)
+
+DATETIME_FORMATTER = DatetimeFormatter()
@@ -0,0 +1,55 @@
+import os
+import socket
+import time
+import uuid
+
+from database import get_pool, run_with_lock_retry
+
+# --- Pemilihan Leader Scheduler lewat Lease di SQLite ---
+# Setiap proses (worker gunicorn atau scheduler_worker) mencoba memperbarui lease secara berkala.
+# Hanya pemegang lease yang menjalankan loop pengingat jatuh tempo; jika leader mati, lease-nya
+# kedaluwarsa dalam LEASE_TTL_SECONDS dan proses lain mengambil alih pada heartbeat berikutnya.
+LEASE_TTL_SECONDS = float(os.environ.get('SCHEDULER_LEASE_TTL_SECONDS', 10))
+LEASE_RENEW_SECONDS = float(os.environ.get('SCHEDULER_LEASE_RENEW_SECONDS', 3))
+SCHEDULER_LEASE_NAME = 'check_reminders'
+
+class LeaderLease:
+    def __init__(self, database_path, name=SCHEDULER_LEASE_NAME, ttl_seconds=LEASE_TTL_SECONDS):
+        self.database_path = database_path
+        self.name = name
+        self.ttl_seconds = ttl_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self.is_leader = False
+
+    def _execute(self, query, args):
+        pool = get_pool(self.database_path)
+        conn = pool.acquire()
+        try:
+            with conn:
+                return conn.execute(query, args).rowcount
+        finally:
+            pool.release(conn)
+
+    def try_acquire(self):
+        """Ambil atau perpanjang lease. Berhasil jika lease kosong, kedaluwarsa, atau sudah milik kita."""
+        now = time.time()
+        try:
+            acquired = run_with_lock_retry(self._execute, '''
+                INSERT INTO scheduler_lease (name, holder, expires_at) VALUES (?, ?, ?)
+                ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at
+                WHERE scheduler_lease.holder = excluded.holder OR scheduler_lease.expires_at < ?
+            ''', (self.name, self.holder, now + self.ttl_seconds, now)) > 0
+        except Exception as e:
+            # Gagal memperbarui = anggap bukan leader lagi, agar tidak ada dua leader sekaligus
+            print(f"Gagal memperbarui lease scheduler: {e}")
+            acquired = False
+        self.is_leader = acquired
+        return acquired
+
+    def release(self):
+        if self.is_leader:
+            self.is_leader = False
+            try:
+                self._execute('DELETE FROM scheduler_lease WHERE name = ? AND holder = ?', (self.name, self.holder))
+            except Exception as e:
+                print(f"Gagal melepas lease scheduler: {e}")
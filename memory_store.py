@@ -0,0 +1,289 @@
+import bisect
+import collections
+import heapq
+import threading
+import time
+from datetime import datetime, timedelta
+
+from database import datetime_to_epoch
+from notifications import MemoryOutbox
+from reminder_store import ARCHIVE_COLUMNS, DUE_EVENTS_RETENTION_SECONDS, FILTER_COLUMNS, REMINDER_RECORD_COLUMNS, ReminderStore
+
+# --- Engine Penyimpanan In-Memory ---
+# Per user: array (due_at, id) yang selalu terurut (bisect), sehingga daftar, halaman keyset dan
+# rentang bulan cukup dipotong dari array tanpa sort. Global: min-heap (due_at, id) untuk scheduler;
+# entri basi (dihapus, dimajukan, sudah dinotifikasi) dibuang saat muncul di puncak heap.
+# Versi per user dan tombstone mengikuti semantik trigger SQLite (naik satu per baris yang berubah),
+# jadi ETag, /sync_reminders dan /events bekerja sama persis. Data hilang saat proses berhenti.
+
+
+class MemoryReminderStore(ReminderStore):
+    def __init__(self):
+        self._rows = {}          # id -> dict baris (kolom REMINDER_RECORD_COLUMNS + id + version)
+        self._keys = {}          # user_id -> [(due_at, id), ...] terurut
+        self._due_heap = []      # (due_at, id) untuk baris notified = 0
+        self._versions = {}      # user_id -> versi
+        self._tombstones = {}    # user_id -> [(versi, id, deleted_at), ...]
+        self._pruned_versions = {}  # user_id -> versi tombstone terbaru yang sudah dipangkas
+        self._archive = {}       # user_id -> [(due_at, id, baris), ...] terurut
+        self._due_events = collections.deque()  # (created_at, user_id, versi, event), terlama dulu
+        self._next_id = 1
+        self._outbox = MemoryOutbox()
+        self._lock = threading.RLock()
+
+    def _bump_version(self, user_id):
+        version = self._versions.get(user_id, 0) + 1
+        self._versions[user_id] = version
+        return version
+
+    def _touch(self, row):
+        row['version'] = self._bump_version(row['user_id'])
+
+    def add_many(self, user_id, rows):
+        ids = []
+        with self._lock:
+            for values in rows:
+                row = dict(zip(REMINDER_RECORD_COLUMNS, values))
+                row['id'] = self._next_id
+                self._next_id += 1
+                self._touch(row)
+                self._rows[row['id']] = row
+                bisect.insort(self._keys.setdefault(row['user_id'], []), (row['due_at'], row['id']))
+                if not row['notified']:
+                    heapq.heappush(self._due_heap, (row['due_at'], row['id']))
+                ids.append(row['id'])
+        return ids
+
+    def _user_rows(self, user_id, start, end):
+        """Salinan baris user dengan indeks array start:end (salinan: aman dibaca di luar lock)."""
+        with self._lock:
+            keys = self._keys.get(user_id, [])[start:end]
+            return [dict(self._rows[reminder_id]) for _, reminder_id in keys]
+
+    def list_by_user(self, user_id, columns=None, status='all', filters=None, after=None, limit=None):
+        filters = filters or {}
+        for column in filters:
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Filter tidak dikenal: {column}")
+        with self._lock:
+            keys = self._keys.get(user_id, [])
+            # (due_at, id) terurut, jadi posisi setelah cursor didapat langsung dengan bisect
+            start = bisect.bisect_right(keys, tuple(after)) if after is not None else 0
+            unfiltered = status == 'all' and not filters
+            keys = keys[start:start + limit] if unfiltered and limit is not None else keys[start:]
+        return self._iterate(keys, status, filters, limit)
+
+    def _iterate(self, keys, status, filters, limit):
+        # Baris disalin satu per satu saat dibaca; yang terhapus setelah snapshot kunci dilewati
+        emitted = 0
+        for _, reminder_id in keys:
+            if limit is not None and emitted >= limit:
+                return
+            row = self._rows.get(reminder_id)
+            if row is None:
+                continue
+            if status == 'upcoming' and row['notified'] or status == 'done' and not row['notified']:
+                continue
+            if any(row[column] != value for column, value in filters.items()):
+                continue
+            emitted += 1
+            yield dict(row)
+
+    def range_by_user(self, user_id, start_epoch, end_epoch, columns=None):
+        with self._lock:
+            keys = self._keys.get(user_id, [])
+            start = bisect.bisect_left(keys, (start_epoch,))
+            end = bisect.bisect_left(keys, (end_epoch,))
+            return self._user_rows(user_id, start, end)
+
+    def recurring_before(self, user_id, epoch, columns=None):
+        with self._lock:
+            end = bisect.bisect_left(self._keys.get(user_id, []), (epoch,))
+            return [row for row in self._user_rows(user_id, 0, end) if row['repeat_type'] != 'none']
+
+    def changes_since(self, user_id, since):
+        with self._lock:
+            if since < self._pruned_versions.get(user_id, 0):
+                since = 0
+            changed = [row for row in self._user_rows(user_id, 0, None) if row['version'] > since]
+            deleted = [reminder_id for version, reminder_id, _ in self._tombstones.get(user_id, []) if version > since] if since > 0 else []
+        return changed, deleted, since == 0
+
+    def user_version(self, user_id):
+        with self._lock:
+            return self._versions.get(user_id, 0)
+
+    def user_versions(self, user_ids):
+        with self._lock:
+            return {user_id: self._versions[user_id] for user_id in user_ids if user_id in self._versions}
+
+    def delete(self, user_id, reminder_id):
+        with self._lock:
+            row = self._rows.get(reminder_id)
+            if row is None or row['user_id'] != user_id:
+                return 0
+            self._remove(row)
+            return 1
+
+    def delete_many(self, user_id, reminder_ids):
+        with self._lock:
+            rows = self._owned_rows(user_id, reminder_ids)
+            for row in rows:
+                self._remove(row)
+            return len(rows)
+
+    def delete_matching(self, user_id, status='all', filters=None, start_epoch=None, end_epoch=None):
+        filters = filters or {}
+        for column in filters:
+            if column not in FILTER_COLUMNS:
+                raise ValueError(f"Filter tidak dikenal: {column}")
+        with self._lock:
+            keys = self._keys.get(user_id, [])
+            start = bisect.bisect_left(keys, (start_epoch,)) if start_epoch is not None else 0
+            end = bisect.bisect_left(keys, (end_epoch,)) if end_epoch is not None else len(keys)
+            rows = [self._rows[reminder_id] for _, reminder_id in keys[start:end]]
+            rows = [row for row in rows if not (status == 'upcoming' and row['notified'] or status == 'done' and not row['notified'])
+                    and all(row[column] == value for column, value in filters.items())]
+            for row in rows:
+                self._remove(row)
+            return len(rows)
+
+    def reschedule_many(self, user_id, reminder_ids, new_datetime):
+        datetime_iso, due_at = new_datetime.isoformat(), datetime_to_epoch(new_datetime)
+        with self._lock:
+            rows = self._owned_rows(user_id, reminder_ids)
+            for row in rows:
+                self._move(row, datetime_iso, due_at)
+            return len(rows)
+
+    def snooze_many(self, user_id, reminder_ids, seconds, now_local):
+        # Sama dengan SNOOZE_SET_SQL: jam dinding digeser dengan offset yang tersimpan di teks ISO
+        now_epoch = int(now_local.timestamp())
+        snoozed_from_now = datetime.fromtimestamp(now_epoch + seconds, now_local.tzinfo).isoformat()
+        with self._lock:
+            rows = self._owned_rows(user_id, reminder_ids)
+            for row in rows:
+                if row['due_at'] < now_epoch:
+                    self._move(row, snoozed_from_now, now_epoch + seconds)
+                else:
+                    shifted = datetime.fromisoformat(row['datetime']) + timedelta(seconds=seconds)
+                    self._move(row, shifted.isoformat(), row['due_at'] + seconds)
+            return len(rows)
+
+    def _owned_rows(self, user_id, reminder_ids):
+        rows = (self._rows.get(reminder_id) for reminder_id in dict.fromkeys(reminder_ids))
+        return [row for row in rows if row is not None and row['user_id'] == user_id]
+
+    def _move(self, row, datetime_iso, due_at):
+        """Pindahkan baris ke tenggat baru sebagai belum dinotifikasi (kunci terurut dan heap ikut diperbarui)."""
+        keys = self._keys[row['user_id']]
+        del keys[bisect.bisect_left(keys, (row['due_at'], row['id']))]
+        row.update(datetime=datetime_iso, due_at=due_at, notified=0)
+        self._touch(row)
+        bisect.insort(keys, (due_at, row['id']))
+        heapq.heappush(self._due_heap, (due_at, row['id']))
+
+    def _remove(self, row):
+        del self._rows[row['id']]
+        keys = self._keys[row['user_id']]
+        del keys[bisect.bisect_left(keys, (row['due_at'], row['id']))]
+        self._tombstones.setdefault(row['user_id'], []).append((self._bump_version(row['user_id']), row['id'], time.time()))
+
+    def _is_due_entry(self, due_at, reminder_id):
+        row = self._rows.get(reminder_id)
+        return row is not None and not row['notified'] and row['due_at'] == due_at
+
+    def due_before(self, epoch, limit):
+        with self._lock:
+            # Ambil dari puncak heap lalu kembalikan lagi: baris tetap jatuh tempo sampai advance_many
+            popped = []
+            while self._due_heap and len(popped) < limit and self._due_heap[0][0] <= epoch:
+                entry = heapq.heappop(self._due_heap)
+                if self._is_due_entry(*entry):
+                    popped.append(entry)
+            for entry in popped:
+                heapq.heappush(self._due_heap, entry)
+            return [dict(self._rows[reminder_id]) for _, reminder_id in popped]
+
+    def advance_many(self, notified_rows, advanced_rows, outbox_rows=(), due_events=()):
+        with self._lock:
+            advanced = set()
+            for reminder_id, read_due_at in notified_rows:
+                if self._is_due_entry(read_due_at, reminder_id):
+                    row = self._rows[reminder_id]
+                    row['notified'] = 1
+                    self._touch(row)
+                    advanced.add(reminder_id)
+            for datetime_iso, due_at, reminder_id, read_due_at in advanced_rows:
+                if self._is_due_entry(read_due_at, reminder_id):
+                    self._move(self._rows[reminder_id], datetime_iso, due_at)
+                    advanced.add(reminder_id)
+            self._outbox.add_many([row for row in outbox_rows if row[0] in advanced])
+            for user_id, reminder_id, event, scheduled_for, created_at in due_events:
+                if reminder_id not in advanced:
+                    continue
+                self._due_events.append((created_at, user_id, self._versions.get(user_id, 0),
+                                         {'user_id': user_id, 'id': reminder_id, 'event': event, 'datetime': scheduled_for}))
+            cutoff = time.time() - DUE_EVENTS_RETENTION_SECONDS
+            while self._due_events and self._due_events[0][0] < cutoff:
+                self._due_events.popleft()
+            return advanced
+
+    def due_events_between(self, version_ranges):
+        with self._lock:
+            return [dict(event) for _, user_id, version, event in self._due_events
+                    if user_id in version_ranges and version_ranges[user_id][0] < version <= version_ranges[user_id][1]]
+
+    def next_due(self, limit):
+        with self._lock:
+            # Buang entri basi di puncak agar heap tidak tumbuh tanpa batas
+            while self._due_heap and not self._is_due_entry(*self._due_heap[0]):
+                heapq.heappop(self._due_heap)
+            # Entri basi yang tersisa di dalam heap hanya membuat scheduler bangun lebih awal (lihat DueQueue)
+            return heapq.nsmallest(limit, self._due_heap)
+
+    def outboxes(self):
+        return [self._outbox]
+
+    def archive_completed(self, before_epoch, limit):
+        with self._lock:
+            # Tanpa indeks sekunder: pindai semua baris (engine ini untuk data yang muat di memori)
+            candidates = sorted((row['due_at'], row['id']) for row in self._rows.values()
+                                if row['notified'] and row['repeat_type'] == 'none' and row['due_at'] < before_epoch)[:limit]
+            archived_at = time.time()
+            user_ids = []
+            for due_at, reminder_id in candidates:
+                row = self._rows[reminder_id]
+                self._remove(row)
+                archived = {column: row[column] for column in ARCHIVE_COLUMNS}
+                archived['archived_at'] = archived_at
+                bisect.insort(self._archive.setdefault(row['user_id'], []), (due_at, reminder_id, archived))
+                user_ids.append(row['user_id'])
+            return user_ids
+
+    def archived_by_user(self, user_id, before=None, limit=None):
+        with self._lock:
+            entries = self._archive.get(user_id, [])
+            end = bisect.bisect_left(entries, tuple(before)) if before is not None else len(entries)
+            start = max(0, end - limit) if limit is not None else 0
+            return [dict(archived) for _, _, archived in reversed(entries[start:end])]
+
+    def prune_tombstones(self, before_timestamp, limit):
+        pruned = 0
+        with self._lock:
+            for user_id, tombstones in self._tombstones.items():
+                kept = []
+                for tombstone in tombstones:
+                    if tombstone[2] < before_timestamp and pruned < limit:
+                        self._pruned_versions[user_id] = max(tombstone[0], self._pruned_versions.get(user_id, 0))
+                        pruned += 1
+                    else:
+                        kept.append(tombstone)
+                tombstones[:] = kept
+        return pruned
+
+    def storage_stats(self):
+        with self._lock:
+            return {'reminders': len(self._rows), 'archived': sum(len(entries) for entries in self._archive.values()),
+                    'tombstones': sum(len(tombstones) for tombstones in self._tombstones.values()),
+                    'file_bytes': 0, 'free_bytes': 0, 'archive_bytes': 0}
@@ -0,0 +1,199 @@
+import bisect
+import os
+import threading
+import time
+
+# --- Metrik (format teks Prometheus) ---
+# Counter dan histogram sederhana tanpa dependensi tambahan, dirender oleh endpoint /metrics.
+# Registry ada per proses: dengan beberapa worker gunicorn, scrape setiap worker (atau gunakan satu
+# worker per target); parse yang berjalan di process pool (PARALLEL_PARSE) tidak ikut tercatat.
+METRICS_ENABLED = os.environ.get('METRICS', '1') == '1'
+
+# Bucket (detik) untuk latensi request dan putaran scheduler
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+# Tahap parser berlangsung dalam orde mikrodetik
+PARSER_STAGE_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2)
+DUE_ROWS_BUCKETS = (0, 1, 5, 10, 50, 100, 500, 1000, 5000, 10000)
+LAG_BUCKETS = (0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0, 60.0, 300.0, 3600.0)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(pairs):
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{name}="{_escape(value)}"' for name, value in pairs) + '}'
+
+
+def _format_number(value):
+    if value == float('inf'):
+        return '+Inf'
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    kind = None
+
+    def __init__(self, name, documentation, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._children = {}
+        self._lock = threading.Lock()
+
+    def labels(self, *values):
+        """Anak metrik untuk satu kombinasi nilai label (disimpan, jadi aman dipanggil per observasi)."""
+        child = self._children.get(values)
+        if child is None:
+            if len(values) != len(self.labelnames):
+                raise ValueError(f"{self.name} membutuhkan label {self.labelnames}")
+            with self._lock:
+                child = self._children.setdefault(values, self._new_child())
+        return child
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, child in sorted(self._children.items()):
+            lines.extend(child.render(self.name, list(zip(self.labelnames, values))))
+        return lines
+
+
+class _CounterChild:
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1):
+        with self._lock:
+            self.value += amount
+
+    def render(self, name, label_pairs):
+        return [f"{name}{_format_labels(label_pairs)} {_format_number(self.value)}"]
+
+
+class Counter(_Metric):
+    kind = 'counter'
+
+    def _new_child(self):
+        return _CounterChild()
+
+    def inc(self, amount=1):
+        self.labels().inc(amount)
+
+
+class _HistogramChild:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)  # slot terakhir: +Inf
+        self.sum = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[index] += 1
+            self.sum += value
+
+    def render(self, name, label_pairs):
+        with self._lock:
+            counts, total = list(self.counts), self.sum
+        lines = []
+        cumulative = 0
+        for bound, count in zip(self.buckets + (float('inf'),), counts):
+            cumulative += count
+            lines.append(f"{name}_bucket{_format_labels(label_pairs + [('le', _format_number(bound))])} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(label_pairs)} {_format_number(total)}")
+        lines.append(f"{name}_count{_format_labels(label_pairs)} {cumulative}")
+        return lines
+
+
+class Histogram(_Metric):
+    kind = 'histogram'
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(float(bound) for bound in buckets)
+
+    def _new_child(self):
+        return _HistogramChild(self.buckets)
+
+    def observe(self, value):
+        self.labels().observe(value)
+
+
+class CallbackMetric:
+    """Metrik yang nilainya dibaca saat render: `read()` -> {(nilai label, ...): angka}. Tanpa biaya per kejadian."""
+
+    def __init__(self, name, documentation, kind, labelnames, read):
+        self.name = name
+        self.documentation = documentation
+        self.kind = kind
+        self.labelnames = tuple(labelnames)
+        self.read = read
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+        for values, value in sorted(self.read().items()):
+            lines.append(f"{self.name}{_format_labels(list(zip(self.labelnames, values)))} {_format_number(value)}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._metrics = {}
+        self._lock = threading.Lock()
+
+    def _register(self, metric):
+        with self._lock:
+            existing = self._metrics.get(metric.name)
+            if existing is not None:
+                return existing
+            self._metrics[metric.name] = metric
+            return metric
+
+    def counter(self, name, documentation, labelnames=()):
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def callback(self, name, documentation, kind, labelnames, read):
+        """Counter/gauge dari penghitung yang sudah ada (mis. statistik cache), dibaca saat scrape."""
+        return self._register(CallbackMetric(name, documentation, kind, labelnames, read))
+
+    def render(self):
+        """Seluruh metrik dalam format eksposisi teks Prometheus 0.0.4."""
+        lines = []
+        for name in sorted(self._metrics):
+            lines.extend(self._metrics[name].render())
+        return '\n'.join(lines) + '\n'
+
+
+REGISTRY = MetricsRegistry()
+
+HTTP_REQUEST_SECONDS = REGISTRY.histogram(
+    'http_request_duration_seconds', 'Durasi request HTTP sampai body selesai dikirim.', ('endpoint', 'method', 'status'))
+SCHEDULER_TICK_SECONDS = REGISTRY.histogram(
+    'scheduler_tick_duration_seconds', 'Durasi satu putaran check_reminders_job di leader.')
+SCHEDULER_DUE_ROWS = REGISTRY.histogram(
+    'scheduler_tick_due_rows', 'Jumlah pengingat jatuh tempo yang diproses per putaran.', buckets=DUE_ROWS_BUCKETS)
+SCHEDULER_LAG_SECONDS = REGISTRY.histogram(
+    'scheduler_lag_seconds', 'Keterlambatan pemrosesan pengingat terhadap waktu jatuh temponya.', buckets=LAG_BUCKETS)
+PARSER_STAGE_SECONDS = REGISTRY.histogram(
+    'parser_stage_duration_seconds', 'Durasi per tahap ScheduleParser.parse.', ('stage',), buckets=PARSER_STAGE_BUCKETS)
+
+
+class StageTimer:
+    """Tahap berurutan: lap(tahap) mencatat waktu sejak lap sebelumnya ke histogram berlabel stage."""
+    __slots__ = ('histogram', 'last')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+        self.last = time.perf_counter()
+
+    def lap(self, stage):
+        now = time.perf_counter()
+        self.histogram.labels(stage).observe(now - self.last)
+        self.last = now
@@ -0,0 +1,280 @@
+from concurrent.futures import ThreadPoolExecutor, wait
+import json
+import os
+import threading
+import time
+import urllib.request
+
+from database import get_pool, run_with_lock_retry
+
+# --- Pipeline Pengiriman Notifikasi ---
+# Scheduler hanya menulis ke tabel notification_outbox (dalam transaksi yang sama dengan pemajuan
+# pengingat). Dispatcher di thread terpisah mengklaim baris outbox, mengirimnya lewat sender yang
+# terdaftar dengan batas konkurensi dan rate limit per target, lalu mencatat hasilnya:
+# berhasil -> baris dihapus, gagal -> dicoba ulang dengan backoff, sampai NOTIFY_MAX_ATTEMPTS.
+NOTIFY_CONCURRENCY = int(os.environ.get('NOTIFY_CONCURRENCY', 8))
+NOTIFY_RATE_PER_SECOND = float(os.environ.get('NOTIFY_RATE_PER_SECOND', 50))
+NOTIFY_MAX_ATTEMPTS = int(os.environ.get('NOTIFY_MAX_ATTEMPTS', 5))
+NOTIFY_BACKOFF_SECONDS = float(os.environ.get('NOTIFY_BACKOFF_SECONDS', 2))
+NOTIFY_MAX_BACKOFF_SECONDS = float(os.environ.get('NOTIFY_MAX_BACKOFF_SECONDS', 300))
+# Baris yang sedang dikirim "dipesan" selama ini; jika proses mati di tengah jalan, baris dikirim ulang
+NOTIFY_CLAIM_TIMEOUT_SECONDS = float(os.environ.get('NOTIFY_CLAIM_TIMEOUT_SECONDS', 60))
+NOTIFY_IDLE_SECONDS = float(os.environ.get('NOTIFY_IDLE_SECONDS', 5))
+
+OUTBOX_INSERT_SQL = 'INSERT INTO notification_outbox (reminder_id, user_id, target, payload, status, attempts, next_attempt_at, created_at) VALUES (?, ?, ?, ?, \'pending\', 0, ?, ?)'
+
+
+class LogSender:
+    """Sender bawaan: hanya mencetak ke log (perilaku lama scheduler)."""
+
+    def send(self, payload):
+        print(f"Mengirim notifikasi (simulasi di log) untuk: {payload['event']} (User: {payload['user_id']}) pada {payload['datetime']}")
+
+
+class WebhookSender:
+    """POST payload JSON ke URL. Status HTTP selain 2xx dianggap gagal (akan dicoba ulang)."""
+
+    def __init__(self, url, timeout=5):
+        self.url = url
+        self.timeout = timeout
+
+    def send(self, payload):
+        req = urllib.request.Request(self.url, data=json.dumps(payload).encode('utf-8'),
+                                     headers={'Content-Type': 'application/json'}, method='POST')
+        with urllib.request.urlopen(req, timeout=self.timeout) as response:
+            if not 200 <= response.status < 300:
+                raise RuntimeError(f"Webhook membalas HTTP {response.status}")
+
+
+def senders_from_env():
+    """NOTIFY_WEBHOOK_URL diset -> kirim ke webhook; jika tidak, cukup log."""
+    webhook_url = os.environ.get('NOTIFY_WEBHOOK_URL')
+    if webhook_url:
+        return {'webhook': WebhookSender(webhook_url)}
+    return {'log': LogSender()}
+
+
+class TokenBucket:
+    def __init__(self, rate_per_second, burst=None):
+        self.rate = rate_per_second
+        self.capacity = burst or max(1.0, rate_per_second)
+        self.tokens = self.capacity
+        self.updated_at = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Blok sampai satu token tersedia."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+                self.updated_at = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait_seconds = (1 - self.tokens) / self.rate
+            time.sleep(wait_seconds)
+
+
+# --- Outbox ---
+# Dispatcher hanya butuh tiga operasi: claim, record, next_attempt_at. SQLiteOutbox memakai tabel
+# notification_outbox satu file database (satu per shard); MemoryOutbox dipakai engine in-memory.
+class SQLiteOutbox:
+    def __init__(self, path):
+        self.path = path
+
+    def _with_connection(self, fn):
+        pool = get_pool(self.path)
+        conn = pool.acquire()
+        try:
+            return run_with_lock_retry(fn, conn)
+        finally:
+            pool.release(conn)
+
+    def claim(self, batch_size):
+        """Pesan baris pending yang sudah waktunya: [(id, target, payload, attempts sebelum klaim), ...]."""
+        def claim(conn):
+            now = time.time()
+            # BEGIN IMMEDIATE: SELECT + UPDATE atomik, sehingga dua dispatcher tidak mengklaim baris yang sama
+            conn.execute('BEGIN IMMEDIATE')
+            try:
+                rows = conn.execute(
+                    "SELECT id, target, payload, attempts FROM notification_outbox WHERE status = 'pending' AND next_attempt_at <= ? ORDER BY next_attempt_at LIMIT ?",
+                    (now, batch_size)).fetchall()
+                conn.executemany('UPDATE notification_outbox SET attempts = attempts + 1, next_attempt_at = ? WHERE id = ?',
+                                 [(now + NOTIFY_CLAIM_TIMEOUT_SECONDS, row[0]) for row in rows])
+                conn.commit()
+            except Exception:
+                conn.rollback()
+                raise
+            return [tuple(row) for row in rows]
+        return self._with_connection(claim)
+
+    def record(self, sent_ids, retry_rows, failed_rows):
+        """sent_ids dihapus; retry_rows = (next_attempt_at, error, id); failed_rows = (error, id)."""
+        def record(conn):
+            with conn:
+                conn.executemany('DELETE FROM notification_outbox WHERE id = ?', [(outbox_id,) for outbox_id in sent_ids])
+                conn.executemany('UPDATE notification_outbox SET next_attempt_at = ?, last_error = ? WHERE id = ?', retry_rows)
+                conn.executemany("UPDATE notification_outbox SET status = 'failed', last_error = ? WHERE id = ?", failed_rows)
+        self._with_connection(record)
+
+    def next_attempt_at(self):
+        return self._with_connection(lambda conn: conn.execute(
+            "SELECT MIN(next_attempt_at) FROM notification_outbox WHERE status = 'pending'").fetchone()[0])
+
+
+class MemoryOutbox:
+    """Outbox di memori proses, dengan semantik yang sama (klaim bertenggat, retry, status failed)."""
+
+    def __init__(self):
+        self._rows = {}  # id -> dict
+        self._next_id = 1
+        self._lock = threading.Lock()
+
+    def add_many(self, rows):
+        """Baris dengan urutan kolom OUTBOX_INSERT_SQL."""
+        with self._lock:
+            for reminder_id, user_id, target, payload, next_attempt_at, created_at in rows:
+                self._rows[self._next_id] = {'reminder_id': reminder_id, 'user_id': user_id, 'target': target, 'payload': payload,
+                                             'status': 'pending', 'attempts': 0, 'next_attempt_at': next_attempt_at,
+                                             'last_error': None, 'created_at': created_at}
+                self._next_id += 1
+
+    def claim(self, batch_size):
+        now = time.time()
+        with self._lock:
+            ready = sorted((row['next_attempt_at'], outbox_id) for outbox_id, row in self._rows.items()
+                           if row['status'] == 'pending' and row['next_attempt_at'] <= now)[:batch_size]
+            claimed = []
+            for _, outbox_id in ready:
+                row = self._rows[outbox_id]
+                claimed.append((outbox_id, row['target'], row['payload'], row['attempts']))
+                row['attempts'] += 1
+                row['next_attempt_at'] = now + NOTIFY_CLAIM_TIMEOUT_SECONDS
+            return claimed
+
+    def record(self, sent_ids, retry_rows, failed_rows):
+        with self._lock:
+            for outbox_id in sent_ids:
+                self._rows.pop(outbox_id, None)
+            for next_attempt_at, error, outbox_id in retry_rows:
+                self._rows[outbox_id].update(next_attempt_at=next_attempt_at, last_error=error)
+            for error, outbox_id in failed_rows:
+                self._rows[outbox_id].update(status='failed', last_error=error)
+
+    def next_attempt_at(self):
+        with self._lock:
+            return min((row['next_attempt_at'] for row in self._rows.values() if row['status'] == 'pending'), default=None)
+
+    def pending_count(self):
+        with self._lock:
+            return sum(1 for row in self._rows.values() if row['status'] == 'pending')
+
+
+class NotificationDispatcher:
+    def __init__(self, database_path, senders, concurrency=NOTIFY_CONCURRENCY, rate_per_second=NOTIFY_RATE_PER_SECOND,
+                 max_attempts=NOTIFY_MAX_ATTEMPTS, outboxes=None):
+        # Outbox ditulis di shard yang sama dengan pengingatnya (lihat ReminderStore.outboxes); dispatcher menguras semuanya
+        self.outboxes = outboxes or [SQLiteOutbox(database_path)]
+        self.senders = senders
+        self.concurrency = concurrency
+        self.rate_per_second = rate_per_second
+        self.max_attempts = max_attempts
+        self.batch_size = concurrency * 4
+        self._buckets = {target: TokenBucket(rate_per_second) for target in senders}
+        self._executor = None
+        self._thread = None
+        self._stop_event = threading.Event()
+        self._wake_event = threading.Event()
+
+    @property
+    def targets(self):
+        return list(self.senders)
+
+    def outbox_rows(self, reminder_id, user_id, event, scheduled_for, now):
+        """Baris outbox (satu per target) untuk satu pengingat yang jatuh tempo."""
+        payload = json.dumps({"reminder_id": reminder_id, "user_id": user_id, "event": event, "datetime": scheduled_for})
+        return [(reminder_id, user_id, target, payload, now, now) for target in self.senders]
+
+    # --- Siklus hidup thread dispatcher ---
+    def start(self):
+        if self._thread is not None:
+            return
+        self._stop_event.clear()
+        self._executor = ThreadPoolExecutor(max_workers=self.concurrency, thread_name_prefix='notify')
+        self._thread = threading.Thread(target=self._run, name='notification-dispatcher', daemon=True)
+        self._thread.start()
+
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop_event.set()
+        self._wake_event.set()
+        self._thread.join()
+        self._executor.shutdown(wait=True)
+        self._thread = None
+
+    def wake(self):
+        """Dipanggil scheduler setelah menulis outbox agar pengiriman langsung dimulai."""
+        self._wake_event.set()
+
+    def _run(self):
+        while not self._stop_event.is_set():
+            try:
+                if self.run_once():
+                    continue
+                timeout = self._seconds_until_next_attempt()
+            except Exception as e:
+                print(f"Dispatcher notifikasi gagal: {e}")
+                timeout = NOTIFY_IDLE_SECONDS
+            self._wake_event.wait(timeout)
+            self._wake_event.clear()
+
+    def _retry_rows(self, failures):
+        now = time.time()
+        retry_rows = []
+        failed_rows = []
+        for outbox_id, attempts, error in failures:
+            if attempts >= self.max_attempts:
+                failed_rows.append((error, outbox_id))
+            else:
+                backoff = min(NOTIFY_MAX_BACKOFF_SECONDS, NOTIFY_BACKOFF_SECONDS * (2 ** (attempts - 1)))
+                retry_rows.append((now + backoff, error, outbox_id))
+        return retry_rows, failed_rows
+
+    def _seconds_until_next_attempt(self):
+        next_attempts = [outbox.next_attempt_at() for outbox in self.outboxes]
+        next_attempts = [next_attempt_at for next_attempt_at in next_attempts if next_attempt_at is not None]
+        if not next_attempts:
+            return NOTIFY_IDLE_SECONDS
+        next_attempt_at = min(next_attempts)
+        return max(0.0, min(NOTIFY_IDLE_SECONDS, next_attempt_at - time.time()))
+
+    def _deliver(self, target, payload):
+        sender = self.senders.get(target)
+        if sender is None:
+            raise RuntimeError(f"Sender tidak dikenal: {target}")
+        self._buckets[target].acquire()
+        sender.send(payload)
+
+    def run_once(self):
+        """Klaim satu batch outbox per shard, kirim secara paralel, catat hasilnya. Mengembalikan jumlah baris."""
+        return sum(self._run_outbox_once(outbox) for outbox in self.outboxes)
+
+    def _run_outbox_once(self, outbox):
+        rows = outbox.claim(self.batch_size)
+        if not rows:
+            return 0
+        futures = {self._executor.submit(self._deliver, row[1], json.loads(row[2])): row for row in rows}
+        wait(futures)
+        sent_ids = []
+        failures = []
+        for future, row in futures.items():
+            error = future.exception()
+            if error is None:
+                sent_ids.append(row[0])
+            else:
+                failures.append((row[0], row[3] + 1, str(error)))
+        outbox.record(sent_ids, *self._retry_rows(failures))
+        return len(rows)
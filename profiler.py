@@ -0,0 +1,98 @@
+"""
+Sampling profiler untuk satu request. Aktif hanya bila PROFILER=1, dan hanya untuk request dengan
+header `X-Profile: 1`:
+
+    PROFILER=1 python app.py
+    curl -H 'X-Profile: 1' -d '{"full_note_text": "...", "user_id": "u"}' -H 'Content-Type: application/json' \\
+         localhost:5000/add_multiple_reminders
+
+Thread pengambil sampel membaca stack thread request setiap PROFILER_INTERVAL_SECONDS. Stack terpanas
+dicetak ke log, dan semua stack ditulis dalam format "collapsed" (satu baris per stack: `a;b;c jumlah`,
+bisa langsung dibaca flamegraph.pl / speedscope) ke PROFILER_DIR.
+
+Di worker gevent, thread ikut di-patch menjadi greenlet sehingga tidak bisa mengambil sampel di tengah
+kode yang sibuk CPU; profil dengan `python app.py` atau worker sync.
+"""
+from collections import Counter
+import os
+import sys
+import threading
+import time
+
+PROFILER_ENABLED = os.environ.get('PROFILER', '0') == '1'
+PROFILER_HEADER = 'X-Profile'
+PROFILER_INTERVAL_SECONDS = float(os.environ.get('PROFILER_INTERVAL_SECONDS', 0.001))
+PROFILER_DIR = os.environ.get('PROFILER_DIR', 'profiles')
+PROFILER_TOP_STACKS = int(os.environ.get('PROFILER_TOP_STACKS', 15))
+
+
+def _frame_label(frame):
+    code = frame.f_code
+    return f"{os.path.basename(code.co_filename)}:{code.co_name}:{frame.f_lineno}"
+
+
+def collapse_stack(frame):
+    """Stack dari frame terluar ke terdalam, dipisah ';'."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ';'.join(reversed(labels))
+
+
+class SamplingProfiler:
+    """Mengambil sampel stack satu thread (default: thread pemanggil) dari thread terpisah."""
+
+    def __init__(self, thread_id=None, interval=PROFILER_INTERVAL_SECONDS):
+        self.thread_id = thread_id if thread_id is not None else threading.get_ident()
+        self.interval = interval
+        self.stacks = Counter()
+        self.samples = 0
+        self.started_at = None
+        self.seconds = 0.0
+        self._stop_event = threading.Event()
+        self._thread = None
+
+    def start(self):
+        self.started_at = time.perf_counter()
+        self._thread = threading.Thread(target=self._run, name='sampling-profiler', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop_event.set()
+        self._thread.join()
+        self.seconds = time.perf_counter() - self.started_at
+        return self
+
+    def _run(self):
+        while not self._stop_event.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is not None:
+                self.stacks[collapse_stack(frame)] += 1
+                self.samples += 1
+
+    def hot_frames(self, limit=PROFILER_TOP_STACKS):
+        """Fungsi terdalam (self time, semua baris digabung) dengan jumlah sampel terbanyak."""
+        leaves = Counter()
+        for stack, count in self.stacks.items():
+            leaves[stack.rsplit(';', 1)[-1].rsplit(':', 1)[0]] += count
+        return leaves.most_common(limit)
+
+    def report(self, title, limit=PROFILER_TOP_STACKS):
+        lines = [f"Profil {title}: {self.samples} sampel dalam {self.seconds * 1000:.1f} ms"]
+        if self.samples:
+            lines.append("  Fungsi terpanas (self):")
+            lines.extend(f"    {count * 100 / self.samples:5.1f}%  {label}" for label, count in self.hot_frames(limit))
+            lines.append("  Stack terpanas:")
+            for stack, count in self.stacks.most_common(min(limit, 5)):
+                lines.append(f"    {count * 100 / self.samples:5.1f}%  " + ' <- '.join(reversed(stack.split(';')[-6:])))
+        return '\n'.join(lines)
+
+    def write_collapsed(self, name, directory=PROFILER_DIR):
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{name}-{int(time.time() * 1000)}.collapsed")
+        with open(path, 'w') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+        return path
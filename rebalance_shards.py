@@ -0,0 +1,194 @@
+"""
+Memindahkan user antar shard database (lihat DB_SHARDS di database.py). Dijalankan offline:
+hentikan worker web dan scheduler dulu, karena router membaca tabel user_shards sekali per proses.
+
+    python -m rebalance_shards --shards 4              # sebar ulang semua user ke 4 shard (crc32)
+    python -m rebalance_shards --move user-42 2        # pindahkan satu user ke shard 2
+    python -m rebalance_shards --shards 4 --dry-run    # hanya tampilkan rencana
+
+Setelah selesai, jalankan aplikasi dengan DB_SHARDS yang sama dengan --shards.
+
+Pengingat mendapat id baru di shard tujuan. Versi user dilanjutkan dari versi di shard asal dan
+id lama dicatat sebagai tombstone, sehingga klien /sync_reminders cukup menerima delta biasa.
+Baris outbox yang belum terkirim ikut dipindah dengan reminder_id baru. Arsip (reminders_archive)
+ikut dipindah dengan id yang dicadangkan dari urutan AUTOINCREMENT reminders di shard tujuan, sehingga
+tidak pernah bentrok dengan pengingat yang kelak diarsipkan di sana.
+"""
+import argparse
+import glob
+import os
+import time
+
+import database
+from database import connect, hash_shard, shard_paths
+
+
+def existing_shard_paths(base_path):
+    """Semua file shard yang ada di disk, terurut menurut nomor shard."""
+    stem, ext = os.path.splitext(base_path)
+    paths = {0: base_path}
+    for path in glob.glob(f"{glob.escape(stem)}.shard*{ext}"):
+        suffix = path[len(stem) + len('.shard'):len(path) - len(ext)]
+        if suffix.isdigit():
+            paths[int(suffix)] = path
+    return [paths[shard] for shard in sorted(paths)]
+
+
+def users_by_current_shard(paths):
+    """user_id -> nomor shard tempat datanya saat ini berada."""
+    located = {}
+    for shard, path in enumerate(paths):
+        if not os.path.exists(path):
+            continue
+        conn = connect(path)
+        try:
+            for (user_id,) in conn.execute('SELECT user_id FROM user_versions UNION SELECT DISTINCT user_id FROM reminders'):
+                located[user_id] = shard
+        finally:
+            conn.close()
+    return located
+
+
+def reminder_columns(conn):
+    return [row[1] for row in conn.execute('PRAGMA table_info(reminders)') if row[1] not in ('id', 'version')]
+
+
+def archive_columns(conn):
+    return [row[1] for row in conn.execute('PRAGMA table_info(reminders_archive)') if row[1] != 'id']
+
+
+def reserve_reminder_ids(conn, count):
+    """Cadangkan `count` id dari urutan AUTOINCREMENT reminders (di dalam transaksi pemanggil). Mengembalikan id pertama."""
+    last_id = conn.execute("SELECT MAX((SELECT COALESCE(MAX(seq), 0) FROM sqlite_sequence WHERE name = 'reminders'), "
+                           "(SELECT COALESCE(MAX(id), 0) FROM reminders_archive))").fetchone()[0]
+    if conn.execute("UPDATE sqlite_sequence SET seq = ? WHERE name = 'reminders'", (last_id + count,)).rowcount == 0:
+        conn.execute("INSERT INTO sqlite_sequence (name, seq) VALUES ('reminders', ?)", (last_id + count,))
+    return last_id + 1
+
+
+def move_user(user_id, source_path, target_path):
+    """Salin data user ke shard tujuan, lalu hapus dari shard asal. Mengembalikan jumlah pengingat."""
+    source = connect(source_path)
+    target = connect(target_path)
+    try:
+        columns = reminder_columns(source)
+        column_list = ', '.join(columns)
+        rows = source.execute(f'SELECT id, {column_list} FROM reminders WHERE user_id = ? ORDER BY id', (user_id,)).fetchall()
+        version_row = source.execute('SELECT version FROM user_versions WHERE user_id = ?', (user_id,)).fetchone()
+        tombstones = source.execute('SELECT reminder_id, version, deleted_at FROM reminder_tombstones WHERE user_id = ?',
+                                    (user_id,)).fetchall()
+        archived_columns = archive_columns(source)
+        archive_column_list = ', '.join(archived_columns)
+        archived = source.execute(f'SELECT id, {archive_column_list} FROM reminders_archive WHERE user_id = ? ORDER BY id',
+                                  (user_id,)).fetchall()
+        outbox = source.execute(
+            "SELECT reminder_id, target, payload, status, attempts, next_attempt_at, last_error, created_at "
+            "FROM notification_outbox WHERE user_id = ?", (user_id,)).fetchall()
+
+        with target:
+            # Versi dilanjutkan dari shard asal agar ETag dan cursor sinkronisasi klien tetap valid
+            target.execute('INSERT INTO user_versions (user_id, version) VALUES (?, ?) '
+                           'ON CONFLICT(user_id) DO UPDATE SET version = MAX(version, excluded.version)',
+                           (user_id, version_row[0] if version_row else 0))
+            target.executemany('INSERT INTO reminder_tombstones (user_id, reminder_id, version, deleted_at) VALUES (?, ?, ?, ?)',
+                               [(user_id,) + tuple(row) for row in tombstones])
+            id_map = {}
+            placeholders = ', '.join('?' * len(columns))
+            for row in rows:
+                id_map[row[0]] = target.execute(f'INSERT INTO reminders ({column_list}) VALUES ({placeholders})',
+                                                tuple(row[1:])).lastrowid
+            # Riwayat (/get_reminder_history) ikut pindah; id baru diambil setelah id pengingat di atas
+            archive_id_map = {}
+            if archived:
+                first_id = reserve_reminder_ids(target, len(archived))
+                archive_id_map = {row[0]: first_id + index for index, row in enumerate(archived)}
+                target.executemany(f'INSERT INTO reminders_archive (id, {archive_column_list}) '
+                                   f"VALUES ({', '.join('?' * (len(archived_columns) + 1))})",
+                                   [(archive_id_map[row[0]],) + tuple(row[1:]) for row in archived])
+            # Id lama dianggap terhapus bagi klien; versinya di atas semua insert di atas
+            final_version = target.execute('SELECT version FROM user_versions WHERE user_id = ?', (user_id,)).fetchone()[0]
+            now = int(time.time())
+            target.executemany('INSERT INTO reminder_tombstones (user_id, reminder_id, version, deleted_at) VALUES (?, ?, ?, ?)',
+                               [(user_id, old_id, final_version, now) for old_id in id_map])
+            target.executemany(
+                'INSERT INTO notification_outbox (reminder_id, user_id, target, payload, status, attempts, next_attempt_at, last_error, created_at) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                [(id_map.get(row[0], archive_id_map.get(row[0], row[0])), user_id) + tuple(row[1:]) for row in outbox])
+
+        with source:
+            source.execute('DELETE FROM reminders WHERE user_id = ?', (user_id,))
+            source.execute('DELETE FROM reminder_tombstones WHERE user_id = ?', (user_id,))
+            source.execute('DELETE FROM user_versions WHERE user_id = ?', (user_id,))
+            source.execute('DELETE FROM notification_outbox WHERE user_id = ?', (user_id,))
+            source.execute('DELETE FROM reminders_archive WHERE user_id = ?', (user_id,))
+            source.execute('DELETE FROM due_events WHERE user_id = ?', (user_id,))
+        return len(rows)
+    finally:
+        source.close()
+        target.close()
+
+
+def set_override(base_path, user_id, shard, shard_count):
+    """Catat pengecualian di DATABASE; dihapus bila shard sudah sama dengan hasil hash."""
+    conn = connect(base_path)
+    try:
+        with conn:
+            if shard == hash_shard(user_id, shard_count):
+                conn.execute('DELETE FROM user_shards WHERE user_id = ?', (user_id,))
+            else:
+                conn.execute('INSERT INTO user_shards (user_id, shard) VALUES (?, ?) '
+                             'ON CONFLICT(user_id) DO UPDATE SET shard = excluded.shard', (user_id, shard))
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Pindahkan user antar shard database pengingat.')
+    parser.add_argument('--shards', type=int, default=database.DB_SHARDS, help='Jumlah shard tujuan (default DB_SHARDS)')
+    parser.add_argument('--move', nargs=2, metavar=('USER_ID', 'SHARD'), help='Pindahkan satu user ke shard tertentu')
+    parser.add_argument('--dry-run', action='store_true', help='Tampilkan rencana tanpa mengubah data')
+    args = parser.parse_args()
+
+    base_path = database.DATABASE
+    target_paths = shard_paths(base_path, args.shards)
+    source_paths = existing_shard_paths(base_path)
+    located = users_by_current_shard(source_paths)
+
+    if args.move:
+        user_id, shard = args.move[0], int(args.move[1])
+        if not 0 <= shard < args.shards:
+            parser.error(f"Shard harus di antara 0 dan {args.shards - 1}")
+        # User tanpa data cukup dicatat pengecualiannya
+        plan = [(user_id, located.get(user_id, shard), shard)]
+    else:
+        plan = [(user_id, shard, hash_shard(user_id, args.shards)) for user_id, shard in sorted(located.items())]
+    moves = [(user_id, source, target) for user_id, source, target in plan if source != target]
+
+    print(f"{len(located)} user, {len(moves)} dipindah ke {args.shards} shard.")
+    for user_id, source, target in moves:
+        print(f"  {user_id}: shard {source} -> {target}")
+    if args.dry_run:
+        return
+
+    # Siapkan (dan migrasikan) semua file shard tujuan
+    database.init_db(shard_count=args.shards)
+    for user_id, source, target in moves:
+        moved = move_user(user_id, source_paths[source], target_paths[target])
+        print(f"Dipindah {moved} pengingat milik {user_id}.")
+    if args.move:
+        set_override(base_path, plan[0][0], plan[0][2], args.shards)
+    else:
+        # Sebar ulang penuh: semua user kini berada di shard hasil hash
+        conn = connect(base_path)
+        with conn:
+            conn.execute('DELETE FROM user_shards')
+        conn.close()
+
+    leftover = [file_path for path in source_paths[args.shards:] for file_path in (path, database.archive_path(path))
+                if os.path.exists(file_path)]
+    if leftover and not args.move:
+        print(f"File shard berikut sudah kosong dan boleh dihapus: {', '.join(leftover)}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,86 @@
+from datetime import datetime, timedelta
+
+# --- Mesin Pengulangan: kemunculan berikutnya dalam bentuk tertutup ---
+# Tidak ada loop "maju satu interval per iterasi": pengingat harian yang terlewat setahun
+# tetap dihitung dalam O(1), weekly_custom dalam O(jumlah hari target).
+
+REPEAT_DAY_MAP = {"mon": 0, "tue": 1, "wed": 2, "thu": 3, "fri": 4, "sat": 5, "sun": 6}
+ONE_DAY = timedelta(days=1)
+ONE_WEEK = timedelta(weeks=1)
+
+def add_months(sourcedate, months):
+    month = sourcedate.month + months
+    year = sourcedate.year + (month - 1) // 12
+    month = (month - 1) % 12 + 1
+    day = min(sourcedate.day, (datetime(year, month + 1, 1).date() - timedelta(days=1)).day if month < 12 else 31)
+    return sourcedate.replace(year=year, month=month, day=day, tzinfo=sourcedate.tzinfo)
+
+def parse_repeat_days(repeat_days_str):
+    """"Mon,Wed,Fri" -> [0, 2, 4]. Nama hari yang tidak dikenal diabaikan."""
+    if not repeat_days_str:
+        return []
+    return sorted({REPEAT_DAY_MAP[d.strip().lower()] for d in repeat_days_str.split(',') if d.strip().lower() in REPEAT_DAY_MAP})
+
+def _advance_fixed(current_dt, step, after):
+    """current_dt + k*step terkecil (k >= 1) yang > after."""
+    k = 1
+    if after >= current_dt:
+        k = max(1, (after - current_dt) // step + 1)
+    return current_dt + step * k
+
+def _advance_months(current_dt, months_per_step, after):
+    """add_months(current_dt, k*months_per_step) terkecil (k >= 1) yang > after."""
+    months_between = (after.year - current_dt.year) * 12 + (after.month - current_dt.month)
+    k = max(1, months_between // months_per_step)
+    candidate = add_months(current_dt, months_per_step * k)
+    if candidate <= after:
+        candidate = add_months(current_dt, months_per_step * (k + 1))
+    return candidate
+
+def _advance_weekdays(current_dt, weekdays, after):
+    """Kemunculan pertama pada salah satu `weekdays` (jam sama dengan current_dt) setelah current_dt dan after."""
+    reference = max(current_dt, after)
+    best = None
+    for weekday in weekdays:
+        days_ahead = (weekday - reference.weekday()) % 7
+        candidate = current_dt + ONE_DAY * ((reference.date() - current_dt.date()).days + days_ahead)
+        if candidate <= reference:
+            candidate += ONE_WEEK
+        if best is None or candidate < best:
+            best = candidate
+    return best
+
+def next_occurrence(current_dt, repeat_type, repeat_interval, after, repeat_days=None):
+    """
+    Kemunculan berikutnya dari pengingat berulang yang saat ini dijadwalkan pada `current_dt`:
+    kemunculan pertama yang lebih besar dari `current_dt` dan dari `after`.
+    Mengembalikan None untuk repeat_type yang tidak berulang / tidak dikenal.
+    """
+    if repeat_type == 'daily':
+        return _advance_fixed(current_dt, ONE_DAY, after)
+    elif repeat_type == 'weekly':
+        # Untuk weekly, repeat_interval menyimpan weekday number (0=Senin, 6=Minggu)
+        return _advance_weekdays(current_dt, [repeat_interval % 7], after)
+    elif repeat_type == 'weekly_custom':
+        weekdays = parse_repeat_days(repeat_days)
+        # Fallback jika repeat_days tidak valid: maju per minggu dari hari yang sama
+        return _advance_weekdays(current_dt, weekdays or [current_dt.weekday()], after)
+    elif repeat_type == 'monthly_interval':
+        return _advance_months(current_dt, max(1, repeat_interval), after)
+    elif repeat_type == 'yearly':
+        return _advance_months(current_dt, 12 * max(1, repeat_interval), after)
+    return None
+
+def occurrences_between(start_dt, repeat_type, repeat_interval, window_start, window_end, repeat_days=None):
+    """
+    Semua kemunculan dalam [window_start, window_end) dari seri yang kemunculan berikutnya `start_dt`.
+    Lompat langsung ke kemunculan pertama di jendela lewat next_occurrence, lalu maju satu per satu.
+    Pengingat sekali jalan (atau repeat_type tidak dikenal) hanya menghasilkan start_dt sendiri.
+    """
+    occurrence = start_dt
+    if occurrence < window_start:
+        occurrence = next_occurrence(start_dt, repeat_type, repeat_interval, window_start - timedelta(microseconds=1),
+                                     repeat_days=repeat_days)
+    while occurrence is not None and occurrence < window_end:
+        yield occurrence
+        occurrence = next_occurrence(occurrence, repeat_type, repeat_interval, occurrence, repeat_days=repeat_days)
@@ -0,0 +1,27 @@
+import json
+
+# --- Metadata Terstruktur ---
+# Field metadata yang paling sering dipakai disimpan di kolom bertipe pada tabel reminders
+# (bisa difilter dan diindeks, tanpa json.loads). Sisanya (favorite_meals, coffee_preference,
+# description_fallback, kunci lain) tetap berupa JSON di kolom `metadata` sebagai "extras",
+# NULL bila kosong, dan hanya di-decode saat metadata memang diminta.
+METADATA_COLUMNS = ('activity_type', 'mood', 'notes', 'repeat_days', 'suggestion')
+METADATA_SELECT_COLUMNS = 'metadata, ' + ', '.join(METADATA_COLUMNS)
+
+def split_metadata(metadata):
+    """dict metadata hasil parser -> (nilai kolom bertipe..., JSON extras atau None)."""
+    metadata = metadata or {}
+    typed = tuple(metadata.get(column) for column in METADATA_COLUMNS)
+    extras = {key: value for key, value in metadata.items() if key not in METADATA_COLUMNS}
+    return typed + (json.dumps(extras) if extras else None,)
+
+def row_metadata(r):
+    """Gabungkan kolom bertipe dan extras dari satu baris menjadi dict metadata seperti format API lama."""
+    metadata = {}
+    for column in METADATA_COLUMNS:
+        value = r[column]
+        if value is not None:
+            metadata[column] = value
+    if r['metadata']:
+        metadata.update(json.loads(r['metadata']))
+    return metadata
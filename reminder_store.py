@@ -0,0 +1,530 @@
+import heapq
+import itertools
+import os
+import sqlite3
+import time
+from datetime import datetime
+
+from database import datetime_to_epoch, get_pool, get_router, run_with_lock_retry
+from notifications import OUTBOX_INSERT_SQL, SQLiteOutbox
+from reminder_metadata import METADATA_COLUMNS
+
+# --- Penyimpanan Pengingat ---
+# Semua akses data pengingat dari app.py lewat ReminderStore; SQL hanya ada di engine SQLite.
+# REMINDER_STORE=sqlite (default): file DATABASE (atau DB_SHARDS file, lihat database.py).
+# REMINDER_STORE=memory: MemoryReminderStore (memory_store.py), data hanya di memori proses;
+# untuk tes, benchmark, dan deployment satu proses (gunicorn --workers 1) yang mengejar latensi.
+REMINDER_STORE = os.environ.get('REMINDER_STORE', 'sqlite')
+
+# Kolom baris baru untuk add_many (urutan tuple); id dan version diisi oleh store
+REMINDER_RECORD_COLUMNS = ('user_id', 'event', 'datetime', 'repeat_type', 'repeat_interval', 'notified', 'due_at') \
+    + METADATA_COLUMNS + ('metadata',)
+# Proyeksi bawaan daftar pengingat (due_at selalu ikut untuk cursor dan urutan)
+REMINDER_LIST_COLUMNS = ('id', 'user_id', 'event', 'datetime', 'repeat_type', 'repeat_interval', 'notified', 'metadata') \
+    + METADATA_COLUMNS
+# Kolom yang disalin ke reminders_archive (ditambah archived_at)
+ARCHIVE_COLUMNS = ('id',) + REMINDER_RECORD_COLUMNS
+REMINDER_STATUSES = ('all', 'upcoming', 'done')
+# Event "due" (user_id, reminder_id, event, datetime, created_at) disimpan sebentar untuk watcher /events
+# di proses lain (lihat events.py); lebih tua dari ini sudah tidak berguna bagi koneksi SSE
+DUE_EVENTS_RETENTION_SECONDS = int(os.environ.get('DUE_EVENTS_RETENTION_SECONDS', 300))
+# Kolom metadata bertipe yang boleh dipakai sebagai filter list_by_user
+FILTER_COLUMNS = ('activity_type', 'mood')
+
+REMINDER_INSERT_SQL = (f"INSERT INTO reminders ({', '.join(REMINDER_RECORD_COLUMNS)}) "
+                       f"VALUES ({', '.join('?' * len(REMINDER_RECORD_COLUMNS))})")
+DUE_EVENT_INSERT_SQL = ('INSERT INTO due_events (user_id, reminder_id, event, datetime, version, created_at) '
+                        'VALUES (?, ?, ?, ?, COALESCE((SELECT version FROM user_versions WHERE user_id = ?), 0), ?)')
+STATUS_CLAUSES = {'all': '', 'upcoming': ' AND notified = 0', 'done': ' AND notified = 1'}
+# Batas parameter per query IN (SQLITE_MAX_VARIABLE_NUMBER lama = 999)
+IN_QUERY_CHUNK = 500
+# Penundaan (snooze): jam dinding ISO digeser di SQL, offset zona dan pecahan detiknya dipertahankan apa adanya
+SNOOZE_SET_SQL = ("datetime = CASE WHEN due_at < ? THEN ? "
+                  "ELSE strftime('%Y-%m-%dT%H:%M:%S', substr(datetime, 1, 19), ?) || substr(datetime, 20) END, "
+                  "due_at = MAX(due_at, ?) + ?, notified = 0")
+
+
+def selection_sql(status='all', filters=None, start_epoch=None, end_epoch=None):
+    """Klausa tambahan setelah `user_id = ?` (status, FILTER_COLUMNS, start_epoch <= due_at < end_epoch) dan argumennya."""
+    clause = STATUS_CLAUSES[status]
+    args = []
+    for column, value in (filters or {}).items():
+        if column not in FILTER_COLUMNS:
+            raise ValueError(f"Filter tidak dikenal: {column}")
+        clause += f' AND {column} = ?'
+        args.append(value)
+    if start_epoch is not None:
+        clause += ' AND due_at >= ?'
+        args.append(start_epoch)
+    if end_epoch is not None:
+        clause += ' AND due_at < ?'
+        args.append(end_epoch)
+    return clause, args
+
+
+def id_chunks(reminder_ids):
+    """Id unik (urutan dipertahankan) dalam potongan IN_QUERY_CHUNK."""
+    ids = list(dict.fromkeys(reminder_ids))
+    return [ids[start:start + IN_QUERY_CHUNK] for start in range(0, len(ids), IN_QUERY_CHUNK)]
+
+
+class ReminderStore:
+    """
+    Antarmuka penyimpanan. Baris yang dikembalikan berupa mapping (r['kolom']) dan selalu memuat due_at.
+    Id hanya unik di dalam satu shard: due_before/advance_many dipanggil per elemen `shards`.
+    """
+
+    @property
+    def shards(self):
+        return [self]
+
+    def add_many(self, user_id, rows):
+        """Simpan baris (tuple REMINDER_RECORD_COLUMNS) dalam satu transaksi. Mengembalikan id baru, berurutan."""
+        raise NotImplementedError
+
+    def list_by_user(self, user_id, columns=REMINDER_LIST_COLUMNS, status='all', filters=None, after=None, limit=None):
+        """
+        Iterator baris user terurut (due_at, id). `filters`: {kolom FILTER_COLUMNS: nilai};
+        `after`: (due_at, id) untuk keyset pagination. Panggil close() bila berhenti sebelum habis.
+        """
+        raise NotImplementedError
+
+    def range_by_user(self, user_id, start_epoch, end_epoch, columns=REMINDER_LIST_COLUMNS):
+        """Baris dengan start_epoch <= due_at < end_epoch, terurut (due_at, id)."""
+        raise NotImplementedError
+
+    def recurring_before(self, user_id, epoch, columns=REMINDER_LIST_COLUMNS):
+        """Seri berulang yang kemunculan berikutnya sebelum `epoch` (untuk ekspansi kalender)."""
+        raise NotImplementedError
+
+    def changes_since(self, user_id, since):
+        """
+        (baris dengan version > since, id yang terhapus setelah since, full). full=True bila semua baris
+        dikirim ulang: since=0, atau tombstone setelah `since` sudah dipangkas (prune_tombstones).
+        """
+        raise NotImplementedError
+
+    def user_version(self, user_id):
+        raise NotImplementedError
+
+    def user_versions(self, user_ids):
+        """{user_id: versi} untuk user yang pernah menulis."""
+        raise NotImplementedError
+
+    def delete(self, user_id, reminder_id):
+        """Hapus satu pengingat milik user. Mengembalikan jumlah baris terhapus (0 bila bukan miliknya)."""
+        raise NotImplementedError
+
+    # --- Operasi massal: satu transaksi, hanya baris milik user_id; id milik user lain dilewati ---
+    def delete_many(self, user_id, reminder_ids):
+        """Hapus pengingat user berdasarkan id. Mengembalikan jumlah baris terhapus."""
+        raise NotImplementedError
+
+    def delete_matching(self, user_id, status='all', filters=None, start_epoch=None, end_epoch=None):
+        """Hapus semua pengingat user yang cocok dengan status, `filters` dan start_epoch <= due_at < end_epoch. Mengembalikan jumlahnya."""
+        raise NotImplementedError
+
+    def reschedule_many(self, user_id, reminder_ids, new_datetime):
+        """Pindahkan pengingat ke `new_datetime` (aware) sebagai belum dinotifikasi. Mengembalikan jumlah baris yang diubah."""
+        raise NotImplementedError
+
+    def snooze_many(self, user_id, reminder_ids, seconds, now_local):
+        """
+        Tunda `seconds` detik dari tenggatnya, atau dari `now_local` bila tenggatnya sudah lewat, sebagai
+        belum dinotifikasi. Mengembalikan jumlah baris yang diubah.
+        """
+        raise NotImplementedError
+
+    def due_before(self, epoch, limit):
+        """Baris lengkap yang belum dinotifikasi dengan due_at <= epoch, paling awal dulu."""
+        raise NotImplementedError
+
+    def advance_many(self, notified_rows, advanced_rows, outbox_rows=(), due_events=()):
+        """
+        Dalam satu transaksi: tandai notified_rows (id, due_at yang dibaca) selesai, majukan advanced_rows
+        (datetime, due_at, id, due_at yang dibaca), catat outbox_rows (urutan OUTBOX_INSERT_SQL) di outbox
+        store ini, dan simpan due_events (user_id, reminder_id, event, datetime, created_at) dengan versi user
+        sesudah perubahan ini. Baris yang sejak dibaca sudah diubah (due_at berbeda, atau sudah dinotifikasi)
+        dilewati beserta outbox dan event-nya. Mengembalikan set id yang benar-benar dimajukan.
+        """
+        raise NotImplementedError
+
+    def due_events_between(self, version_ranges):
+        """
+        Event "due" untuk {user_id: (after_version, up_to_version)}: dict user_id, id, event, datetime
+        dari pemajuan dengan after_version < versi <= up_to_version, terurut.
+        """
+        raise NotImplementedError
+
+    def next_due(self, limit):
+        """`limit` pasangan (due_at, id) terdekat yang belum dinotifikasi, terurut."""
+        raise NotImplementedError
+
+    def outboxes(self):
+        raise NotImplementedError
+
+    # --- Arsip dan pemadatan (lihat compaction.py) ---
+    def archive_completed(self, before_epoch, limit):
+        """
+        Pindahkan maksimal `limit` pengingat sekali jalan yang sudah dinotifikasi dengan due_at < before_epoch
+        ke arsip, dalam satu transaksi. Mengembalikan user_id tiap baris yang diarsipkan.
+        """
+        raise NotImplementedError
+
+    def archived_by_user(self, user_id, before=None, limit=None):
+        """Baris arsip user, terbaru dulu (due_at, id menurun). `before`: (due_at, id) cursor."""
+        raise NotImplementedError
+
+    def prune_tombstones(self, before_timestamp, limit):
+        """Hapus maksimal `limit` tombstone yang dibuat sebelum before_timestamp. Mengembalikan jumlahnya."""
+        raise NotImplementedError
+
+    def reclaim_space(self, max_pages):
+        """Kembalikan halaman kosong ke sistem file. Mengembalikan jumlah byte yang dibebaskan."""
+        return 0
+
+    def storage_stats(self):
+        """{'reminders', 'archived', 'tombstones', 'file_bytes', 'free_bytes', 'archive_bytes'}; file_bytes tanpa file arsip."""
+        raise NotImplementedError
+
+
+class SQLiteReminderStore(ReminderStore):
+    """Satu file SQLite. Koneksi dipinjam dari pool per operasi (lihat database.get_pool)."""
+
+    def __init__(self, path):
+        self.path = path
+
+    def _query(self, query, args=()):
+        pool = get_pool(self.path)
+        conn = pool.acquire()
+        try:
+            conn.row_factory = sqlite3.Row
+            return conn.execute(query, args).fetchall()
+        finally:
+            pool.release(conn)
+
+    def _write(self, fn):
+        """Jalankan fn(conn) dalam satu transaksi tulis; dicoba ulang dengan backoff bila database terkunci."""
+        pool = get_pool(self.path)
+        conn = pool.acquire()
+        try:
+            def attempt():
+                with conn:
+                    return fn(conn)
+            return run_with_lock_retry(attempt)
+        finally:
+            pool.release(conn)
+
+    def _stream(self, query, args):
+        # Query dijalankan sekarang (error muncul di pemanggil); koneksi baru kembali ke pool saat iterator habis/ditutup
+        pool = get_pool(self.path)
+        conn = pool.acquire()
+        try:
+            conn.row_factory = sqlite3.Row
+            cursor = conn.execute(query, args)
+        except Exception:
+            pool.release(conn)
+            raise
+        return self._iterate(pool, conn, cursor)
+
+    @staticmethod
+    def _iterate(pool, conn, cursor):
+        try:
+            yield from cursor
+        finally:
+            cursor.close()
+            pool.release(conn)
+
+    def add_many(self, user_id, rows):
+        if not rows:
+            return []
+        def write(conn):
+            conn.executemany(REMINDER_INSERT_SQL, rows)
+            return conn.execute('SELECT last_insert_rowid()').fetchone()[0]
+        last_id = self._write(write)
+        # AUTOINCREMENT dalam satu transaksi tulis menghasilkan id yang berurutan
+        return list(range(last_id - len(rows) + 1, last_id + 1))
+
+    def list_by_user(self, user_id, columns=REMINDER_LIST_COLUMNS, status='all', filters=None, after=None, limit=None):
+        # Range scan pada indeks (user_id, due_at) / (user_id, notified, due_at) / (user_id, activity_type, due_at).
+        # Keyset: lanjut tepat setelah (due_at, id) terakhir, tanpa OFFSET yang makin mahal di halaman belakang.
+        clause, filter_args = selection_sql(status, filters)
+        query = f"SELECT {', '.join(columns)}, due_at FROM reminders WHERE user_id = ?{clause}"
+        args = [user_id] + filter_args
+        if after is not None:
+            query += ' AND due_at >= ? AND (due_at > ? OR id > ?)'
+            args += [after[0], after[0], after[1]]
+        query += ' ORDER BY due_at ASC, id ASC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            args.append(limit)
+        return self._stream(query, args)
+
+    def range_by_user(self, user_id, start_epoch, end_epoch, columns=REMINDER_LIST_COLUMNS):
+        # Bandingkan epoch UTC (bukan string ISO) lewat indeks (user_id, due_at)
+        return self._query(f"SELECT {', '.join(columns)}, due_at FROM reminders WHERE user_id = ? AND due_at >= ? AND due_at < ? "
+                           f"ORDER BY due_at ASC, id ASC", (user_id, start_epoch, end_epoch))
+
+    def recurring_before(self, user_id, epoch, columns=REMINDER_LIST_COLUMNS):
+        # Partial index idx_reminders_user_recurring_due: tanpa memindai pengingat sekali jalan yang sudah lewat
+        return self._query(f"SELECT {', '.join(columns)}, due_at FROM reminders WHERE user_id = ? AND repeat_type != 'none' "
+                           f"AND due_at < ?", (user_id, epoch))
+
+    def changes_since(self, user_id, since):
+        if since > 0:
+            pruned = self._query('SELECT pruned_version FROM user_versions WHERE user_id = ?', (user_id,))
+            if pruned and since < pruned[0]['pruned_version']:
+                since = 0
+        changed = self._query(f"SELECT {', '.join(REMINDER_LIST_COLUMNS)}, due_at FROM reminders WHERE user_id = ? AND version > ? "
+                              f"ORDER BY due_at ASC, id ASC", (user_id, since))
+        deleted = []
+        if since > 0:
+            deleted = [row['reminder_id'] for row in self._query(
+                'SELECT reminder_id FROM reminder_tombstones WHERE user_id = ? AND version > ?', (user_id, since))]
+        return changed, deleted, since == 0
+
+    def user_version(self, user_id):
+        rows = self._query('SELECT version FROM user_versions WHERE user_id = ?', (user_id,))
+        return rows[0]['version'] if rows else 0
+
+    def user_versions(self, user_ids):
+        user_ids = list(user_ids)
+        versions = {}
+        for start in range(0, len(user_ids), IN_QUERY_CHUNK):
+            chunk = user_ids[start:start + IN_QUERY_CHUNK]
+            placeholders = ','.join('?' * len(chunk))
+            versions.update((row['user_id'], row['version']) for row in self._query(
+                f'SELECT user_id, version FROM user_versions WHERE user_id IN ({placeholders})', chunk))
+        return versions
+
+    def delete(self, user_id, reminder_id):
+        return self._write(lambda conn: conn.execute('DELETE FROM reminders WHERE id = ? AND user_id = ?',
+                                                     (reminder_id, user_id)).rowcount)
+
+    def _update_ids(self, user_id, reminder_ids, sql, args):
+        # Satu pernyataan per IN_QUERY_CHUNK id, semuanya dalam satu transaksi (satu commit/fsync).
+        # Trigger versi tetap berjalan per baris, sehingga ETag, tombstone dan /sync_reminders ikut benar.
+        chunks = id_chunks(reminder_ids)
+        if not chunks:
+            return 0
+        def write(conn):
+            return sum(conn.execute(f"{sql} WHERE user_id = ? AND id IN ({','.join('?' * len(chunk))})",
+                                    args + [user_id] + chunk).rowcount for chunk in chunks)
+        return self._write(write)
+
+    def delete_many(self, user_id, reminder_ids):
+        return self._update_ids(user_id, reminder_ids, 'DELETE FROM reminders', [])
+
+    def delete_matching(self, user_id, status='all', filters=None, start_epoch=None, end_epoch=None):
+        # Satu DELETE lewat indeks yang sama dengan list_by_user / range_by_user
+        clause, args = selection_sql(status, filters, start_epoch, end_epoch)
+        return self._write(lambda conn: conn.execute(f'DELETE FROM reminders WHERE user_id = ?{clause}', [user_id] + args).rowcount)
+
+    def reschedule_many(self, user_id, reminder_ids, new_datetime):
+        return self._update_ids(user_id, reminder_ids, 'UPDATE reminders SET datetime = ?, due_at = ?, notified = 0',
+                                [new_datetime.isoformat(), datetime_to_epoch(new_datetime)])
+
+    def snooze_many(self, user_id, reminder_ids, seconds, now_local):
+        now_epoch = int(now_local.timestamp())
+        snoozed_from_now = datetime.fromtimestamp(now_epoch + seconds, now_local.tzinfo)
+        return self._update_ids(user_id, reminder_ids, f'UPDATE reminders SET {SNOOZE_SET_SQL}',
+                                [now_epoch, snoozed_from_now.isoformat(), f'{seconds:+d} seconds', now_epoch, seconds])
+
+    def due_before(self, epoch, limit):
+        # Hanya yang sudah jatuh tempo, lewat indeks (notified, due_at)
+        return self._query('SELECT * FROM reminders WHERE notified = 0 AND due_at <= ? ORDER BY due_at ASC LIMIT ?', (epoch, limit))
+
+    def advance_many(self, notified_rows, advanced_rows, outbox_rows=(), due_events=()):
+        def write(conn):
+            # Dicocokkan dengan due_at yang dibaca scheduler: snooze/jadwal ulang user di antara baca dan tulis menang
+            advanced = set()
+            for reminder_id, read_due_at in notified_rows:
+                if conn.execute('UPDATE reminders SET notified = 1 WHERE id = ? AND due_at = ? AND notified = 0',
+                                (reminder_id, read_due_at)).rowcount:
+                    advanced.add(reminder_id)
+            for datetime_iso, due_at, reminder_id, read_due_at in advanced_rows:
+                if conn.execute('UPDATE reminders SET datetime = ?, due_at = ?, notified = 0 WHERE id = ? AND due_at = ? AND notified = 0',
+                                (datetime_iso, due_at, reminder_id, read_due_at)).rowcount:
+                    advanced.add(reminder_id)
+            conn.executemany(OUTBOX_INSERT_SQL, [row for row in outbox_rows if row[0] in advanced])
+            # Setelah semua UPDATE: versi yang tercatat adalah versi user sesudah batch ini
+            conn.executemany(DUE_EVENT_INSERT_SQL, [(user_id, reminder_id, event, scheduled_for, user_id, created_at)
+                                                    for user_id, reminder_id, event, scheduled_for, created_at in due_events
+                                                    if reminder_id in advanced])
+            conn.execute('DELETE FROM due_events WHERE created_at < ?', (time.time() - DUE_EVENTS_RETENTION_SECONDS,))
+            return advanced
+        return self._write(write)
+
+    def due_events_between(self, version_ranges):
+        items = list(version_ranges.items())
+        events = []
+        # Tiga parameter per user
+        chunk_size = IN_QUERY_CHUNK // 3
+        for start in range(0, len(items), chunk_size):
+            chunk = items[start:start + chunk_size]
+            clause = ' OR '.join(['(user_id = ? AND version > ? AND version <= ?)'] * len(chunk))
+            args = [value for user_id, (after_version, up_to_version) in chunk for value in (user_id, after_version, up_to_version)]
+            events.extend({'user_id': row['user_id'], 'id': row['reminder_id'], 'event': row['event'], 'datetime': row['datetime']}
+                          for row in self._query(f'SELECT user_id, reminder_id, event, datetime FROM due_events WHERE {clause} '
+                                                 f'ORDER BY version, id', args))
+        return events
+
+    def next_due(self, limit):
+        return [(row['due_at'], row['id']) for row in self._query(
+            'SELECT due_at, id FROM reminders WHERE notified = 0 AND due_at IS NOT NULL ORDER BY due_at ASC LIMIT ?', (limit,))]
+
+    def outboxes(self):
+        return [SQLiteOutbox(self.path)]
+
+    def archive_completed(self, before_epoch, limit):
+        column_list = ', '.join(ARCHIVE_COLUMNS)
+        def write(conn):
+            # BEGIN IMMEDIATE sebelum SELECT: kandidat tidak bisa di-snooze/dijadwalkan ulang sebelum INSERT/DELETE
+            # di bawah (tanpanya SELECT berjalan di luar transaksi). Kandidat lewat indeks (notified, due_at);
+            # transaksi kecil agar penulis lain tidak lama menunggu.
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute("SELECT id, user_id FROM reminders WHERE notified = 1 AND due_at < ? AND repeat_type = 'none' "
+                                "ORDER BY due_at LIMIT ?", (before_epoch, limit)).fetchall()
+            if not rows:
+                return []
+            placeholders = ','.join('?' * len(rows))
+            ids = [row[0] for row in rows]
+            # reminders_archive ada di file arsip (ATTACH). Di mode WAL commit lintas file tidak atomik bersama:
+            # bila crash membuat baris tertinggal di reminders, batch berikutnya mengarsipkannya ulang (OR REPLACE)
+            conn.execute(f'INSERT OR REPLACE INTO reminders_archive ({column_list}, archived_at) '
+                         f'SELECT {column_list}, ? FROM reminders WHERE id IN ({placeholders})', [time.time()] + ids)
+            # Trigger delete menaikkan versi user dan menulis tombstone: klien sinkron menghapusnya dari daftar aktif
+            conn.execute(f'DELETE FROM reminders WHERE id IN ({placeholders})', ids)
+            return [row[1] for row in rows]
+        return self._write(write)
+
+    def archived_by_user(self, user_id, before=None, limit=None):
+        query = f"SELECT {', '.join(ARCHIVE_COLUMNS)}, archived_at FROM reminders_archive WHERE user_id = ?"
+        args = [user_id]
+        if before is not None:
+            query += ' AND due_at <= ? AND (due_at < ? OR id < ?)'
+            args += [before[0], before[0], before[1]]
+        query += ' ORDER BY due_at DESC, id DESC'
+        if limit is not None:
+            query += ' LIMIT ?'
+            args.append(limit)
+        return self._query(query, args)
+
+    def prune_tombstones(self, before_timestamp, limit):
+        def write(conn):
+            # Seperti archive_completed: SELECT dan DELETE dalam satu transaksi tulis
+            conn.execute('BEGIN IMMEDIATE')
+            rows = conn.execute('SELECT rowid, user_id, version FROM reminder_tombstones WHERE deleted_at < ? ORDER BY deleted_at LIMIT ?',
+                                (before_timestamp, limit)).fetchall()
+            pruned_versions = {}
+            for _, user_id, version in rows:
+                pruned_versions[user_id] = max(version, pruned_versions.get(user_id, 0))
+            conn.executemany('UPDATE user_versions SET pruned_version = MAX(pruned_version, ?) WHERE user_id = ?',
+                             [(version, user_id) for user_id, version in pruned_versions.items()])
+            conn.executemany('DELETE FROM reminder_tombstones WHERE rowid = ?', [(row[0],) for row in rows])
+            return len(rows)
+        return self._write(write)
+
+    def reclaim_space(self, max_pages):
+        pool = get_pool(self.path)
+        conn = pool.acquire()
+        try:
+            page_size = conn.execute('PRAGMA page_size').fetchone()[0]
+            free_before = conn.execute('PRAGMA freelist_count').fetchone()[0]
+            # executescript menjalankan pragma sampai selesai; execute() hanya melangkah sekali (satu halaman)
+            run_with_lock_retry(conn.executescript, f'PRAGMA incremental_vacuum({int(max_pages)});')
+            return (free_before - conn.execute('PRAGMA freelist_count').fetchone()[0]) * page_size
+        finally:
+            pool.release(conn)
+
+    def storage_stats(self):
+        row = self._query('SELECT (SELECT COUNT(*) FROM reminders) AS reminders, (SELECT COUNT(*) FROM reminders_archive) AS archived, '
+                          '(SELECT COUNT(*) FROM reminder_tombstones) AS tombstones')[0]
+        pages = self._query('SELECT * FROM pragma_page_count(), pragma_freelist_count(), pragma_page_size()')[0]
+        archive_bytes = self._query('PRAGMA archive.page_count')[0][0] * self._query('PRAGMA archive.page_size')[0][0]
+        return {'reminders': row['reminders'], 'archived': row['archived'], 'tombstones': row['tombstones'],
+                'file_bytes': pages[0] * pages[2], 'free_bytes': pages[1] * pages[2], 'archive_bytes': archive_bytes}
+
+
+class ShardedReminderStore(ReminderStore):
+    """Satu SQLiteReminderStore per shard; operasi per user diteruskan ke shard milik user itu."""
+
+    def __init__(self, stores, router):
+        self.stores = stores
+        self.router = router
+
+    @property
+    def shards(self):
+        return self.stores
+
+    def for_user(self, user_id):
+        return self.stores[self.router.shard_for_user(user_id)]
+
+    def add_many(self, user_id, rows):
+        return self.for_user(user_id).add_many(user_id, rows)
+
+    def list_by_user(self, user_id, *args, **kwargs):
+        return self.for_user(user_id).list_by_user(user_id, *args, **kwargs)
+
+    def range_by_user(self, user_id, *args, **kwargs):
+        return self.for_user(user_id).range_by_user(user_id, *args, **kwargs)
+
+    def recurring_before(self, user_id, *args, **kwargs):
+        return self.for_user(user_id).recurring_before(user_id, *args, **kwargs)
+
+    def changes_since(self, user_id, since):
+        return self.for_user(user_id).changes_since(user_id, since)
+
+    def user_version(self, user_id):
+        return self.for_user(user_id).user_version(user_id)
+
+    def user_versions(self, user_ids):
+        users_by_shard = {}
+        for user_id in user_ids:
+            users_by_shard.setdefault(self.router.shard_for_user(user_id), []).append(user_id)
+        versions = {}
+        for shard, shard_user_ids in users_by_shard.items():
+            versions.update(self.stores[shard].user_versions(shard_user_ids))
+        return versions
+
+    def due_events_between(self, version_ranges):
+        ranges_by_shard = {}
+        for user_id, version_range in version_ranges.items():
+            ranges_by_shard.setdefault(self.router.shard_for_user(user_id), {})[user_id] = version_range
+        return [event for shard, shard_ranges in ranges_by_shard.items() for event in self.stores[shard].due_events_between(shard_ranges)]
+
+    def delete(self, user_id, reminder_id):
+        return self.for_user(user_id).delete(user_id, reminder_id)
+
+    def delete_many(self, user_id, reminder_ids):
+        return self.for_user(user_id).delete_many(user_id, reminder_ids)
+
+    def delete_matching(self, user_id, *args, **kwargs):
+        return self.for_user(user_id).delete_matching(user_id, *args, **kwargs)
+
+    def reschedule_many(self, user_id, reminder_ids, new_datetime):
+        return self.for_user(user_id).reschedule_many(user_id, reminder_ids, new_datetime)
+
+    def snooze_many(self, user_id, reminder_ids, seconds, now_local):
+        return self.for_user(user_id).snooze_many(user_id, reminder_ids, seconds, now_local)
+
+    def archived_by_user(self, user_id, *args, **kwargs):
+        return self.for_user(user_id).archived_by_user(user_id, *args, **kwargs)
+
+    def next_due(self, limit):
+        # Gabungan daftar yang sudah terurut tetap terurut. Id bisa sama di shard berbeda;
+        # tidak masalah karena hasilnya hanya dipakai sebagai waktu bangun scheduler.
+        return list(itertools.islice(heapq.merge(*(store.next_due(limit) for store in self.stores)), limit))
+
+    def outboxes(self):
+        return [outbox for store in self.stores for outbox in store.outboxes()]
+
+
+def store_from_env(database_path):
+    if REMINDER_STORE == 'memory':
+        from memory_store import MemoryReminderStore
+        return MemoryReminderStore()
+    router = get_router(database_path)
+    if len(router.paths) == 1:
+        return SQLiteReminderStore(router.paths[0])
+    return ShardedReminderStore([SQLiteReminderStore(path) for path in router.paths], router)
@@ -0,0 +1,236 @@
+from collections import OrderedDict
+import os
+import threading
+import time
+
+# --- Cache Respons Endpoint Baca ---
+# Menyimpan body JSON yang sudah diserialisasi (bytes), dengan kunci user + versi + path + parameter.
+# Versi user ada di kunci, jadi worker lain tidak pernah menyajikan respons basi walau invalidasi
+# eksplisit (invalidate_user) hanya terjadi di proses yang melakukan penulisan; invalidasi itu
+# membebaskan memori lebih awal dan menjaga cache tetap tepat di dalam satu proses.
+RESPONSE_CACHE_ENABLED = os.environ.get('RESPONSE_CACHE', '1') == '1'
+RESPONSE_CACHE_MAX_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_BYTES', 64 * 1024 * 1024))
+# Respons yang lebih besar dari ini tetap di-stream tapi tidak disimpan
+RESPONSE_CACHE_MAX_ENTRY_BYTES = int(os.environ.get('RESPONSE_CACHE_MAX_ENTRY_BYTES', 2 * 1024 * 1024))
+# local (default): LRU per proses. shared: store bersama antar worker (Redis bila
+# RESPONSE_CACHE_REDIS_URL diset dan paket redis terpasang, selain itu LocalKeyValueStore)
+RESPONSE_CACHE_BACKEND = os.environ.get('RESPONSE_CACHE_BACKEND', 'local')
+RESPONSE_CACHE_REDIS_URL = os.environ.get('RESPONSE_CACHE_REDIS_URL')
+RESPONSE_CACHE_SHARED_TTL_SECONDS = int(os.environ.get('RESPONSE_CACHE_SHARED_TTL_SECONDS', 300))
+
+
+def cache_key(user_id, version, path, args):
+    """Kunci stabil: urutan parameter query tidak berpengaruh."""
+    query = '&'.join(f"{name}={value}" for name, value in sorted(args.items(multi=True)) if name != 'user_id')
+    return f"resp:{user_id}:{version}:{path}?{query}"
+
+
+class LocalLRUBackend:
+    """LRU di memori proses, dibatasi total bytes; indeks per user untuk invalidasi tepat."""
+
+    def __init__(self, max_bytes=RESPONSE_CACHE_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.total_bytes = 0
+        self.evictions = 0
+        self._entries = OrderedDict()  # key -> (user_id, body)
+        self._keys_by_user = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, user_id, key, body):
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (user_id, body)
+            self._keys_by_user.setdefault(user_id, set()).add(key)
+            self.total_bytes += len(body)
+            while self.total_bytes > self.max_bytes and self._entries:
+                self._remove(next(iter(self._entries)))
+                self.evictions += 1
+
+    def delete_user(self, user_id):
+        with self._lock:
+            keys = self._keys_by_user.pop(user_id, set())
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    def _remove(self, key):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        user_id, body = entry
+        self.total_bytes -= len(body)
+        user_keys = self._keys_by_user.get(user_id)
+        if user_keys is not None:
+            user_keys.discard(key)
+            if not user_keys:
+                del self._keys_by_user[user_id]
+
+    def entry_count(self):
+        return len(self._entries)
+
+
+class LocalKeyValueStore:
+    """
+    Pengganti lokal untuk store bersama: subset API klien redis-py (get, set dengan ex,
+    delete, sadd, smembers) di memori proses. Dipakai untuk pengembangan/benchmark tanpa Redis.
+    """
+
+    def __init__(self):
+        self._values = {}
+        self._sets = {}
+        self._lock = threading.Lock()
+
+    def get(self, name):
+        with self._lock:
+            item = self._values.get(name)
+            if item is None:
+                return None
+            value, expires_at = item
+            if expires_at is not None and expires_at <= time.time():
+                del self._values[name]
+                return None
+            return value
+
+    def set(self, name, value, ex=None):
+        with self._lock:
+            self._values[name] = (value, time.time() + ex if ex else None)
+        return True
+
+    def delete(self, *names):
+        with self._lock:
+            removed = 0
+            for name in names:
+                removed += (self._values.pop(name, None) is not None) + (self._sets.pop(name, None) is not None)
+            return removed
+
+    def sadd(self, name, *values):
+        with self._lock:
+            members = self._sets.setdefault(name, set())
+            before = len(members)
+            members.update(value.encode('utf-8') if isinstance(value, str) else value for value in values)
+            return len(members) - before
+
+    def smembers(self, name):
+        with self._lock:
+            return set(self._sets.get(name, ()))
+
+    def expire(self, name, seconds):
+        return True
+
+
+class SharedBackend:
+    """Cache bersama antar worker di atas store ala Redis; memori dibatasi oleh TTL/maxmemory store."""
+
+    evictions = 0
+
+    def __init__(self, store, ttl_seconds=RESPONSE_CACHE_SHARED_TTL_SECONDS):
+        self.store = store
+        self.ttl_seconds = ttl_seconds
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, user_id, key, body):
+        index_key = f"resp-keys:{user_id}"
+        self.store.set(key, body, ex=self.ttl_seconds)
+        self.store.sadd(index_key, key)
+        self.store.expire(index_key, self.ttl_seconds)
+
+    def delete_user(self, user_id):
+        index_key = f"resp-keys:{user_id}"
+        keys = [key.decode('utf-8') if isinstance(key, bytes) else key for key in self.store.smembers(index_key)]
+        if keys:
+            self.store.delete(*keys)
+        self.store.delete(index_key)
+        return len(keys)
+
+    @property
+    def total_bytes(self):
+        return None
+
+    def entry_count(self):
+        return None
+
+
+def backend_from_env():
+    if RESPONSE_CACHE_BACKEND != 'shared':
+        return LocalLRUBackend()
+    if RESPONSE_CACHE_REDIS_URL:
+        try:
+            import redis
+        except ImportError:
+            print("Paket redis tidak terpasang; cache respons memakai LocalKeyValueStore.")
+        else:
+            return SharedBackend(redis.Redis.from_url(RESPONSE_CACHE_REDIS_URL))
+    return SharedBackend(LocalKeyValueStore())
+
+
+class ResponseCache:
+    def __init__(self, backend=None, enabled=RESPONSE_CACHE_ENABLED, max_entry_bytes=RESPONSE_CACHE_MAX_ENTRY_BYTES):
+        self.backend = backend if backend is not None else backend_from_env()
+        self.enabled = enabled
+        self.max_entry_bytes = max_entry_bytes
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        if not self.enabled:
+            return None
+        body = self.backend.get(key)
+        with self._lock:
+            if body is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        return body
+
+    def set(self, user_id, key, body):
+        if self.enabled and len(body) <= self.max_entry_bytes:
+            self.backend.set(user_id, key, body)
+
+    def invalidate_user(self, user_id):
+        if not self.enabled:
+            return
+        removed = self.backend.delete_user(user_id)
+        with self._lock:
+            self.invalidations += removed
+
+    def tee(self, user_id, key, chunks):
+        """Teruskan potongan respons streaming, simpan ke cache bila total ukurannya muat."""
+        buffered = []
+        size = 0
+        for chunk in chunks:
+            if buffered is not None:
+                data = chunk.encode('utf-8') if isinstance(chunk, str) else chunk
+                size += len(data)
+                if size > self.max_entry_bytes:
+                    buffered = None
+                else:
+                    buffered.append(data)
+            yield chunk
+        if buffered is not None:
+            self.set(user_id, key, b''.join(buffered))
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "backend": type(self.backend).__name__,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "evictions": self.backend.evictions,
+                "invalidations": self.invalidations,
+                "entries": self.backend.entry_count(),
+                "bytes": self.backend.total_bytes,
+            }
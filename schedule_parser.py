@@ -0,0 +1,547 @@
+from collections import OrderedDict
+from datetime import datetime, timedelta
+import functools
+import itertools
+import os
+import re
+import threading
+import pytz
+
+from metrics import METRICS_ENABLED, PARSER_STAGE_SECONDS, REGISTRY, StageTimer
+
+# --- Parser Jadwal Terkompilasi (Regex-Only) ---
+# Semua pola dan peta kata kunci dibangun SEKALI per proses (parser_tables) dan dipakai bersama oleh
+# setiap ScheduleParser; objek zona waktu dimuat pytz saat singkatannya pertama kali muncul di teks.
+# Setiap tahap juga dilewati lewat cek substring murah bila kata kuncinya tidak ada di teks.
+# Tahap-tahap tetap mencari secara terpisah pada teks asli (token boleh tumpang tindih,
+# mis. "2 jam" cocok untuk waktu relatif DAN pola jam), sehingga output identik dengan versi lama.
+
+TIMEZONE_MAP = {
+    "wib": "Asia/Jakarta", "wita": "Asia/Makassar", "wit": "Asia/Jayapura",
+    "est": "America/New_York", "pst": "America/Los_Angeles", "gmt": "Etc/GMT",
+    "utc": "Etc/UTC", "gmt+7": "Etc/GMT-7", "gmt-7": "Etc/GMT+7"
+}
+LOCAL_TIMEZONE = pytz.timezone(os.environ.get('TZ', 'Asia/Jakarta'))
+
+WAKTU_SHOLAT_MAP = {
+    "subuh": (5, 0), "dzuhur": (12, 0), "ashar": (15, 0), "maghrib": (18, 0), "isya": (19, 30)
+}
+DATE_KEYWORDS = ["hari ini", "besok", "lusa", "minggu depan", "bulan depan"]
+DAY_OF_WEEK_MAP = {
+    "senin": 0, "selasa": 1, "rabu": 2, "kamis": 3, "jumat": 4, "sabtu": 5, "minggu": 6
+}
+BULAN_MAP = {
+    "januari": 1, "februari": 2, "maret": 3, "april": 4, "mei": 5, "juni": 6,
+    "juli": 7, "agustus": 8, "september": 9, "oktober": 10, "november": 11, "desember": 12
+}
+COMMON_FILLER_WORDS = {"untuk", "saya", "di", "pada", "jam", "pukul", "lagi", "kedepan"}
+
+# (kunci metadata, pola, kata kunci yang wajib ada agar pola bisa cocok)
+METADATA_PATTERNS = [
+    ("notes", r'(?:notes|catatan):\s*["“](.*?)[”"]|(?:notes|catatan):\s*(.+?)(?=\s*(?:mood:|suasana hati:|suggestion:|saran:|$))', ("notes:", "catatan:")),
+    ("mood", r'(?:mood|suasana hati):\s*([^\s]+)(?=\s*(?:notes:|catatan:|suggestion:|saran:|$))', ("mood:", "suasana hati:")),
+    ("suggestion", r'(?:suggestion|saran):\s*(.+)', ("suggestion:", "saran:")),
+    # Pola untuk aktivitas/item yang Anda sebutkan
+    ("activity_type", r'(gym|online course|reading|groceries|in-office day|standup|rapat|class|meeting)', None),
+    ("favorite_meals", r'(?:favorite meals|makanan favorit):\s*(.+)', ("favorite meals:", "makanan favorit:")),
+    ("coffee_preference", r'(?:coffee|kopi):\s*(.+)', ("coffee:", "kopi:")),
+]
+CONTENT_METADATA_KEYS = {"notes", "favorite_meals", "coffee_preference", "suggestion"}
+
+# Satu dari N parse diukur per tahap (0 = mati). Mengukur setiap parse menambah ~15% waktu parse.
+PARSER_STAGE_SAMPLE_EVERY = int(os.environ.get('PARSER_STAGE_SAMPLE_EVERY', 16)) if METRICS_ENABLED else 0
+# Jumlah fragmen berbeda yang hasil ekstraksinya disimpan (0 = tanpa cache)
+PARSE_CACHE_SIZE = int(os.environ.get('PARSE_CACHE_SIZE', 10000))
+
+
+def _keywords_absent(keywords, text_lower, is_ascii):
+    # Cek substring hanya aman untuk teks ASCII: re.IGNORECASE juga mencocokkan karakter Unicode
+    # seperti 'ſ' dengan 's', yang tidak tertangkap oleh str.lower().
+    return is_ascii and keywords is not None and not any(k in text_lower for k in keywords)
+
+
+class FragmentPlan:
+    """
+    Hasil regex satu fragmen, terlepas dari waktu sekarang: komponen tanggal/waktu yang ditemukan
+    (belum dihitung), pengulangan, metadata dan judul. `_resolve` menerapkannya pada `now`.
+    """
+    __slots__ = ('target_tz', 'relative_delta', 'sholat_time', 'after_sholat', 'clock_time', 'date_keyword', 'weekday',
+                 'explicit_date', 'time_extracted', 'date_extracted', 'event', 'repeat_type', 'repeat_interval', 'metadata')
+
+    def __init__(self):
+        self.target_tz = None       # zona dari teks; None = zona lokal
+        self.relative_delta = None  # "dalam 2 jam lagi" -> timedelta
+        self.sholat_time = None     # (jam, menit)
+        self.after_sholat = False
+        self.clock_time = None      # (jam, menit) dari "jam 7 pagi", "19:15"
+        self.date_keyword = None    # "besok", "lusa", ...
+        self.weekday = None         # 0 = Senin
+        self.explicit_date = None   # date dari "15 agustus 2026" / "1/2/2027"
+        self.time_extracted = False
+        self.date_extracted = False
+
+
+class ParseCache:
+    """
+    LRU teks fragmen -> FragmentPlan. Kuncinya teks persis (casing dipertahankan karena isi metadata
+    seperti notes disimpan apa adanya). Tanpa tanggal/menit di kunci: plan tidak bergantung pada waktu
+    sekarang, dan bentuk relatif ("dalam 2 jam lagi", "besok") dihitung ulang terhadap `now` setiap kali.
+    """
+
+    def __init__(self, max_entries=PARSE_CACHE_SIZE):
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, text_fragment):
+        with self._lock:
+            plan = self._entries.get(text_fragment)
+            if plan is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._entries.move_to_end(text_fragment)
+            return plan
+
+    def put(self, text_fragment, plan):
+        with self._lock:
+            self._entries[text_fragment] = plan
+            self._entries.move_to_end(text_fragment)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self):
+        lookups = self.hits + self.misses
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses, "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0}
+
+
+class ParserTables:
+    """Regex terkompilasi parser untuk satu daftar singkatan zona waktu (lihat parser_tables)."""
+
+    def __init__(self, timezone_abbreviations):
+        tz_pattern = r'\b(' + '|'.join(re.escape(k) for k in timezone_abbreviations) + r')\b'
+        self.tz_re = re.compile(tz_pattern, re.IGNORECASE)
+        self.digit_re = re.compile(r'\d')
+        self.relative_time_re = re.compile(r'\b(dalam\s+)?(\d+)\s*(jam|menit)\s*(lagi|ke\s+depan)?\b', re.IGNORECASE)
+        self.sholat_res = {name: re.compile(re.escape(name), re.IGNORECASE) for name in WAKTU_SHOLAT_MAP}
+        self.time_re = re.compile(r'\b(jam |pukul )?(\d{1,2}([\.:]\d{2})?)\s*(pagi|siang|sore|malam|am|pm)?\b', re.IGNORECASE)
+        self.date_keyword_res = {k: re.compile(re.escape(k), re.IGNORECASE) for k in DATE_KEYWORDS}
+        self.day_name_res = {name: re.compile(re.escape(name), re.IGNORECASE) for name in DAY_OF_WEEK_MAP}
+        self.date_re = re.compile(
+            r'\b(\d{1,2}) (januari|februari|maret|april|mei|juni|juli|agustus|september|oktober|november|desember) (\d{4})\b|\b(\d{1,2})/(\d{1,2})/(\d{4})\b',
+            re.IGNORECASE)
+
+        # Pola pengulangan dicari TANPA IGNORECASE pada teks lowercase, tapi dihapus DENGAN IGNORECASE
+        monthly = r'(?:setiap|tiap)\s*(\d+)\s*bulan|(?:(\d+)\s*bulan\s*kedepan)'
+        yearly = r'(?:setiap|tiap)\s*(\d+)\s*tahun|(?:(\d+)\s*tahun\s*kedepan)'
+        self.monthly_search_re = re.compile(monthly)
+        self.monthly_sub_re = re.compile(monthly, re.IGNORECASE)
+        self.yearly_search_re = re.compile(yearly)
+        self.yearly_sub_re = re.compile(yearly, re.IGNORECASE)
+        self.yearly_plain_sub_re = re.compile(r'setiap tahun|tiap tahun', re.IGNORECASE)
+        self.daily_sub_re = re.compile(r'daily|setiap hari|tiap hari', re.IGNORECASE)
+        self.mon_wed_fri_re = re.compile(r'mon/wed/fri', re.IGNORECASE)
+        self.metadata_res = [(key, re.compile(pattern, re.IGNORECASE), keywords) for key, pattern, keywords in METADATA_PATTERNS]
+        self.whitespace_re = re.compile(r'\s+')
+        self.digits_only_re = re.compile(r'^\d+$')
+
+
+@functools.lru_cache(maxsize=None)
+def parser_tables(timezone_abbreviations):
+    """Tabel dibangun sekali per proses per daftar singkatan; instance ScheduleParser berikutnya tidak mengompilasi ulang."""
+    return ParserTables(timezone_abbreviations)
+
+
+class ScheduleParser:
+    """Parser satu fragmen teks pengingat, dengan semua tabel dan regex yang sudah dikompilasi."""
+
+    def __init__(self, timezone_map=TIMEZONE_MAP, local_timezone=LOCAL_TIMEZONE, stage_sample_every=PARSER_STAGE_SAMPLE_EVERY,
+                 cache_size=PARSE_CACHE_SIZE):
+        self.local_timezone = local_timezone
+        self.cache = ParseCache(cache_size) if cache_size > 0 else None
+        # Waktu per tahap (zona, jam, tanggal, pengulangan, metadata, resolve) ke parser_stage_duration_seconds
+        self.stage_sample_every = stage_sample_every
+        self._parse_counter = itertools.count()
+        self.timezone_map = dict(timezone_map)
+        self.timezones = {}  # singkatan -> tzinfo (None bila tidak dikenal), diisi oleh _timezone
+        self.tables = parser_tables(tuple(timezone_map))
+
+    def _timezone(self, abbr):
+        """Zona untuk singkatan dari teks; dimuat saat pertama kali dipakai sehingga boot tidak membaca file zona."""
+        try:
+            return self.timezones[abbr]
+        except KeyError:
+            pass
+        try:
+            zone = pytz.timezone(self.timezone_map[abbr])
+        except (KeyError, pytz.UnknownTimeZoneError):
+            zone = None
+        self.timezones[abbr] = zone
+        return zone
+
+    def parse(self, text_fragment, now_local_context):
+        """
+        Mencoba menguraikan satu pengingat dari fragmen teks menggunakan HANYA regex.
+        `now_local_context` digunakan untuk tanggal/waktu relatif.
+        """
+        lap = None
+        if self.stage_sample_every and not next(self._parse_counter) % self.stage_sample_every:
+            lap = StageTimer(PARSER_STAGE_SECONDS).lap
+        plan = self.cache.get(text_fragment) if self.cache is not None else None
+        if plan is None:
+            plan = self._extract(text_fragment, lap)
+            if self.cache is not None:
+                self.cache.put(text_fragment, plan)
+        return self._resolve(plan, now_local_context, lap)
+
+    def _extract(self, text_fragment, lap):
+        """
+        Semua pencocokan regex untuk satu fragmen, tanpa bergantung pada waktu sekarang.
+        Hasilnya (FragmentPlan) aman di-cache per teks dan dihitung ulang terhadap `now` oleh _resolve.
+        """
+        tables = self.tables
+        original_text_lower = text_fragment.lower()
+        is_ascii = original_text_lower.isascii()
+        has_digit = tables.digit_re.search(original_text_lower) is not None
+        processed_text = text_fragment # Pertahankan casing asli untuk ekstraksi metadata jika perlu
+        plan = FragmentPlan()
+
+        # --- 1. Ekstraksi Zona Waktu ---
+        tz_match = tables.tz_re.search(original_text_lower)
+        if tz_match:
+            plan.target_tz = self._timezone(tz_match.group(1).lower())
+            if plan.target_tz is not None:
+                processed_text = tables.tz_re.sub('', processed_text).strip()
+        if lap: lap('timezone')
+
+        # --- 2. Ekstraksi Tanggal dan Waktu ---
+
+        # Ekstraksi relatif waktu (dalam jam/menit lagi)
+        relative_time_match = tables.relative_time_re.search(original_text_lower) if has_digit else None
+        if relative_time_match:
+            value = int(relative_time_match.group(2))
+            unit = relative_time_match.group(3)
+            if unit == "jam":
+                plan.relative_delta = timedelta(hours=value)
+            elif unit == "menit":
+                plan.relative_delta = timedelta(minutes=value)
+            processed_text = tables.relative_time_re.sub('', processed_text).strip()
+            plan.time_extracted = True
+
+        # Ekstraksi waktu sholat
+        for sholat_name, (hour, minute) in WAKTU_SHOLAT_MAP.items():
+            if sholat_name in original_text_lower:
+                plan.sholat_time = (hour, minute)
+                processed_text = tables.sholat_res[sholat_name].sub('', processed_text).strip()
+                if f"setelah {sholat_name}" in original_text_lower:
+                    plan.after_sholat = True
+                    processed_text = processed_text.replace(f"setelah {sholat_name}", "").strip()
+                plan.time_extracted = True
+                break
+
+        # Ekstraksi waktu spesifik (jam:menit)
+        time_match_regex = tables.time_re.search(original_text_lower) if has_digit else None
+        if time_match_regex:
+            try:
+                time_str_raw = time_match_regex.group(2)
+                ampm_str = (time_match_regex.group(4) or '').lower()
+                hour_extracted, minute_extracted = (map(int, time_str_raw.split(':')) if ':' in time_str_raw else
+                                                    map(int, time_str_raw.split('.')) if '.' in time_str_raw else
+                                                    (int(time_str_raw), 0))
+                if 'pagi' in ampm_str:
+                    if hour_extracted == 12: hour_extracted = 0
+                elif 'siang' in ampm_str:
+                    if hour_extracted < 12: hour_extracted += 12
+                elif 'sore' in ampm_str or 'pm' in ampm_str:
+                    if hour_extracted < 12: hour_extracted += 12
+                elif 'malam' in ampm_str:
+                    if hour_extracted < 12: hour_extracted += 12
+                    if hour_extracted == 24: hour_extracted = 0
+
+                if not (0 <= hour_extracted <= 23 and 0 <= minute_extracted <= 59):
+                    raise ValueError("Invalid time")
+
+                plan.clock_time = (hour_extracted, minute_extracted)
+                processed_text = tables.time_re.sub('', processed_text).strip()
+                plan.time_extracted = True
+            except (ValueError, TypeError):
+                pass
+        if lap: lap('time')
+
+        # Ekstraksi keyword tanggal (hari ini, besok, dll.)
+        for keyword in DATE_KEYWORDS:
+            if keyword in original_text_lower:
+                plan.date_keyword = keyword
+                processed_text = tables.date_keyword_res[keyword].sub('', processed_text).strip()
+                plan.date_extracted = True
+                break
+
+        # Ekstraksi hari dalam seminggu
+        for day_name, day_num in DAY_OF_WEEK_MAP.items():
+            if day_name in original_text_lower:
+                plan.weekday = day_num
+                processed_text = tables.day_name_res[day_name].sub('', processed_text).strip()
+                plan.date_extracted = True
+                break
+
+        # Ekstraksi tanggal spesifik (DD Month YYYY atau DD/MM/YYYY)
+        date_match_regex = tables.date_re.search(original_text_lower) if has_digit else None
+        if date_match_regex:
+            try:
+                parsed_date = None
+                if date_match_regex.group(2):
+                    day_str, month_name, year_str = date_match_regex.group(1, 2, 3)
+                    month_num = BULAN_MAP.get(month_name.lower())
+                    if month_num:
+                        parsed_date = datetime(int(year_str), month_num, int(day_str)).date()
+                elif date_match_regex.group(4):
+                    day_str, month_str, year_str = date_match_regex.group(4, 5, 6)
+                    parsed_date = datetime(int(year_str), int(month_str), int(day_str)).date()
+
+                if parsed_date:
+                    plan.explicit_date = parsed_date
+                    processed_text = tables.date_re.sub('', processed_text).strip()
+                    plan.date_extracted = True
+            except (ValueError, TypeError):
+                pass
+        if lap: lap('date')
+
+        # --- 3. Ekstraksi Pengulangan & Metadata Terstruktur ---
+        repeat_type = "none"
+        repeat_interval = 0
+        metadata = {}
+
+        if "bulan" in original_text_lower:
+            monthly_repeat_match = tables.monthly_search_re.search(original_text_lower)
+            if monthly_repeat_match:
+                repeat_type = "monthly_interval"
+                repeat_interval = int(monthly_repeat_match.group(1) or monthly_repeat_match.group(2))
+                processed_text = tables.monthly_sub_re.sub('', processed_text).strip()
+
+        if "tahun" in original_text_lower:
+            yearly_repeat_match_explicit = tables.yearly_search_re.search(original_text_lower)
+            if yearly_repeat_match_explicit:
+                repeat_type = "yearly"
+                repeat_interval = int(yearly_repeat_match_explicit.group(1) or yearly_repeat_match_explicit.group(2))
+                processed_text = tables.yearly_sub_re.sub('', processed_text).strip()
+            elif "setiap tahun" in original_text_lower or "tiap tahun" in original_text_lower:
+                repeat_type = "yearly"
+                repeat_interval = 1
+                processed_text = tables.yearly_plain_sub_re.sub('', processed_text).strip()
+
+        if "daily" in original_text_lower or "setiap hari" in original_text_lower or "tiap hari" in original_text_lower:
+            repeat_type = "daily"
+            repeat_interval = 1
+            processed_text = tables.daily_sub_re.sub('', processed_text).strip()
+
+        if "mon/wed/fri" in original_text_lower or not is_ascii:
+            mon_wed_fri_match = tables.mon_wed_fri_re.search(original_text_lower)
+            if mon_wed_fri_match:
+                repeat_type = "weekly_custom" # Ini perlu logika lebih kompleks di scheduler
+                metadata["repeat_days"] = "Mon,Wed,Fri"
+                processed_text = processed_text.replace(mon_wed_fri_match.group(0), "").strip()
+
+        for day_name_key, day_num_val in DAY_OF_WEEK_MAP.items():
+            if f"{day_name_key}s" in original_text_lower: # For "Sundays", "Tuesdays"
+                repeat_type = "weekly"
+                repeat_interval = day_num_val # Store the weekday number (0=Mon, 6=Sun)
+                processed_text = processed_text.replace(f"{day_name_key}s", "").strip()
+                break
+        if lap: lap('recurrence')
+
+        temp_processed_text_for_metadata = processed_text # Salinan untuk ekstraksi metadata
+        temp_lower = temp_processed_text_for_metadata.lower()
+        for key, pattern_re, keywords in tables.metadata_res:
+            if _keywords_absent(keywords, temp_lower, is_ascii):
+                continue
+            match = pattern_re.search(temp_processed_text_for_metadata)
+            if match:
+                if key in CONTENT_METADATA_KEYS:
+                    content = (match.group(1) or match.group(2) or match.group(0).split(':', 1)[1]).strip('"“’”').strip()
+                else: # mood, activity_type
+                    content = match.group(1).strip()
+
+                metadata[key] = content
+                temp_processed_text_for_metadata = pattern_re.sub('', temp_processed_text_for_metadata).strip()
+                temp_lower = temp_processed_text_for_metadata.lower()
+
+        # Bersihkan sisa temp_processed_text_for_metadata setelah semua metadata diekstrak
+        clean_remaining_text = tables.whitespace_re.sub(' ', temp_processed_text_for_metadata).strip()
+
+        # Tentukan event_title (prioritas dari activity_type atau kata pertama yang tersisa)
+        event_title = "Pengingat"
+
+        if 'activity_type' in metadata:
+            event_title = metadata['activity_type'].capitalize()
+        elif clean_remaining_text:
+            # Filter kata-kata umum yang sering tersisa dan bukan event
+            potential_event_words = [word for word in clean_remaining_text.split() if word.lower() not in COMMON_FILLER_WORDS]
+            if potential_event_words:
+                event_title = potential_event_words[0].capitalize()
+
+        # Pastikan event_title tidak kosong atau hanya angka
+        if not event_title or tables.digits_only_re.match(event_title):
+            event_title = "Pengingat"
+            if clean_remaining_text and clean_remaining_text.lower() != "pengingat":
+                metadata["description_fallback"] = clean_remaining_text
+        if lap: lap('metadata')
+
+        plan.event = event_title
+        plan.repeat_type = repeat_type
+        plan.repeat_interval = repeat_interval
+        plan.metadata = metadata
+        return plan
+
+    def _resolve(self, plan, now_local_context, lap):
+        """Terapkan FragmentPlan pada `now_local_context`: urutan aturan tanggal/waktu sama seperti saat ekstraksi."""
+        scheduled_datetime_aware = now_local_context
+        if plan.relative_delta is not None:
+            scheduled_datetime_aware = now_local_context + plan.relative_delta
+
+        if plan.sholat_time is not None:
+            hour, minute = plan.sholat_time
+            temp_time = scheduled_datetime_aware.replace(hour=hour, minute=minute, second=0, microsecond=0, tzinfo=scheduled_datetime_aware.tzinfo)
+            if temp_time < now_local_context and temp_time.date() == scheduled_datetime_aware.date():
+                temp_time += timedelta(days=1)
+            scheduled_datetime_aware = temp_time
+            if plan.after_sholat:
+                scheduled_datetime_aware += timedelta(minutes=30)
+
+        if plan.clock_time is not None:
+            hour_extracted, minute_extracted = plan.clock_time
+            temp_datetime = scheduled_datetime_aware.replace(hour=hour_extracted, minute=minute_extracted, second=0, microsecond=0, tzinfo=scheduled_datetime_aware.tzinfo)
+            # Jika waktu yang diekstrak sudah lewat hari ini, majukan ke besok
+            if temp_datetime < now_local_context and temp_datetime.date() == scheduled_datetime_aware.date():
+                temp_datetime += timedelta(days=1)
+            scheduled_datetime_aware = temp_datetime
+
+        # Tanggal hanya dihitung untuk keyword yang ditemukan
+        if plan.date_keyword is not None:
+            date_obj = self._date_for_keyword(plan.date_keyword, now_local_context)
+            scheduled_datetime_aware = scheduled_datetime_aware.replace(year=date_obj.year, month=date_obj.month, day=date_obj.day, tzinfo=scheduled_datetime_aware.tzinfo)
+
+        if plan.weekday is not None:
+            days_ahead = (plan.weekday - now_local_context.weekday() + 7) % 7
+
+            # Jika hari yang disebutkan adalah hari ini, dan waktu sudah lewat, majukan ke minggu depan
+            if days_ahead == 0 and scheduled_datetime_aware.time() < now_local_context.time() and not plan.time_extracted:
+                days_ahead = 7
+
+            target_date = scheduled_datetime_aware.date() + timedelta(days=days_ahead)
+            scheduled_datetime_aware = scheduled_datetime_aware.replace(year=target_date.year, month=target_date.month, day=target_date.day, tzinfo=scheduled_datetime_aware.tzinfo)
+
+        if plan.explicit_date is not None:
+            parsed_date = plan.explicit_date
+            scheduled_datetime_aware = scheduled_datetime_aware.replace(year=parsed_date.year, month=parsed_date.month, day=parsed_date.day, tzinfo=scheduled_datetime_aware.tzinfo)
+
+        # Default ke 9 pagi jika TIDAK ADA waktu yang terdeteksi sama sekali
+        if not plan.time_extracted:
+            temp_time = scheduled_datetime_aware.replace(hour=9, minute=0, second=0, microsecond=0, tzinfo=scheduled_datetime_aware.tzinfo)
+            # Jika default 9 AM adalah di masa lalu untuk hari ini, majukan ke besok
+            if temp_time < now_local_context and not plan.date_extracted: # Hanya majukan jika tanggal tidak spesifik
+                temp_time += timedelta(days=1)
+            scheduled_datetime_aware = temp_time
+
+        # --- 4. Validasi Akhir dan Konversi Zona Waktu ---
+        tolerance = timedelta(seconds=5) # Beri sedikit toleransi untuk waktu sekarang
+
+        if plan.target_tz is not None:
+            scheduled_datetime_naive_temp = scheduled_datetime_aware.replace(tzinfo=None)
+            scheduled_datetime_localized_target = plan.target_tz.localize(scheduled_datetime_naive_temp)
+            scheduled_datetime_final = scheduled_datetime_localized_target.astimezone(self.local_timezone)
+        else:
+            scheduled_datetime_final = scheduled_datetime_aware
+
+        # Jika waktu yang dihasilkan sudah lewat dari sekarang (dengan toleransi):
+        # tanpa tanggal spesifik -> majukan ke besok; dengan tanggal spesifik di masa lalu -> tolak.
+        # (waktu selalu ada di titik ini karena default jam 9 sudah diterapkan.)
+        if scheduled_datetime_final < now_local_context - tolerance:
+            if not plan.date_extracted:
+                scheduled_datetime_final += timedelta(days=1)
+            else:
+                if lap: lap('resolve')
+                return None # Jangan buat pengingat di masa lalu
+        if lap: lap('resolve')
+
+        return {
+            "event": plan.event,
+            "datetime": scheduled_datetime_final,
+            "repeat_type": plan.repeat_type,
+            "repeat_interval": plan.repeat_interval,
+            # Salinan: plan yang sama dipakai ulang oleh cache
+            "metadata": dict(plan.metadata)
+        }
+
+    @staticmethod
+    def _date_for_keyword(keyword, now_local_context):
+        if keyword == "hari ini":
+            return now_local_context.date()
+        elif keyword == "besok":
+            return (now_local_context + timedelta(days=1)).date()
+        elif keyword == "lusa":
+            return (now_local_context + timedelta(days=2)).date()
+        elif keyword == "minggu depan":
+            return (now_local_context + timedelta(weeks=1)).date()
+        # "bulan depan"
+        return (now_local_context.replace(day=1) + timedelta(days=32)).replace(day=now_local_context.day).date()
+
+
+# Dibangun sekali saat import dan dipakai bersama oleh semua request
+SCHEDULE_PARSER = ScheduleParser()
+
+if SCHEDULE_PARSER.cache is not None:
+    _parse_cache = SCHEDULE_PARSER.cache
+    REGISTRY.callback('parser_cache_lookups_total', 'Lookup cache hasil parse, per hasil (hit/miss).', 'counter', ('result',),
+                      lambda: {('hit',): _parse_cache.hits, ('miss',): _parse_cache.misses})
+    REGISTRY.callback('parser_cache_evictions_total', 'Entri cache parse yang tersingkir oleh LRU.', 'counter', (),
+                      lambda: {(): _parse_cache.evictions})
+    REGISTRY.callback('parser_cache_entries', 'Jumlah fragmen di cache parse.', 'gauge', (),
+                      lambda: {(): len(_parse_cache)})
+
+
+# --- Parsing Paralel untuk Catatan Besar ---
+# Regex parsing terikat CPU; untuk impor sangat besar potongan baris dibagikan ke process pool bersama.
+# Di bawah PARSE_POOL_THRESHOLD baris, parsing tetap inline (biaya kirim-terima antar proses lebih mahal).
+PARSE_POOL_THRESHOLD = int(os.environ.get('PARSE_POOL_THRESHOLD', 2000))
+PARSE_POOL_CHUNK_SIZE = int(os.environ.get('PARSE_POOL_CHUNK_SIZE', 500))
+PARSE_POOL_WORKERS = int(os.environ.get('PARSE_POOL_WORKERS', os.cpu_count() or 1))
+
+_parse_pool = None
+_parse_pool_lock = threading.Lock()
+
+def get_parse_pool():
+    """ProcessPoolExecutor bersama, dibuat saat pertama kali dibutuhkan."""
+    global _parse_pool
+    with _parse_pool_lock:
+        if _parse_pool is None:
+            # Diimport di sini: multiprocessing hanya dimuat oleh worker yang benar-benar memakai pool
+            from concurrent.futures import ProcessPoolExecutor
+            import multiprocessing
+            # 'spawn' agar proses anak tidak mewarisi lock/thread (scheduler, koneksi DB) dari worker web
+            _parse_pool = ProcessPoolExecutor(max_workers=PARSE_POOL_WORKERS,
+                                              mp_context=multiprocessing.get_context('spawn'))
+        return _parse_pool
+
+def parse_chunk(lines, now_local_context):
+    return [SCHEDULE_PARSER.parse(line_text, now_local_context) for line_text in lines]
+
+def parse_lines(lines, now_local_context, parallel=False, chunk_size=PARSE_POOL_CHUNK_SIZE):
+    """
+    Urai setiap baris dengan snapshot `now_local_context` yang sama; hasil berurutan sesuai input.
+    Dengan parallel=True dan jumlah baris >= PARSE_POOL_THRESHOLD, potongan baris dikerjakan di process pool.
+    """
+    if not parallel or len(lines) < PARSE_POOL_THRESHOLD:
+        return parse_chunk(lines, now_local_context)
+    chunks = [lines[i:i + chunk_size] for i in range(0, len(lines), chunk_size)]
+    results = []
+    for chunk_result in get_parse_pool().map(parse_chunk, chunks, [now_local_context] * len(chunks)):
+        results.extend(chunk_result)
+    return results
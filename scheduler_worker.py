@@ -0,0 +1,83 @@
+"""
+Proses scheduler mandiri, terpisah dari worker web.
+
+    python -m database                                   # migrasi skema, sebelum proses lain
+    SCHEDULER_MODE=off gunicorn 'app:create_app()' ...   # worker web tanpa scheduler
+    python -m scheduler_worker                           # loop pengingat jatuh tempo
+    python -m scheduler_worker --instances 2             # supervisor: 2 instance, dimulai ulang bila berhenti
+
+Beberapa instance boleh berjalan bersamaan; hanya pemegang lease yang memproses pengingat,
+yang lain menjadi cadangan dan mengambil alih dalam hitungan detik bila leader mati.
+Dengan --instances, proses ini hanya mengawasi: instance yang berhenti (crash) dimulai ulang
+sebagai cadangan baru, sementara cadangan yang ada mengambil alih lease.
+"""
+import argparse
+import signal
+import subprocess
+import sys
+import threading
+
+import app
+
+
+# Jeda pemeriksaan supervisor; instance yang crash terus-menerus dimulai ulang paling sering sekali per jeda
+SUPERVISOR_POLL_SECONDS = 1.0
+
+
+def run_worker():
+    # Periksa versi skema (migrasi: `python -m database`); scheduler dimulai di bawah apa pun SCHEDULER_MODE-nya
+    app.create_app()
+
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+
+    app.start_scheduler()
+    print(f"Scheduler worker berjalan ({app.leader_lease.holder}).")
+    stop_event.wait()
+
+    app.get_scheduler().shutdown(wait=True)
+    app.dispatcher.stop()
+    app.leader_lease.release()
+    print("Scheduler worker berhenti.")
+
+
+def supervise(instances):
+    """Jaga `instances` proses scheduler_worker tetap hidup sampai SIGTERM/SIGINT, lalu hentikan semuanya."""
+    if instances <= 0:
+        return
+    stop_event = threading.Event()
+    signal.signal(signal.SIGTERM, lambda signum, frame: stop_event.set())
+    signal.signal(signal.SIGINT, lambda signum, frame: stop_event.set())
+
+    command = [sys.executable, '-m', 'scheduler_worker']
+    processes = [None] * instances
+    while not stop_event.is_set():
+        for index, process in enumerate(processes):
+            if process is not None and process.poll() is None:
+                continue
+            if process is not None:
+                print(f"Scheduler worker {process.pid} berhenti (kode {process.returncode}); dimulai ulang.")
+            processes[index] = subprocess.Popen(command)
+        stop_event.wait(SUPERVISOR_POLL_SECONDS)
+
+    for process in processes:
+        if process.poll() is None:
+            process.terminate()
+    for process in processes:
+        process.wait()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Proses scheduler mandiri (loop pengingat jatuh tempo).')
+    parser.add_argument('--instances', type=int,
+                        help='jalankan dan awasi N instance (leader + cadangan); 0: tidak menjalankan apa pun')
+    args = parser.parse_args()
+    if args.instances is not None:
+        supervise(args.instances)
+    else:
+        run_worker()
+
+
+if __name__ == '__main__':
+    main()
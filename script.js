@@ -53,34 +53,59 @@ document.addEventListener('DOMContentLoaded', function() {
     }
 
     // --- Core Reminder List Functions ---
+    // Salinan lokal daftar pengingat, disinkronkan secara delta lewat /sync_reminders
+    const reminderCache = new Map();
+    let syncVersion = 0;
+
     async function fetchReminders() {
-        reminderListDiv.innerHTML = '<p class="loading">Memuat pengingat...</p>';
+        if (syncVersion === 0) {
+            reminderListDiv.innerHTML = '<p class="loading">Memuat pengingat...</p>';
+        }
         try {
-            const response = await fetch(`/get_reminders?user_id=${userId}`);
-            const reminders = await response.json();
+            const headers = syncVersion > 0 ? { 'If-None-Match': `"${syncVersion}"` } : {};
+            const response = await fetch(`/sync_reminders?user_id=${userId}&since=${syncVersion}`, { headers, cache: 'no-store' });
 
-            if (response.status !== 200 && reminders.success === false) {
-                 reminderListDiv.innerHTML = `<p class="error">Gagal memuat pengingat: ${reminders.message}</p>`;
-                 return;
+            if (response.status === 304) {
+                return; // Tidak ada perubahan sejak sinkronisasi terakhir
             }
 
-            reminderListDiv.innerHTML = ''; 
+            const delta = await response.json();
 
-            if (reminders.length === 0) {
-                reminderListDiv.innerHTML = '<p class="no-reminders">Belum ada pengingat terjadwal.</p>';
-                return;
+            if (response.status !== 200 && delta.success === false) {
+                 reminderListDiv.innerHTML = `<p class="error">Gagal memuat pengingat: ${delta.message}</p>`;
+                 return;
             }
 
-            reminders.forEach(r => {
-                const reminderItem = createReminderDisplayElement(r); // Gunakan fungsi baru
-                reminderListDiv.appendChild(reminderItem);
-            });
+            if (delta.full) {
+                reminderCache.clear();
+            }
+            delta.deleted.forEach(id => reminderCache.delete(id));
+            delta.changed.forEach(r => reminderCache.set(r.id, r));
+            syncVersion = delta.version;
+
+            renderReminderList();
         } catch (error) {
             console.error('Error fetching reminders:', error);
             reminderListDiv.innerHTML = '<p class="error">Gagal memuat pengingat. Silakan coba lagi.</p>';
         }
     }
 
+    function renderReminderList() {
+        reminderListDiv.innerHTML = ''; 
+
+        if (reminderCache.size === 0) {
+            reminderListDiv.innerHTML = '<p class="no-reminders">Belum ada pengingat terjadwal.</p>';
+            return;
+        }
+
+        const reminders = Array.from(reminderCache.values())
+            .sort((a, b) => new Date(a.datetime).getTime() - new Date(b.datetime).getTime() || a.id - b.id);
+        reminders.forEach(r => {
+            const reminderItem = createReminderDisplayElement(r); // Gunakan fungsi baru
+            reminderListDiv.appendChild(reminderItem);
+        });
+    }
+
     // Fungsi untuk membuat elemen tampilan pengingat dengan detail
     function createReminderDisplayElement(r, isCalendarDetail = false) {
         const reminderItem = document.createElement('div');
@@ -222,14 +247,15 @@ document.addEventListener('DOMContentLoaded', function() {
         const daysInMonth = new Date(year, month + 1, 0).getDate();
         const startDay = firstDayOfMonth.getDay(); 
 
-        let monthlyReminders = [];
+        // Jumlah kemunculan per tanggal (seri berulang sudah dijabarkan di server)
+        let dayCounts = {};
         try {
-            const response = await fetch(`/get_reminders_for_month?year=${year}&month=${month + 1}&user_id=${userId}`);
+            const response = await fetch(`/get_calendar_month?year=${year}&month=${month + 1}&user_id=${userId}`);
             if (response.status !== 200) {
                 console.error('Failed to fetch monthly reminders. Status:', response.status);
                 return;
             }
-            monthlyReminders = await response.json();
+            dayCounts = (await response.json()).days;
         } catch (error) {
             console.error('Error fetching monthly reminders:', error);
         }
@@ -251,14 +277,12 @@ document.addEventListener('DOMContentLoaded', function() {
             dayNumberSpan.textContent = day;
             dayElement.appendChild(dayNumberSpan);
 
-            const remindersOnThisDay = monthlyReminders.filter(r => {
-                return r.date === dayElement.dataset.date;
-            });
+            const remindersOnThisDay = dayCounts[dayElement.dataset.date] || 0;
 
-            if (remindersOnThisDay.length > 0) {
+            if (remindersOnThisDay > 0) {
                 const marker = document.createElement('div');
                 marker.className = 'reminder-marker';
-                if (remindersOnThisDay.length > 1) {
+                if (remindersOnThisDay > 1) {
                     marker.classList.add('multi');
                 }
                 dayElement.appendChild(marker);
@@ -287,19 +311,15 @@ document.addEventListener('DOMContentLoaded', function() {
     async function showRemindersForSelectedDate(dateString) {
         selectedDateRemindersDiv.innerHTML = '<p class="loading">Memuat pengingat...</p>';
         try {
-            const response = await fetch(`/get_reminders?user_id=${userId}`); 
-            const allReminders = await response.json();
+            // Hanya kemunculan pada tanggal ini (sudah terurut), bukan seluruh daftar pengingat
+            const response = await fetch(`/get_calendar_day?date=${dateString}&user_id=${userId}`); 
+            const remindersOnThisDate = await response.json();
 
-            if (response.status !== 200 && allReminders.success === false) {
-                 selectedDateRemindersDiv.innerHTML = `<p class="error">Gagal memuat pengingat: ${allReminders.message}</p>`;
+            if (response.status !== 200) {
+                 selectedDateRemindersDiv.innerHTML = `<p class="error">Gagal memuat pengingat: ${remindersOnThisDate.error || remindersOnThisDate.message}</p>`;
                  return;
             }
 
-            const remindersOnThisDate = allReminders.filter(r => {
-                const reminderDate = new Date(r.datetime).toISOString().slice(0, 10); 
-                return reminderDate === dateString;
-            });
-
             selectedDateRemindersDiv.innerHTML = '';
 
             if (remindersOnThisDate.length === 0) {
@@ -307,12 +327,6 @@ document.addEventListener('DOMContentLoaded', function() {
                 return;
             }
 
-            remindersOnThisDate.sort((a, b) => {
-                const timeA = new Date(a.datetime).getTime();
-                const timeB = new Date(b.datetime).getTime();
-                return timeA - timeB;
-            });
-
             remindersOnThisDate.forEach(r => {
                 const reminderItem = createReminderDisplayElement(r, true); 
                 selectedDateRemindersDiv.appendChild(reminderItem);
@@ -355,11 +369,35 @@ document.addEventListener('DOMContentLoaded', function() {
     fetchReminders(); 
     renderCalendar(currentMonth, currentYear); 
 
-    setInterval(() => {
+    function refreshAll() {
         fetchReminders();
         renderCalendar(currentMonth, currentYear);
         if (selectedCalendarDate) {
             showRemindersForSelectedDate(selectedCalendarDate);
         }
+    }
+
+    // Push dari server lewat Server-Sent Events; polling hanya sebagai cadangan bila stream putus
+    let eventStreamConnected = false;
+    if (window.EventSource) {
+        const eventSource = new EventSource(`/events?user_id=${userId}`);
+        eventSource.addEventListener('open', () => { eventStreamConnected = true; });
+        eventSource.addEventListener('error', () => { eventStreamConnected = false; });
+        eventSource.addEventListener('changed', event => {
+            const { version } = JSON.parse(event.data);
+            if (version !== syncVersion) {
+                refreshAll();
+            }
+        });
+        eventSource.addEventListener('due', event => {
+            const reminder = JSON.parse(event.data);
+            console.log('Pengingat jatuh tempo:', reminder.event, reminder.datetime);
+        });
+    }
+
+    setInterval(() => {
+        if (!eventStreamConnected) {
+            refreshAll();
+        }
     }, 10000); 
 });
@@ -0,0 +1,27 @@
+import pytest
+
+import app
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Validasi terjadi sebelum store disentuh: tanpa database maupun scheduler
+    monkeypatch.setattr(app, '_app_ready', True)
+    return app.app.test_client()
+
+
+@pytest.mark.parametrize('value', [['gym'], {'$ne': 'x'}, 3, True, None])
+def test_non_text_filter_values_are_rejected(client, value):
+    response = client.post('/delete_reminders', json={'user_id': 'u', 'filter': {'activity_type': value}})
+    assert response.status_code == 400
+    assert 'activity_type' in response.json['message']
+
+
+def test_ids_and_filter_together_are_rejected(client):
+    response = client.post('/delete_reminders', json={'user_id': 'u', 'ids': [1], 'filter': {'status': 'done'}})
+    assert response.status_code == 400
+    assert 'bukan keduanya' in response.json['message']
+
+
+def test_parse_bulk_filter_accepts_text_values():
+    assert app.parse_bulk_filter({'status': 'done', 'mood': 'senang'}) == {'status': 'done', 'filters': {'mood': 'senang'}}
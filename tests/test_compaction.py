@@ -0,0 +1,75 @@
+import sqlite3
+import time
+
+import pytest
+
+import compaction
+import database
+from reminder_store import REMINDER_RECORD_COLUMNS, SQLiteReminderStore
+
+USER = 'user-3'
+
+
+def reminder_row(user_id, event, due_at, notified):
+    values = {column: None for column in REMINDER_RECORD_COLUMNS}
+    values.update(user_id=user_id, event=event, datetime=time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(due_at)),
+                  repeat_type='none', repeat_interval=0, notified=notified, due_at=due_at)
+    return tuple(values[column] for column in REMINDER_RECORD_COLUMNS)
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    path = str(tmp_path / 'reminders.db')
+    monkeypatch.setattr(database, 'DATABASE', path)
+    database.init_db(shard_count=1)
+    return SQLiteReminderStore(path)
+
+
+def test_archive_does_not_take_rows_rescheduled_after_the_candidate_select(store):
+    now = int(time.time())
+    reminder_id, = store.add_many(USER, [reminder_row(USER, 'Lama', now - 86400, 1)])
+    rescheduled = []
+    statements = []
+
+    def reschedule_concurrently(statement):
+        # Penulis lain (mis. /reschedule_reminders) tepat setelah kandidat dibaca, sebelum pernyataan berikutnya
+        statements.append(statement)
+        if len(statements) >= 2 and statements[-2].startswith('SELECT id, user_id FROM reminders'):
+            other = sqlite3.connect(store.path, timeout=0)
+            try:
+                with other:
+                    other.execute('UPDATE reminders SET notified = 0, due_at = ? WHERE id = ?', (now + 3600, reminder_id))
+                rescheduled.append(reminder_id)
+            except sqlite3.OperationalError:
+                pass  # Terkunci oleh transaksi arsip: pengubahan menunggu sampai arsip selesai
+            finally:
+                other.close()
+
+    pool = database.get_pool(store.path)
+    conn = pool.acquire()
+    conn.set_trace_callback(reschedule_concurrently)
+    pool.release(conn)
+    try:
+        archived = store.archive_completed(now, 10)
+    finally:
+        conn.set_trace_callback(None)
+
+    if rescheduled:
+        assert archived == [] and [row['id'] for row in store.list_by_user(USER)] == [reminder_id]
+    else:
+        assert archived == [USER] and list(store.list_by_user(USER)) == []
+
+
+def test_compaction_shrinks_main_file(store):
+    now = int(time.time())
+    notes = 'catatan ' * 40
+    rows = [reminder_row(USER, notes, now - 86400 * 60, 1) for _ in range(3000)] + [reminder_row(USER, 'Aktif', now + 3600, 0)]
+    store.add_many(USER, rows)
+
+    report = compaction.compact_shard(store, pause_seconds=0)
+
+    assert report['archived'] == 3000
+    assert report['reclaimed_bytes'] > 0
+    assert report['after']['file_bytes'] < report['before']['file_bytes'] / 2
+    assert report['after']['archive_bytes'] > report['before']['archive_bytes']
+    assert len(store.archived_by_user(USER)) == 3000
@@ -0,0 +1,42 @@
+import os
+
+import pytest
+
+import database
+
+
+@pytest.fixture
+def db_path(tmp_path, monkeypatch):
+    path = str(tmp_path / 'reminders.db')
+    monkeypatch.setattr(database, 'DATABASE', path)
+    return path
+
+
+def test_check_schema_refuses_unmigrated_database(db_path):
+    with pytest.raises(RuntimeError, match='python -m database'):
+        database.check_schema(shard_count=2)
+
+    database.init_db(shard_count=1)
+    # Shard kedua belum dimigrasikan
+    with pytest.raises(RuntimeError):
+        database.check_schema(shard_count=2)
+
+    database.init_db(shard_count=2)
+    database.check_schema(shard_count=2)
+
+
+def test_router_reads_shard_overrides_on_first_use(db_path, monkeypatch):
+    monkeypatch.setattr(database, 'DB_SHARDS', 2)
+    router = database.ShardRouter(database.shard_paths(db_path), base_path=db_path)
+    # Membuat router (seperti saat app diimpor) belum menyentuh database
+    assert not os.path.exists(db_path)
+
+    database.init_db(shard_count=2)
+    user = 'user-42'
+    target = 1 - database.hash_shard(user, 2)
+    conn = database.connect(db_path)
+    with conn:
+        conn.execute('INSERT INTO user_shards (user_id, shard) VALUES (?, ?)', (user, target))
+    conn.close()
+
+    assert router.shard_for_user(user) == target
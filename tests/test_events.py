@@ -0,0 +1,57 @@
+import time
+
+import pytest
+
+import database
+from events import EventBroker
+from memory_store import MemoryReminderStore
+from reminder_store import REMINDER_RECORD_COLUMNS, SQLiteReminderStore
+
+USER = 'user-7'
+
+
+def reminder_row(user_id, event, due_at):
+    values = {column: None for column in REMINDER_RECORD_COLUMNS}
+    values.update(user_id=user_id, event=event, datetime=time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(due_at)),
+                  repeat_type='none', repeat_interval=0, notified=0, due_at=due_at)
+    return tuple(values[column] for column in REMINDER_RECORD_COLUMNS)
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def stores(request, tmp_path, monkeypatch):
+    """(store milik scheduler, store milik worker web); untuk SQLite dua objek atas file yang sama."""
+    if request.param == 'memory':
+        store = MemoryReminderStore()
+        return store, store
+    path = str(tmp_path / 'reminders.db')
+    monkeypatch.setattr(database, 'DATABASE', path)
+    database.init_db(shard_count=1)
+    return SQLiteReminderStore(path), SQLiteReminderStore(path)
+
+
+def messages(subscription):
+    received = []
+    while True:
+        message = subscription.get(timeout=0)
+        if message is None:
+            return received
+        received.append(message.split('\n')[0])
+
+
+def test_due_events_reach_subscribers_through_versions(stores):
+    scheduler_store, web_store = stores
+    now = int(time.time())
+    first_id, second_id = scheduler_store.add_many(USER, [reminder_row(USER, 'Rapat', now - 10), reminder_row(USER, 'Makan', now - 5)])
+
+    broker = EventBroker(web_store)
+    subscription = broker.subscribe(USER, web_store.user_version(USER))
+    scheduler_store.advance_many([(first_id, now - 10), (second_id, now - 5)], [], due_events=[
+        (USER, first_id, 'Rapat', '2026-01-01T09:00:00+07:00', now), (USER, second_id, 'Makan', '2026-01-01T09:05:00+07:00', now)])
+    broker.poll_versions()
+
+    assert messages(subscription) == ['event: due', 'event: due', 'event: changed']
+    # Event yang sudah terkirim tidak diulang pada putaran berikutnya
+    broker.poll_versions()
+    assert messages(subscription) == []
+    assert web_store.due_events_between({USER: (0, web_store.user_version(USER))})[0] == {
+        'user_id': USER, 'id': first_id, 'event': 'Rapat', 'datetime': '2026-01-01T09:00:00+07:00'}
@@ -0,0 +1,47 @@
+import time
+
+import pytest
+
+import database
+import rebalance_shards
+from reminder_store import REMINDER_RECORD_COLUMNS, SQLiteReminderStore
+
+USER = 'user-42'
+
+
+def reminder_row(user_id, event, due_at, notified):
+    values = {column: None for column in REMINDER_RECORD_COLUMNS}
+    values.update(user_id=user_id, event=event, datetime=time.strftime('%Y-%m-%dT%H:%M:%S+00:00', time.gmtime(due_at)),
+                  repeat_type='none', repeat_interval=0, notified=notified, due_at=due_at)
+    return tuple(values[column] for column in REMINDER_RECORD_COLUMNS)
+
+
+@pytest.fixture
+def shards(tmp_path, monkeypatch):
+    monkeypatch.setattr(database, 'DATABASE', str(tmp_path / 'reminders.db'))
+    database.init_db(shard_count=2)
+    paths = database.shard_paths(database.DATABASE, 2)
+    return [SQLiteReminderStore(path) for path in paths]
+
+
+def test_move_user_keeps_archive_history(shards):
+    source, target = shards
+    now = int(time.time())
+    source.add_many(USER, [reminder_row(USER, f'Lama {index}', now - 86400 * (index + 1), 1) for index in range(3)])
+    source.add_many(USER, [reminder_row(USER, 'Aktif', now + 3600, 0)])
+    assert len(source.archive_completed(now, 100)) == 3
+    # Pengingat milik user lain di shard tujuan: id arsip yang dipindah tidak boleh bentrok dengannya
+    target.add_many('other', [reminder_row('other', f'Lain {index}', now - 86400, 1) for index in range(5)])
+
+    moved = rebalance_shards.move_user(USER, source.path, target.path)
+
+    assert moved == 1
+    history = target.archived_by_user(USER)
+    assert [row['event'] for row in history] == ['Lama 0', 'Lama 1', 'Lama 2']
+    assert source.archived_by_user(USER) == []
+    assert source.storage_stats()['archived'] == 0
+
+    # Pengingat shard tujuan yang kelak diarsipkan mendapat id yang tidak dipakai arsip hasil pindahan
+    assert len(target.archive_completed(now, 100)) == 5
+    assert target.storage_stats()['archived'] == 8
+    assert [row['event'] for row in target.archived_by_user(USER)] == ['Lama 0', 'Lama 1', 'Lama 2']
@@ -0,0 +1,56 @@
+import random
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from benchmarks.recurrence_catchup import legacy_step_by_step
+from recurrence import next_occurrence, parse_repeat_days
+
+TZ = timezone(timedelta(hours=7))
+PROPERTY_CASES = 20000
+
+
+def day_by_day(current_dt, weekdays, now_local):
+    candidate = current_dt + timedelta(days=1)
+    while candidate <= now_local or candidate.weekday() not in weekdays:
+        candidate += timedelta(days=1)
+    return candidate
+
+
+def random_case(rng):
+    repeat_type = rng.choice(['daily', 'weekly', 'monthly_interval', 'yearly', 'weekly_custom'])
+    # Hari 1..28 agar add_months tidak memotong tanggal (algoritma lama "bergeser" ke akhir bulan)
+    current_dt = datetime(rng.randint(2015, 2025), rng.randint(1, 12), rng.randint(1, 28),
+                          rng.randint(0, 23), rng.choice([0, 15, 30, 45]), tzinfo=TZ)
+    now_local = current_dt + timedelta(minutes=rng.randint(0, 60 * 24 * 365 * 3))
+    if repeat_type == 'weekly':
+        repeat_interval = rng.randint(0, 6)
+    elif repeat_type in ('monthly_interval', 'yearly'):
+        repeat_interval = rng.randint(1, 6)
+    else:
+        repeat_interval = 1
+    repeat_days = ','.join(rng.sample(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun'], rng.randint(1, 4)))
+    return current_dt, repeat_type, repeat_interval, now_local, repeat_days
+
+
+def test_closed_form_matches_step_by_step():
+    rng = random.Random(42)
+    for _ in range(PROPERTY_CASES):
+        current_dt, repeat_type, repeat_interval, now_local, repeat_days = random_case(rng)
+        got = next_occurrence(current_dt, repeat_type, repeat_interval, now_local, repeat_days=repeat_days)
+        if repeat_type == 'weekly_custom':
+            # Algoritma lama melompati hari valid untuk weekly_custom, jadi pembandingnya hari-per-hari
+            expected = day_by_day(current_dt, parse_repeat_days(repeat_days), now_local)
+        else:
+            expected = legacy_step_by_step(current_dt, repeat_type, repeat_interval, now_local)
+        assert got == expected, (current_dt, repeat_type, repeat_interval, now_local, repeat_days)
+
+
+@pytest.mark.parametrize('repeat_type,repeat_interval', [('daily', 1), ('weekly', 0), ('monthly_interval', 1), ('yearly', 1)])
+@pytest.mark.parametrize('gap_days', [1, 30, 365, 3650])
+def test_long_downtime_catch_up(repeat_type, repeat_interval, gap_days):
+    current_dt = datetime(2020, 1, 6, 9, 0, tzinfo=TZ)
+    now_local = current_dt + timedelta(days=gap_days)
+    got = next_occurrence(current_dt, repeat_type, repeat_interval, now_local)
+    assert got == legacy_step_by_step(current_dt, repeat_type, repeat_interval, now_local)
+    assert got > now_local
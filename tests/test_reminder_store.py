@@ -0,0 +1,52 @@
+import time
+from datetime import datetime, timedelta
+
+import pytest
+import pytz
+
+import database
+from memory_store import MemoryReminderStore
+from reminder_store import REMINDER_RECORD_COLUMNS, SQLiteReminderStore
+
+USER = 'user-5'
+JAKARTA = pytz.timezone('Asia/Jakarta')
+
+
+def reminder_row(user_id, event, due_at, repeat_type='none'):
+    values = {column: None for column in REMINDER_RECORD_COLUMNS}
+    values.update(user_id=user_id, event=event, datetime=datetime.fromtimestamp(due_at, JAKARTA).isoformat(),
+                  repeat_type=repeat_type, repeat_interval=1 if repeat_type != 'none' else 0, notified=0, due_at=due_at)
+    return tuple(values[column] for column in REMINDER_RECORD_COLUMNS)
+
+
+@pytest.fixture(params=['sqlite', 'memory'])
+def store(request, tmp_path, monkeypatch):
+    if request.param == 'memory':
+        return MemoryReminderStore()
+    path = str(tmp_path / 'reminders.db')
+    monkeypatch.setattr(database, 'DATABASE', path)
+    database.init_db(shard_count=1)
+    return SQLiteReminderStore(path)
+
+
+def test_advance_many_skips_rows_changed_after_they_were_read(store):
+    now = int(time.time())
+    once_id, daily_id, untouched_id = store.add_many(USER, [reminder_row(USER, 'Sekali', now - 60),
+                                                            reminder_row(USER, 'Harian', now - 60, 'daily'),
+                                                            reminder_row(USER, 'Biasa', now - 30)])
+    due = {row['id']: row for row in store.due_before(now, 10)}
+    assert set(due) == {once_id, daily_id, untouched_id}
+
+    # User menunda dua pengingat setelah scheduler membacanya, sebelum advance_many
+    assert store.snooze_many(USER, [once_id, daily_id], 600, datetime.fromtimestamp(now, JAKARTA)) == 2
+    next_day = datetime.fromtimestamp(now - 60 + 86400, JAKARTA)
+    outbox_rows = [(reminder_id, USER, 'log', str(reminder_id), now, now) for reminder_id in due]
+    advanced = store.advance_many([(once_id, due[once_id]['due_at']), (untouched_id, due[untouched_id]['due_at'])],
+                                  [(next_day.isoformat(), now - 60 + 86400, daily_id, due[daily_id]['due_at'])], outbox_rows)
+
+    assert advanced == {untouched_id}
+    rows = {row['id']: row for row in store.list_by_user(USER)}
+    assert rows[once_id]['notified'] == 0 and rows[once_id]['due_at'] == now + 600
+    assert rows[daily_id]['notified'] == 0 and rows[daily_id]['due_at'] == now + 600
+    assert rows[untouched_id]['notified'] == 1
+    assert [row[2] for outbox in store.outboxes() for row in outbox.claim(10)] == [str(untouched_id)]
@@ -0,0 +1,23 @@
+import json
+
+import pytest
+
+from benchmarks.parser_corpus import GOLDEN_PATH, NOW_CONTEXTS, build_corpus, now_contexts, serialize
+from schedule_parser import SCHEDULE_PARSER
+
+with open(GOLDEN_PATH) as f:
+    GOLDEN = json.load(f)
+
+# Golden menyimpan 'now' sebagai string ISO; petakan kembali ke datetime ber-zona parser
+NOW_BY_ISO = {now.isoformat(): now for now in now_contexts(SCHEDULE_PARSER.local_timezone)}
+
+
+def test_golden_covers_corpus():
+    assert len(GOLDEN) == len(build_corpus()) * len(NOW_CONTEXTS), \
+        "Korpus berubah; jalankan python -m benchmarks.parser_corpus --update bila disengaja"
+
+
+@pytest.mark.parametrize('entry', GOLDEN, ids=[f"{index}:{entry['text'][:40]}" for index, entry in enumerate(GOLDEN)])
+def test_parse_matches_golden(entry):
+    now = NOW_BY_ISO[entry['now']]
+    assert serialize(SCHEDULE_PARSER.parse(entry['text'], now)) == entry['expected']